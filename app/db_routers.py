@@ -0,0 +1,78 @@
+import random
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+
+PRIMARY_DB = "default"
+
+# Replicas are only used while a request explicitly allows it, everything
+# else (writes, management commands, background threads) hits the primary.
+_replica_reads_allowed = ContextVar("replica_reads_allowed", default=False)
+
+
+def replica_reads_allowed():
+    return _replica_reads_allowed.get()
+
+
+@contextmanager
+def primary_reads():
+    """Read from the primary inside the block, ex. to build process-wide caches"""
+    token = _replica_reads_allowed.set(False)
+    try:
+        yield
+    finally:
+        _replica_reads_allowed.reset(token)
+
+
+class ReplicaRouter:
+    """Send reads to a random replica from DATABASE_REPLICAS when allowed"""
+
+    def db_for_read(self, model, **hints):
+        replicas = settings.DATABASE_REPLICAS
+        if replicas and _replica_reads_allowed.get():
+            return random.choice(replicas)
+        return PRIMARY_DB
+
+    def db_for_write(self, model, **hints):
+        return PRIMARY_DB
+
+    def allow_relation(self, obj1, obj2, **hints):
+        return True
+
+
+class ReplicaRoutingMiddleware:
+    """Allow replica reads for safe requests on REPLICA_READ_PATHS.
+
+    A successful write sets a short-lived cookie that pins the client to the
+    primary, so it reads its own order right after placing it.
+    """
+
+    safe_methods = ("GET", "HEAD", "OPTIONS")
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def use_replica(self, request):
+        return (
+            request.method in self.safe_methods
+            and settings.REPLICA_PIN_COOKIE not in request.COOKIES
+            and request.path.startswith(settings.REPLICA_READ_PATHS)
+        )
+
+    def __call__(self, request):
+        token = _replica_reads_allowed.set(self.use_replica(request))
+        try:
+            response = self.get_response(request)
+        finally:
+            _replica_reads_allowed.reset(token)
+
+        if request.method not in self.safe_methods and response.status_code < 400:
+            response.set_cookie(
+                settings.REPLICA_PIN_COOKIE,
+                "1",
+                max_age=settings.REPLICA_PIN_SECONDS,
+                httponly=True,
+                samesite="Lax",
+            )
+        return response
@@ -0,0 +1,46 @@
+import mimetypes
+import os
+from urllib.parse import quote
+
+from django.conf import settings
+from django.core.exceptions import SuspiciousFileOperation
+from django.http import Http404, HttpResponse
+from django.utils._os import safe_join
+from django.utils.cache import patch_cache_control
+from django.views.static import serve
+
+MEDIA_SERVE_MODES = ("django", "x-accel", "x-sendfile")
+
+
+def serve_media(request, path):
+    """Serve an uploaded file, delegating the transfer to the web server if configured"""
+    mode = settings.MEDIA_SERVE_MODE
+    if mode not in MEDIA_SERVE_MODES:
+        raise ValueError(f"MEDIA_SERVE_MODE must be one of {MEDIA_SERVE_MODES}")
+
+    if mode == "django":
+        # Streaming from the worker is for development, like static files.
+        if not settings.DEBUG:
+            raise Http404("Media files are served by the web server")
+        response = serve(request, path, document_root=settings.MEDIA_ROOT)
+    else:
+        try:
+            full_path = safe_join(settings.MEDIA_ROOT, path)
+        except SuspiciousFileOperation:
+            raise Http404("Invalid path")
+        if not os.path.isfile(full_path):
+            raise Http404(f"{path} does not exist")
+
+        content_type, encoding = mimetypes.guess_type(full_path)
+        response = HttpResponse(content_type=content_type or "application/octet-stream")
+        if encoding:
+            response.headers["Content-Encoding"] = encoding
+        if mode == "x-accel":
+            response.headers["X-Accel-Redirect"] = (
+                settings.MEDIA_ACCEL_REDIRECT_PREFIX + quote(path)
+            )
+        else:
+            response.headers["X-Sendfile"] = full_path
+
+    patch_cache_control(response, public=True, max_age=settings.MEDIA_CACHE_MAX_AGE)
+    return response
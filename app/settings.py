@@ -36,6 +36,7 @@ INSTALLED_APPS = [
     "django.contrib.sessions",
     "django.contrib.messages",
     "django.contrib.staticfiles",
+    "django.contrib.postgres",
     "drf_spectacular",
     "rest_framework",
     "rest_framework.authtoken",
@@ -45,6 +46,7 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     "django.middleware.security.SecurityMiddleware",
+    "app.db_routers.ReplicaRoutingMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
@@ -85,6 +87,37 @@ DATABASES = {
     }
 }
 
+# Comma separated hosts of streaming replicas of the default database,
+# e.g. POSTGRES_REPLICA_HOSTS=db-replica-1,db-replica-2
+for number, host in enumerate(
+    filter(None, os.environ.get("POSTGRES_REPLICA_HOSTS", "").split(",")), start=1
+):
+    DATABASES[f"replica_{number}"] = {
+        **DATABASES["default"],
+        "HOST": host.strip(),
+        "TEST": {"MIRROR": "default"},
+    }
+
+DATABASE_ROUTERS = ["app.db_routers.ReplicaRouter"]
+
+DATABASE_REPLICAS = [alias for alias in DATABASES if alias != "default"]
+
+# Safe requests under these paths may read from a replica.
+REPLICA_READ_PATHS = (
+    "/api/v1/stations/stations/",
+    "/api/v1/stations/routes/",
+    "/api/v1/stations/train_types/",
+    "/api/v1/stations/trains/",
+    "/api/v1/stations/crews/",
+    "/api/v1/stations/journeys/",
+)
+
+# After a successful write the client reads from the primary for this long,
+# which should exceed the usual replication lag.
+REPLICA_PIN_COOKIE = "db_primary_pin"
+
+REPLICA_PIN_SECONDS = 10
+
 
 AUTH_PASSWORD_VALIDATORS = [
     {
@@ -113,10 +146,52 @@ USE_TZ = True
 
 STATIC_URL = "static/"
 
+STATIC_ROOT = BASE_DIR / "staticfiles"
+
 MEDIA_ROOT = BASE_DIR / "media"
 
 MEDIA_URL = "/media/"
 
+# "django" streams files from the worker and only works with DEBUG,
+# "x-accel" (nginx) and "x-sendfile" (Apache, lighttpd) hand the transfer
+# over to the front web server.
+MEDIA_SERVE_MODE = os.environ.get("MEDIA_SERVE_MODE", "django")
+
+MEDIA_ACCEL_REDIRECT_PREFIX = os.environ.get(
+    "MEDIA_ACCEL_REDIRECT_PREFIX", "/protected-media/"
+)
+
+MEDIA_CACHE_MAX_AGE = 60 * 60 * 24 * 365
+
+STORAGES = {
+    "default": {
+        "BACKEND": "django.core.files.storage.FileSystemStorage",
+    },
+    "staticfiles": {
+        "BACKEND": (
+            "django.contrib.staticfiles.storage.StaticFilesStorage"
+            if DEBUG
+            else "django.contrib.staticfiles.storage.ManifestStaticFilesStorage"
+        ),
+    },
+}
+
+
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+    },
+    # Shared by all workers: throttle counters and token lookups need atomic
+    # increments and cross-process invalidation.
+    "shared": {
+        "BACKEND": os.environ.get(
+            "SHARED_CACHE_BACKEND", "django.core.cache.backends.redis.RedisCache"
+        ),
+        "LOCATION": os.environ.get("REDIS_URL", "redis://localhost:6379/0"),
+    },
+}
+
+THROTTLE_CACHE_ALIAS = "shared"
 
 DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 
@@ -124,18 +199,25 @@ AUTH_USER_MODEL = "user.User"
 
 REST_FRAMEWORK = {
     "DEFAULT_AUTHENTICATION_CLASSES": [
-        "rest_framework.authentication.TokenAuthentication",
+        "rest_framework_simplejwt.authentication.JWTStatelessUserAuthentication",
+        "user.authentication.CachedTokenAuthentication",
+    ],
+    "DEFAULT_RENDERER_CLASSES": [
+        "station.renderers.FastJSONRenderer",
+        "rest_framework.renderers.BrowsableAPIRenderer",
     ],
     "DEFAULT_SCHEMA_CLASS": "drf_spectacular.openapi.AutoSchema",
     "DEFAULT_PAGINATION_CLASS": "rest_framework.pagination.LimitOffsetPagination",
     "PAGE_SIZE": 3,
     "DEFAULT_THROTTLE_CLASSES": [
-        "rest_framework.throttling.AnonRateThrottle",
-        "rest_framework.throttling.UserRateThrottle",
+        "station.throttling.FixedWindowAnonRateThrottle",
+        "station.throttling.FixedWindowUserRateThrottle",
     ],
     "DEFAULT_THROTTLE_RATES": {
         "anon": "50/minute",
         "user": "100/minute",
+        "orders": "10/minute",
+        "login": "5/minute",
     },
     "DEFAULT_PERMISSION_CLASSES": (
         "station.permission.IsAdminOrIfAuthenticatedReadOnly",
@@ -160,8 +242,45 @@ SIMPLE_JWT = {
     "ACCESS_TOKEN_LIFETIME": timedelta(minutes=30),
     "REFRESH_TOKEN_LIFETIME": timedelta(hours=12),
     "ROTATE_REFRESH_TOKEN": True,
+    "TOKEN_OBTAIN_SERIALIZER": "user.serializers.TokenObtainPairWithClaimsSerializer",
+    "TOKEN_REFRESH_SERIALIZER": "user.serializers.TokenRefreshWithClaimsSerializer",
 }
 
+IDEMPOTENCY_KEY_TTL = timedelta(hours=24)
+
+TOKEN_AUTH_CACHE_SIZE = 10_000
+
+TOKEN_AUTH_CACHE_TTL = 60
+
+# CACHES alias shared between workers. None keeps an in-process LRU instead,
+# which other workers cannot invalidate: only for a single worker.
+TOKEN_AUTH_CACHE_ALIAS = "shared"
+
+# In-process station indexes and fare tables, see station/snapshots.py. The
+# alias holds their version keys, None only invalidates the local worker.
+LOCAL_SNAPSHOT_CACHE_ALIAS = "shared"
+
+LOCAL_SNAPSHOT_TTL = 300
+
+# Where dispatch_outbox delivers booking events, see station/outbox.py.
+OUTBOX_SINK = os.environ.get("OUTBOX_SINK", "station.outbox.FileSink")
+
+OUTBOX_SINK_OPTIONS = {"path": os.environ.get("OUTBOX_FILE", BASE_DIR / "outbox.jsonl")}
+
+# Dispatched events are kept this long for the events feed.
+OUTBOX_RETENTION = timedelta(days=7)
+
+# Live seat availability streams, see station/live.py.
+SEAT_STREAM_HEARTBEAT = 15
+
+SEAT_STREAM_QUEUE_SIZE = 100
+
+IMAGE_PROCESSING_ASYNC = True
+
+IMAGE_PROCESSING_WORKERS = 2
+
+TRAIN_THUMBNAIL_SIZE = (320, 320)
+
 DEBUG = os.getenv("DJANGO_DEBUG", "True") == "True"
 
 DEBUG_TOOLBAR_CONFIG = {}
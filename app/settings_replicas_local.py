@@ -0,0 +1,26 @@
+"""Two SQLite files standing in for a primary and a read replica.
+
+Used to exercise ReplicaRouter locally without PostgreSQL:
+    python manage.py migrate --settings=app.settings_replicas_local
+    python manage.py migrate --database=replica --settings=app.settings_replicas_local
+    python manage.py test station.tests.test_db_routers --settings=app.settings_replicas_local
+
+Nothing replicates between the files, so whatever a request returns shows
+which database served it.
+"""
+
+from app.settings_test import *  # noqa: F401,F403
+from app.settings import BASE_DIR
+
+DATABASES = {
+    "default": {
+        "ENGINE": "django.db.backends.sqlite3",
+        "NAME": BASE_DIR / "db.sqlite3",
+    },
+    "replica": {
+        "ENGINE": "django.db.backends.sqlite3",
+        "NAME": BASE_DIR / "db_replica.sqlite3",
+    },
+}
+
+DATABASE_REPLICAS = ["replica"]
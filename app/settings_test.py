@@ -0,0 +1,17 @@
+"""Settings for the test suite: in-process caches instead of Redis.
+
+Selected by manage.py for the test command, or explicitly with
+    python manage.py test --settings=app.settings_test
+"""
+
+from app.settings import *  # noqa: F401,F403
+
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+    },
+    "shared": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "LOCATION": "shared",
+    },
+}
@@ -0,0 +1,40 @@
+from django.conf import settings
+from django.core.cache import caches
+from rest_framework.settings import api_settings
+
+
+class FixedWindowThrottleMixin:
+    """Count requests per key in fixed windows, keeping one integer per key"""
+
+    @property
+    def THROTTLE_RATES(self):
+        # Looked up per request so overridden REST_FRAMEWORK settings apply.
+        return api_settings.DEFAULT_THROTTLE_RATES
+
+    @property
+    def cache(self):
+        return caches[settings.THROTTLE_CACHE_ALIAS]
+
+    def allow_request(self, request, view):
+        if self.rate is None:
+            return True
+
+        self.key = self.get_cache_key(request, view)
+        if self.key is None:
+            return True
+
+        self.now = self.timer()
+        window = int(self.now // self.duration)
+        self.window_end = (window + 1) * self.duration
+        window_key = f"{self.key}:{window}"
+
+        self.cache.add(window_key, 0, self.duration)
+        try:
+            count = self.cache.incr(window_key)
+        except ValueError:
+            self.cache.set(window_key, 1, self.duration)
+            count = 1
+        return count <= self.num_requests
+
+    def wait(self):
+        return self.window_end - self.now
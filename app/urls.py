@@ -15,15 +15,16 @@ Including another URLconf
 """
 
 from django.conf import settings
-from django.conf.urls.static import static
 from django.contrib import admin
-from django.urls import path, include
+from django.urls import path, include, re_path
 from drf_spectacular.views import (
     SpectacularRedocView,
     SpectacularSwaggerView,
     SpectacularAPIView,
 )
 
+from app.media import serve_media
+
 urlpatterns = [
     path("admin/", admin.site.urls),
     path("api/v1/stations/", include("station.urls", namespace="station")),
@@ -40,4 +41,5 @@ urlpatterns = [
         SpectacularRedocView.as_view(url_name="schema"),
         name="redoc",
     ),
-] + static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
+    re_path(rf"^{settings.MEDIA_URL.strip('/')}/(?P<path>.*)$", serve_media),
+]
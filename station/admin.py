@@ -1,4 +1,9 @@
+import json
+
 from django.contrib import admin
+from django.core.paginator import Paginator
+from django.db import connections, transaction
+from django.utils.functional import cached_property
 
 from station.models import (
     Route,
@@ -9,23 +14,182 @@ from station.models import (
     Crew,
     Order,
     Journey,
+    Fare,
+    OutboxEvent,
 )
+from station.outbox import record_event, record_events
+
+EventType = OutboxEvent.EventType
+
+
+class EstimatedCountPaginator(Paginator):
+    """Use PostgreSQL row estimates instead of COUNT(*) on large tables.
+
+    Unfiltered lists read pg_class.reltuples of the table and its partitions,
+    filtered ones the planner's estimate; below exact_count_limit rows the
+    real count is cheap enough.
+    """
+
+    exact_count_limit = 10_000
+
+    @cached_property
+    def count(self):
+        queryset = self.object_list
+        connection = connections[queryset.db]
+        if connection.vendor == "postgresql":
+            estimate = self._estimate(queryset, connection)
+            if estimate is not None and estimate > self.exact_count_limit:
+                return estimate
+        return super().count
+
+    @staticmethod
+    def _estimate(queryset, connection):
+        with connection.cursor() as cursor:
+            if not queryset.query.where:
+                # A partitioned parent has no rows of its own, so sum the
+                # partitions too. reltuples is -1 for tables never analyzed.
+                table = queryset.model._meta.db_table
+                cursor.execute(
+                    """
+                    SELECT SUM(reltuples) FILTER (WHERE reltuples >= 0)::bigint
+                    FROM pg_class
+                    WHERE oid = %s::regclass
+                    OR oid IN (
+                        SELECT inhrelid FROM pg_inherits WHERE inhparent = %s::regclass
+                    )
+                    """,
+                    [table, table],
+                )
+                return cursor.fetchone()[0]
+            sql, params = queryset.query.sql_with_params()
+            cursor.execute(f"EXPLAIN (FORMAT JSON) {sql}", params)
+            row = cursor.fetchone()
+        plan = row[0] if isinstance(row[0], list) else json.loads(row[0])
+        return int(plan[0]["Plan"]["Plan Rows"])
+
+
+class LargeTableAdmin(admin.ModelAdmin):
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+
+
+@admin.register(Station)
+class StationAdmin(admin.ModelAdmin):
+    list_display = ("name", "latitude", "longitude")
+    search_fields = ("^name",)
+
+
+@admin.register(Route)
+class RouteAdmin(LargeTableAdmin):
+    list_display = ("id", "source", "destination", "distance")
+    list_select_related = ("source", "destination")
+    autocomplete_fields = ("source", "destination")
+    search_fields = ("^source__name", "^destination__name")
+    ordering = ("-id",)
+
+
+@admin.register(TrainType)
+class TrainTypeAdmin(admin.ModelAdmin):
+    search_fields = ("name",)
+
+
+@admin.register(Train)
+class TrainAdmin(admin.ModelAdmin):
+    list_display = ("name", "train_type", "cargo_num", "places_in_cargo")
+    list_select_related = ("train_type",)
+    list_filter = ("train_type",)
+    autocomplete_fields = ("train_type",)
+    search_fields = ("^name",)
+
+
+@admin.register(Crew)
+class CrewAdmin(admin.ModelAdmin):
+    list_display = ("first_name", "last_name")
+    search_fields = ("^first_name", "^last_name")
+
+
+@admin.register(Journey)
+class JourneyAdmin(LargeTableAdmin):
+    list_display = ("id", "route", "train", "departure_time", "arrival_time")
+    list_select_related = ("route__source", "route__destination", "train")
+    list_filter = (("departure_time", admin.DateFieldListFilter),)
+    raw_id_fields = ("route",)
+    autocomplete_fields = ("train", "crew")
+    ordering = ("-id",)
+
+
+@admin.register(Ticket)
+class TicketAdmin(LargeTableAdmin):
+    list_display = ("id", "journey", "cargo", "seat", "fare", "order")
+    list_select_related = (
+        "journey__route__source",
+        "journey__route__destination",
+        "order__user",
+    )
+    list_filter = (("journey_departure", admin.DateFieldListFilter),)
+    raw_id_fields = ("journey", "order")
+    ordering = ("-id",)
+
+    def save_model(self, request, obj, form, change):
+        super().save_model(request, obj, form, change)
+        if not change:
+            record_event(EventType.TICKET_CREATED, obj)
+
+    def delete_model(self, request, obj):
+        record_event(EventType.TICKET_DELETED, obj)
+        super().delete_model(request, obj)
+
+    @transaction.atomic
+    def delete_queryset(self, request, queryset):
+        record_events(EventType.TICKET_DELETED, queryset)
+        super().delete_queryset(request, queryset)
 
 
 class TicketInline(admin.TabularInline):
     model = Ticket
-    extra = 1
+    extra = 0
+    raw_id_fields = ("journey",)
+    fields = ("journey", "cargo", "seat", "fare")
 
 
 @admin.register(Order)
-class OrderAdmin(admin.ModelAdmin):
+class OrderAdmin(LargeTableAdmin):
+    list_display = ("id", "user", "created_at")
+    list_select_related = ("user",)
+    raw_id_fields = ("user",)
     inlines = [TicketInline]
+    ordering = ("-id",)
+
+    def save_formset(self, request, form, formset, change):
+        deleted = [
+            ticket_form.instance
+            for ticket_form in formset.deleted_forms
+            if ticket_form.instance.pk is not None
+        ]
+        record_events(EventType.TICKET_DELETED, deleted)
+        super().save_formset(request, form, formset, change)
+        # Tickets added together with a new order are part of order.created,
+        # updated ones are recorded by the Ticket post_save signal.
+        if change:
+            for ticket in formset.new_objects:
+                record_event(EventType.TICKET_CREATED, ticket)
+
+    def save_related(self, request, form, formsets, change):
+        super().save_related(request, form, formsets, change)
+        if not change:
+            record_event(EventType.ORDER_CREATED, form.instance)
+
+    def delete_model(self, request, obj):
+        record_event(EventType.ORDER_DELETED, obj)
+        super().delete_model(request, obj)
+
+    @transaction.atomic
+    def delete_queryset(self, request, queryset):
+        record_events(EventType.ORDER_DELETED, queryset.prefetch_related("tickets"))
+        super().delete_queryset(request, queryset)
 
 
-admin.site.register(Route)
-admin.site.register(Train)
-admin.site.register(TrainType)
-admin.site.register(Station)
-admin.site.register(Crew)
-admin.site.register(Journey)
-admin.site.register(Ticket)
+@admin.register(Fare)
+class FareAdmin(admin.ModelAdmin):
+    list_display = ("train_type", "seat_class", "base_price", "price_per_km")
+    list_select_related = ("train_type",)
@@ -0,0 +1,235 @@
+import datetime
+import json
+import math
+import time
+import urllib.error
+import urllib.request
+from collections import Counter
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+
+from station.models import Journey, Route, Station, Train, TrainType
+
+BENCHMARK_PREFIX = "Benchmark"
+BENCHMARK_EMAIL_DOMAIN = "benchmark.invalid"
+
+
+class BenchmarkData:
+    def __init__(self, journey_ids, hot_journey_ids, seats, user_ids):
+        self.journey_ids = journey_ids
+        self.hot_journey_ids = hot_journey_ids
+        self.seats = seats
+        self.user_ids = user_ids
+
+
+def seed_benchmark_data(rng, stations, trains, journeys, users, hot_journeys):
+    """Create a small network of benchmark objects, returns BenchmarkData"""
+    cargo_num, places_in_cargo = 8, 40
+    train_type = TrainType.objects.create(name=f"{BENCHMARK_PREFIX} type")
+    Station.objects.bulk_create(
+        Station(
+            name=f"{BENCHMARK_PREFIX} station {i}",
+            latitude=rng.uniform(45, 52),
+            longitude=rng.uniform(22, 40),
+        )
+        for i in range(stations)
+    )
+    station_ids = list(
+        Station.objects.filter(name__startswith=BENCHMARK_PREFIX).values_list(
+            "id", flat=True
+        )
+    )
+    Route.objects.bulk_create(
+        Route(
+            source_id=source_id,
+            destination_id=rng.choice(
+                [station_id for station_id in station_ids if station_id != source_id]
+            ),
+            distance=rng.randint(50, 900),
+        )
+        for source_id in station_ids
+    )
+    route_ids = list(
+        Route.objects.filter(source_id__in=station_ids).values_list("id", flat=True)
+    )
+    Train.objects.bulk_create(
+        Train(
+            name=f"{BENCHMARK_PREFIX} train {i}",
+            cargo_num=cargo_num,
+            places_in_cargo=places_in_cargo,
+            train_type=train_type,
+        )
+        for i in range(trains)
+    )
+    train_ids = list(
+        Train.objects.filter(train_type=train_type).values_list("id", flat=True)
+    )
+
+    now = timezone.now()
+    new_journeys = []
+    for _ in range(journeys):
+        departure = now + datetime.timedelta(minutes=rng.randint(60, 60 * 24 * 30))
+        new_journeys.append(
+            Journey(
+                route_id=rng.choice(route_ids),
+                train_id=rng.choice(train_ids),
+                departure_time=departure,
+                arrival_time=departure
+                + datetime.timedelta(minutes=rng.randint(30, 900)),
+            )
+        )
+    Journey.objects.bulk_create(new_journeys)
+    journey_ids = list(
+        Journey.objects.filter(train_id__in=train_ids)
+        .order_by("id")
+        .values_list("id", flat=True)
+    )
+
+    password = make_password(None)
+    get_user_model().objects.bulk_create(
+        get_user_model()(email=f"user{i}@{BENCHMARK_EMAIL_DOMAIN}", password=password)
+        for i in range(users)
+    )
+    user_ids = list(
+        get_user_model()
+        .objects.filter(email__endswith=f"@{BENCHMARK_EMAIL_DOMAIN}")
+        .values_list("id", flat=True)
+    )
+
+    # Orders compete for the seats of a few journeys to exercise the seat
+    # uniqueness checks under contention.
+    return BenchmarkData(
+        journey_ids=journey_ids,
+        hot_journey_ids=journey_ids[:hot_journeys],
+        seats=(cargo_num, places_in_cargo),
+        user_ids=user_ids,
+    )
+
+
+def delete_benchmark_data():
+    Journey.objects.filter(train__name__startswith=BENCHMARK_PREFIX).delete()
+    Train.objects.filter(name__startswith=BENCHMARK_PREFIX).delete()
+    Route.objects.filter(source__name__startswith=BENCHMARK_PREFIX).delete()
+    Station.objects.filter(name__startswith=BENCHMARK_PREFIX).delete()
+    TrainType.objects.filter(name__startswith=BENCHMARK_PREFIX).delete()
+    get_user_model().objects.filter(
+        email__endswith=f"@{BENCHMARK_EMAIL_DOMAIN}"
+    ).delete()
+
+
+class TestClientSession:
+    """Send requests through the Django test client, counting queries"""
+
+    def __init__(self, user):
+        self.client = APIClient()
+        self.client.force_authenticate(user)
+
+    def request(self, method, path, data=None):
+        with CaptureQueriesContext(connection) as queries:
+            if method == "GET":
+                response = self.client.get(path)
+            else:
+                response = self.client.post(path, data, format="json")
+        return response.status_code, len(queries)
+
+
+class HttpSession:
+    """Send requests to a running server; queries cannot be counted there"""
+
+    def __init__(self, user, base_url):
+        self.base_url = base_url.rstrip("/")
+        self.token = str(AccessToken.for_user(user))
+
+    def request(self, method, path, data=None):
+        request = urllib.request.Request(
+            self.base_url + path,
+            method=method,
+            data=json.dumps(data).encode() if data is not None else None,
+            headers={
+                "Authorization": f"Bearer {self.token}",
+                "Accept": "application/json",
+                "Content-Type": "application/json",
+            },
+        )
+        try:
+            with urllib.request.urlopen(request) as response:
+                response.read()
+                return response.status, None
+        except urllib.error.HTTPError as error:
+            return error.code, None
+
+
+def browse_journeys(session, data, rng):
+    offset = rng.randrange(max(1, len(data.journey_ids) - 20))
+    return session.request(
+        "GET", f"{reverse('station:journey-list')}?limit=20&offset={offset}"
+    )
+
+
+def view_seats(session, data, rng):
+    journey_id = rng.choice(data.journey_ids)
+    return session.request("GET", reverse("station:journey-seats", args=[journey_id]))
+
+
+def place_order(session, data, rng):
+    cargo_num, places_in_cargo = data.seats
+    ticket = {
+        "journey": rng.choice(data.hot_journey_ids),
+        "cargo": rng.randint(1, cargo_num),
+        "seat": rng.randint(1, places_in_cargo),
+    }
+    return session.request("POST", reverse("station:order-list"), {"tickets": [ticket]})
+
+
+SCENARIOS = {
+    "browse_journeys": browse_journeys,
+    "view_seats": view_seats,
+    "place_order": place_order,
+}
+
+
+def percentile(sorted_values, fraction):
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return None
+    rank = max(1, math.ceil(fraction * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+def summarize(samples, elapsed):
+    """Build the report for one scenario from (seconds, status, queries) samples"""
+    latencies = sorted(seconds * 1000 for seconds, _, _ in samples)
+    queries = [count for _, _, count in samples if count is not None]
+    return {
+        "requests": len(samples),
+        "statuses": dict(
+            sorted(Counter(str(status) for _, status, _ in samples).items())
+        ),
+        "throughput_rps": round(len(samples) / elapsed, 2) if elapsed else None,
+        "latency_ms": {
+            "mean": round(sum(latencies) / len(latencies), 3) if latencies else None,
+            "p50": round(percentile(latencies, 0.50), 3) if latencies else None,
+            "p95": round(percentile(latencies, 0.95), 3) if latencies else None,
+            "p99": round(percentile(latencies, 0.99), 3) if latencies else None,
+            "max": round(latencies[-1], 3) if latencies else None,
+        },
+        "queries_per_request": (
+            round(sum(queries) / len(queries), 2) if queries else None
+        ),
+    }
+
+
+def run_requests(scenario, session, data, rng, count):
+    samples = []
+    for _ in range(count):
+        start = time.perf_counter()
+        status, queries = scenario(session, data, rng)
+        samples.append((time.perf_counter() - start, status, queries))
+    return samples
@@ -0,0 +1,80 @@
+from decimal import ROUND_HALF_UP, Decimal
+
+from station.models import Fare, Journey, SeatClass, build_cargo_layout
+from station.snapshots import SharedSnapshot
+
+DEFAULT_SEAT_CLASS = SeatClass.SECOND
+
+CENT = Decimal("0.01")
+
+
+class FareEngine:
+    """Price tickets from route distance, train type and seat class.
+
+    The fare table is small, so quotes read a copy kept in memory and
+    reloaded after a Fare change is committed in any worker. Ticket fares
+    are always read from the database.
+    """
+
+    def __init__(self):
+        self._snapshot = SharedSnapshot("fare-table", self.load_rates)
+
+    def invalidate(self):
+        self._snapshot.invalidate()
+
+    @staticmethod
+    def load_rates():
+        return {
+            (fare.train_type_id, fare.seat_class): (fare.base_price, fare.price_per_km)
+            for fare in Fare.objects.all()
+        }
+
+    def price(self, distance, train_type_id, seat_class, rates=None):
+        rates = rates if rates is not None else self._snapshot.get()
+        rate = rates.get((train_type_id, seat_class)) or rates.get((None, seat_class))
+        if rate is None:
+            return None
+        base_price, price_per_km = rate
+        return (base_price + price_per_km * distance).quantize(CENT, ROUND_HALF_UP)
+
+    def quote_journeys(self, journey_ids, seat_class):
+        rates = self._snapshot.get()
+        journeys = Journey.objects.filter(id__in=journey_ids).values_list(
+            "id", "route__distance", "train__train_type_id"
+        )
+        return {
+            journey_id: self.price(distance, train_type_id, seat_class, rates)
+            for journey_id, distance, train_type_id in journeys
+        }
+
+    def price_tickets(self, tickets):
+        """Set the fare of validated tickets that have none, in two queries.
+
+        Run inside the booking transaction: the fare table and train layouts
+        are read from the database, never from a possibly stale copy.
+        """
+        tickets = [ticket for ticket in tickets if ticket.fare is None]
+        if not tickets:
+            return
+        rates = self.load_rates()
+        journeys = Journey.objects.filter(
+            id__in={ticket.journey_id for ticket in tickets}
+        ).values_list(
+            "id",
+            "route__distance",
+            "train__train_type_id",
+            "train__cargo_layout",
+            "train__cargo_num",
+            "train__places_in_cargo",
+        )
+        pricing = {
+            journey_id: (distance, train_type_id, build_cargo_layout(*train))
+            for journey_id, distance, train_type_id, *train in journeys
+        }
+        for ticket in tickets:
+            distance, train_type_id, layout = pricing[ticket.journey_id]
+            _, seat_class = layout[ticket.cargo - 1]
+            ticket.fare = self.price(distance, train_type_id, seat_class, rates)
+
+
+fare_engine = FareEngine()
@@ -0,0 +1,151 @@
+from django.db.models import Count
+from rest_framework import serializers
+from rest_framework.response import Response
+
+from station.layouts import capacity
+from station.models import Train, build_cargo_layout, format_travel_duration
+
+
+class ValuesListSerializer:
+    """Read-only serializer building response dicts straight from .values() rows.
+
+    Output matches the corresponding ModelSerializer used for list actions,
+    without instantiating model objects and serializer fields per row.
+    """
+
+    values = ()
+    # Response key -> .values() key, the values unchanged when empty.
+    fields = {}
+
+    def __init__(self, instance, context=None):
+        self.instance = instance
+        self.context = context or {}
+
+    @classmethod
+    def get_annotations(cls):
+        return {}
+
+    @classmethod
+    def get_queryset(cls, queryset):
+        return queryset.annotate(**cls.get_annotations()).values(*cls.values)
+
+    def to_representation(self, row):
+        fields = self.fields or {name: name for name in self.values}
+        return {name: row[key] for name, key in fields.items()}
+
+    @property
+    def data(self):
+        return [self.to_representation(row) for row in self.instance]
+
+
+class ValuesListMixin:
+    """Serve the list action of a viewset through a ValuesListSerializer"""
+
+    values_serializer_class = None
+
+    def list(self, request, *args, **kwargs):
+        serializer_class = self.values_serializer_class
+        queryset = serializer_class.get_queryset(
+            self.filter_queryset(self.get_queryset())
+        )
+        context = self.get_serializer_context()
+
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            return self.get_paginated_response(serializer_class(page, context).data)
+        return Response(serializer_class(queryset, context).data)
+
+
+_datetime_field = serializers.DateTimeField()
+
+
+class RouteListValuesSerializer(ValuesListSerializer):
+    values = ("id", "source__name", "destination__name", "distance")
+    fields = {
+        "id": "id",
+        "source": "source__name",
+        "destination": "destination__name",
+        "distance": "distance",
+    }
+
+
+class TrainListValuesSerializer(ValuesListSerializer):
+    values = (
+        "id",
+        "name",
+        "cargo_num",
+        "places_in_cargo",
+        "train_type__name",
+        "cargo_layout",
+        "thumbnail",
+        "thumbnail_webp",
+        "thumbnail_width",
+        "thumbnail_height",
+    )
+
+    def file_url(self, field_name, name):
+        if not name:
+            return None
+        url = Train._meta.get_field(field_name).storage.url(name)
+        request = self.context.get("request")
+        if request is not None:
+            return request.build_absolute_uri(url)
+        return url
+
+    def to_representation(self, row):
+        return {
+            "id": row["id"],
+            "name": row["name"],
+            "cargo_num": row["cargo_num"],
+            "places_in_cargo": row["places_in_cargo"],
+            "train_type": row["train_type__name"],
+            "total_capacity": capacity(
+                build_cargo_layout(
+                    row["cargo_layout"], row["cargo_num"], row["places_in_cargo"]
+                )
+            ),
+            "thumbnail": self.file_url("thumbnail", row["thumbnail"]),
+            "thumbnail_webp": self.file_url("thumbnail_webp", row["thumbnail_webp"]),
+            "thumbnail_width": row["thumbnail_width"],
+            "thumbnail_height": row["thumbnail_height"],
+        }
+
+
+class JourneyListValuesSerializer(ValuesListSerializer):
+    values = (
+        "id",
+        "train__name",
+        "route__source__name",
+        "route__destination__name",
+        "departure_time",
+        "arrival_time",
+        "train__cargo_layout",
+        "train__cargo_num",
+        "train__places_in_cargo",
+        "booked_tickets",
+    )
+
+    @classmethod
+    def get_annotations(cls):
+        return {"booked_tickets": Count("tickets")}
+
+    def to_representation(self, row):
+        departure_time = row["departure_time"]
+        arrival_time = row["arrival_time"]
+        return {
+            "id": row["id"],
+            "train_name": row["train__name"],
+            "source": row["route__source__name"],
+            "destination": row["route__destination__name"],
+            "departure_time": _datetime_field.to_representation(departure_time),
+            "arrival_time": _datetime_field.to_representation(arrival_time),
+            "travel_duration": format_travel_duration(arrival_time - departure_time),
+            "available_tickets": capacity(
+                build_cargo_layout(
+                    row["train__cargo_layout"],
+                    row["train__cargo_num"],
+                    row["train__places_in_cargo"],
+                )
+            )
+            - row["booked_tickets"],
+        }
@@ -0,0 +1,92 @@
+import math
+
+from station.models import Station
+from station.snapshots import SharedSnapshot
+
+EARTH_RADIUS_KM = 6371.0088
+KM_PER_DEGREE_LATITUDE = math.pi * EARTH_RADIUS_KM / 180
+
+
+def haversine_km(lat1, lon1, lat2, lon2):
+    lat1, lon1, lat2, lon2 = map(math.radians, (lat1, lon1, lat2, lon2))
+    a = (
+        math.sin((lat2 - lat1) / 2) ** 2
+        + math.cos(lat1) * math.cos(lat2) * math.sin((lon2 - lon1) / 2) ** 2
+    )
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, math.sqrt(a)))
+
+
+class StationGrid:
+    """In-memory grid of station coordinates bucketed into square degree cells.
+
+    Built lazily from the database and rebuilt after a station change is
+    committed in any worker.
+    """
+
+    def __init__(self, cell_size=0.5):
+        self.cell_size = cell_size
+        self._snapshot = SharedSnapshot(f"station-grid:{cell_size}", self._build)
+
+    def invalidate(self):
+        self._snapshot.invalidate()
+
+    def _wrap_longitude_cell(self, cell):
+        cells_per_turn = round(360 / self.cell_size)
+        offset = math.floor(-180 / self.cell_size)
+        return (cell - offset) % cells_per_turn + offset
+
+    def _cell(self, latitude, longitude):
+        return (
+            math.floor(latitude / self.cell_size),
+            self._wrap_longitude_cell(math.floor(longitude / self.cell_size)),
+        )
+
+    def _build(self):
+        cells = {}
+        for station in Station.objects.values("id", "name", "latitude", "longitude"):
+            cell = self._cell(station["latitude"], station["longitude"])
+            cells.setdefault(cell, []).append(station)
+        return cells
+
+    def _longitude_cells(self, longitude, lon_delta):
+        lon_delta = min(lon_delta, 180.0)
+        first = math.floor((longitude - lon_delta) / self.cell_size)
+        last = math.floor((longitude + lon_delta) / self.cell_size)
+        return {self._wrap_longitude_cell(cell) for cell in range(first, last + 1)}
+
+    def nearby(self, latitude, longitude, radius_km, limit):
+        cells = self._snapshot.get()
+
+        lat_delta = radius_km / KM_PER_DEGREE_LATITUDE
+        min_latitude = max(-90.0, latitude - lat_delta)
+        max_latitude = min(90.0, latitude + lat_delta)
+        widest_latitude = max(abs(min_latitude), abs(max_latitude))
+        if widest_latitude >= 90:
+            lon_delta = 180.0
+        else:
+            lon_delta = lat_delta / math.cos(math.radians(widest_latitude))
+
+        lat_cells = range(
+            math.floor(min_latitude / self.cell_size),
+            math.floor(max_latitude / self.cell_size) + 1,
+        )
+        lon_cells = self._longitude_cells(longitude, lon_delta)
+
+        matches = []
+        for lat_cell in lat_cells:
+            for lon_cell in lon_cells:
+                for station in cells.get((lat_cell, lon_cell), ()):
+                    distance = haversine_km(
+                        latitude, longitude, station["latitude"], station["longitude"]
+                    )
+                    if distance <= radius_km:
+                        matches.append((distance, station))
+
+        matches.sort(key=lambda match: match[0])
+        return [
+            {**station, "distance_km": round(distance, 3)}
+            for distance, station in matches[:limit]
+        ]
+
+
+station_grid = StationGrid()
@@ -0,0 +1,78 @@
+import hashlib
+import json
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.response import Response
+
+from station.models import IdempotencyKey
+
+IDEMPOTENCY_HEADER = "Idempotency-Key"
+
+
+def hash_request_data(data):
+    payload = json.dumps(data, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def expired_keys(now=None):
+    now = now or timezone.now()
+    return IdempotencyKey.objects.filter(
+        created_at__lt=now - settings.IDEMPOTENCY_KEY_TTL
+    )
+
+
+class IdempotentCreateMixin:
+    """Replay the stored response when a create is retried with the same key"""
+
+    def create(self, request, *args, **kwargs):
+        key = request.headers.get(IDEMPOTENCY_HEADER)
+        if not key:
+            return super().create(request, *args, **kwargs)
+
+        request_hash = hash_request_data(request.data)
+        stored = self._get_stored_response(request.user.id, key)
+        if stored is not None:
+            return self._replay(stored, request_hash)
+
+        try:
+            with transaction.atomic():
+                response = super().create(request, *args, **kwargs)
+                if status.is_success(response.status_code):
+                    IdempotencyKey.objects.create(
+                        key=key,
+                        user_id=request.user.id,
+                        request_hash=request_hash,
+                        response_status=response.status_code,
+                        response_body=response.data,
+                    )
+        except IntegrityError:
+            stored = self._get_stored_response(request.user.id, key)
+            if stored is None:
+                raise
+            return self._replay(stored, request_hash)
+        return response
+
+    @staticmethod
+    def _get_stored_response(user_id, key):
+        stored = IdempotencyKey.objects.filter(user_id=user_id, key=key).first()
+        if stored is None:
+            return None
+        if stored.created_at < timezone.now() - settings.IDEMPOTENCY_KEY_TTL:
+            stored.delete()
+            return None
+        return stored
+
+    @staticmethod
+    def _replay(stored, request_hash):
+        if stored.request_hash != request_hash:
+            return Response(
+                {
+                    "detail": f"{IDEMPOTENCY_HEADER} was already used "
+                    f"with a different request body."
+                },
+                status=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            )
+        return Response(stored.response_body, status=stored.response_status)
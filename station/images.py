@@ -0,0 +1,104 @@
+import logging
+import os
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from io import BytesIO
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.db import connection, transaction
+from django.db.models import Q
+from PIL import Image
+
+from station.models import Train
+
+logger = logging.getLogger(__name__)
+
+_executor = None
+
+
+def get_executor():
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(
+            max_workers=settings.IMAGE_PROCESSING_WORKERS,
+            thread_name_prefix="train-image",
+        )
+    return _executor
+
+
+def _encode(image, image_format, **options):
+    buffer = BytesIO()
+    image.save(buffer, format=image_format, **options)
+    return ContentFile(buffer.getvalue())
+
+
+def delete_stale_files(names):
+    """Delete replaced image files that no train refers to anymore"""
+    storage = Train._meta.get_field("image").storage
+    for name in names:
+        if name and not Train.objects.filter(
+            Q(image=name) | Q(thumbnail=name) | Q(thumbnail_webp=name)
+        ).exists():
+            storage.delete(name)
+
+
+def process_train_image(train_id, stale_files=()):
+    train = Train.objects.filter(pk=train_id).first()
+    if train is None or not train.image:
+        delete_stale_files(stale_files)
+        return
+
+    with train.image.open("rb") as source:
+        image = Image.open(source)
+        image_format = image.format or "PNG"
+        image.thumbnail(settings.TRAIN_THUMBNAIL_SIZE)
+        if image_format == "JPEG" and image.mode not in ("RGB", "L"):
+            image = image.convert("RGB")
+        thumbnail = _encode(image, image_format)
+        thumbnail_webp = _encode(image, "WEBP", quality=80)
+
+    base_name, extension = os.path.splitext(os.path.basename(train.image.name))
+    train.thumbnail.save(f"{base_name}{extension}", thumbnail, save=False)
+    train.thumbnail_webp.save(f"{base_name}.webp", thumbnail_webp, save=False)
+    updated = Train.objects.filter(pk=train_id, image=train.image.name).update(
+        thumbnail=train.thumbnail.name,
+        thumbnail_webp=train.thumbnail_webp.name,
+        thumbnail_width=image.width,
+        thumbnail_height=image.height,
+    )
+    if not updated:
+        # The image was replaced meanwhile, these thumbnails are already stale.
+        stale_files = (*stale_files, train.thumbnail.name, train.thumbnail_webp.name)
+    delete_stale_files(stale_files)
+
+
+def _run_in_background(train_id, stale_files):
+    try:
+        process_train_image(train_id, stale_files)
+    finally:
+        connection.close()
+
+
+def _log_failure(train_id, future):
+    try:
+        future.result()
+    except Exception:
+        logger.exception("Processing the image of train %s failed", train_id)
+
+
+def _submit(train_id, stale_files):
+    future = get_executor().submit(_run_in_background, train_id, stale_files)
+    future.add_done_callback(partial(_log_failure, train_id))
+
+
+def schedule_train_image_processing(train_id, stale_files=()):
+    """Generate train thumbnails once the upload transaction commits.
+
+    stale_files are the names of the replaced image and thumbnails, deleted
+    once the new thumbnails are saved.
+    """
+    if settings.IMAGE_PROCESSING_ASYNC:
+        transaction.on_commit(lambda: _submit(train_id, stale_files))
+    else:
+        transaction.on_commit(lambda: process_train_image(train_id, stale_files))
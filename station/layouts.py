@@ -0,0 +1,2 @@
+def capacity(layout):
+    return sum(seats for seats, _ in layout)
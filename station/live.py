@@ -0,0 +1,168 @@
+import asyncio
+import json
+import logging
+import select
+import threading
+import time
+
+from django.conf import settings
+from django.db import connection, connections, transaction
+
+from station.layouts import capacity
+from station.models import Journey, Ticket
+
+logger = logging.getLogger(__name__)
+
+NOTIFY_CHANNEL = "seat_availability"
+# PostgreSQL rejects NOTIFY payloads of 8000 bytes or more, a seat takes at
+# most 14 bytes of JSON.
+SEATS_PER_NOTIFY = 400
+
+
+class Subscription:
+    """Queue of seat changes for one client, living on the client's event loop"""
+
+    def __init__(self, loop, queue_size):
+        self.loop = loop
+        self.queue = asyncio.Queue(queue_size)
+        self.overflowed = False
+
+    def push(self, change):
+        try:
+            self.queue.put_nowait(change)
+        except asyncio.QueueFull:
+            # The client fell behind, it gets a fresh snapshot instead.
+            self.overflowed = True
+
+
+class SeatAvailabilityBroker:
+    """In-process fan-out of seat changes to the clients watching a journey.
+
+    On PostgreSQL every worker LISTENs on one connection and changes arrive
+    through NOTIFY, so they reach clients of all workers. Elsewhere changes
+    are published directly after the writing transaction commits.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._subscriptions = {}
+        self._listener = None
+
+    def subscribe(self, journey_id):
+        subscription = Subscription(
+            asyncio.get_running_loop(), settings.SEAT_STREAM_QUEUE_SIZE
+        )
+        with self._lock:
+            self._subscriptions.setdefault(journey_id, set()).add(subscription)
+            if connection.vendor == "postgresql" and self._listener is None:
+                self._listener = threading.Thread(
+                    target=self._listen, name="seat-availability", daemon=True
+                )
+                self._listener.start()
+        return subscription
+
+    def unsubscribe(self, journey_id, subscription):
+        with self._lock:
+            subscriptions = self._subscriptions.get(journey_id)
+            if subscriptions is not None:
+                subscriptions.discard(subscription)
+                if not subscriptions:
+                    del self._subscriptions[journey_id]
+
+    def publish(self, change):
+        """Hand a change to its journey's subscribers, safe from any thread"""
+        with self._lock:
+            subscriptions = list(self._subscriptions.get(change["journey"], ()))
+        for subscription in subscriptions:
+            try:
+                subscription.loop.call_soon_threadsafe(subscription.push, change)
+            except RuntimeError:
+                # The client's event loop is already closed.
+                pass
+
+    def _listen(self):
+        while True:
+            try:
+                listener = connections.create_connection("default")
+                listener.ensure_connection()
+                listener.set_autocommit(True)
+                raw_connection = listener.connection
+                with listener.cursor() as cursor:
+                    cursor.execute(f"LISTEN {NOTIFY_CHANNEL}")
+                while True:
+                    if select.select([raw_connection], [], [], 5) == ([], [], []):
+                        continue
+                    raw_connection.poll()
+                    while raw_connection.notifies:
+                        notify = raw_connection.notifies.pop(0)
+                        self.publish(json.loads(notify.payload))
+            except Exception:
+                logger.exception("Seat availability listener failed, reconnecting")
+                time.sleep(1)
+
+
+broker = SeatAvailabilityBroker()
+
+
+def seat_changes(tickets, taken):
+    """Group (journey, cargo, seat) ticket dicts into per-journey changes"""
+    changes = {}
+    for ticket in tickets:
+        change = changes.setdefault(
+            ticket["journey"],
+            {"journey": ticket["journey"], "taken": [], "released": []},
+        )
+        change["taken" if taken else "released"].append(
+            [ticket["cargo"], ticket["seat"]]
+        )
+    for change in changes.values():
+        change["available_delta"] = len(change["released"]) - len(change["taken"])
+    return list(changes.values())
+
+
+def split_change(change, size=SEATS_PER_NOTIFY):
+    """Split a change into changes of at most size seats, in the same order"""
+    seats = [("taken", seat) for seat in change["taken"]] + [
+        ("released", seat) for seat in change["released"]
+    ]
+    parts = []
+    for offset in range(0, max(len(seats), 1), size):
+        part = {"journey": change["journey"], "taken": [], "released": []}
+        for kind, seat in seats[offset : offset + size]:
+            part[kind].append(seat)
+        part["available_delta"] = len(part["released"]) - len(part["taken"])
+        parts.append(part)
+    return parts
+
+
+def publish_seat_changes(tickets, taken):
+    """Announce booked or released seats once the current transaction commits"""
+    changes = seat_changes(tickets, taken)
+    if connection.vendor == "postgresql":
+        # NOTIFY is transactional, listeners only hear about committed changes.
+        with connection.cursor() as cursor:
+            for change in changes:
+                for part in split_change(change):
+                    cursor.execute(
+                        "SELECT pg_notify(%s, %s)", [NOTIFY_CHANNEL, json.dumps(part)]
+                    )
+    else:
+        for change in changes:
+            transaction.on_commit(lambda change=change: broker.publish(change))
+
+
+def seat_snapshot(journey_id):
+    journey = Journey.objects.select_related("train").filter(id=journey_id).first()
+    if journey is None:
+        return None
+    taken = [
+        [cargo, seat]
+        for cargo, seat in Ticket.objects.filter(journey_id=journey_id)
+        .order_by("cargo", "seat")
+        .values_list("cargo", "seat")
+    ]
+    return {
+        "journey": journey_id,
+        "available": capacity(journey.train.layout) - len(taken),
+        "taken": taken,
+    }
@@ -0,0 +1,85 @@
+import datetime
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+
+from station.models import (
+    ArchivedJourney,
+    ArchivedOrder,
+    Journey,
+    Order,
+    OutboxEvent,
+)
+from station.outbox import record_events
+from station.serializers import JourneySerializer, OrderSerializer
+
+
+class Command(BaseCommand):
+    help = (
+        "Move journeys that arrived more than --days days ago, with their "
+        "orders and tickets, into compressed archive tables"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--days", type=int, default=365)
+        parser.add_argument("--batch-size", type=int, default=500)
+
+    def handle(self, *args, **options):
+        cutoff = timezone.now() - datetime.timedelta(days=options["days"])
+        batch_size = options["batch_size"]
+
+        past_journeys = Journey.objects.filter(arrival_time__lt=cutoff)
+        # Orders can only move once every ticket in them is for a past journey.
+        orders = (
+            Order.objects.filter(tickets__journey__in=past_journeys)
+            .exclude(tickets__journey__arrival_time__gte=cutoff)
+            .distinct()
+            .order_by("id")
+        )
+        archived_orders = 0
+        while batch := list(orders.prefetch_related("tickets")[:batch_size]):
+            with transaction.atomic():
+                ArchivedOrder.objects.bulk_create(
+                    ArchivedOrder(
+                        order_id=order.id,
+                        user_id=order.user_id,
+                        created_at=order.created_at,
+                        payload=ArchivedOrder.compress(
+                            {**OrderSerializer(order).data, "archived": True}
+                        ),
+                    )
+                    for order in batch
+                )
+                record_events(OutboxEvent.EventType.ORDER_ARCHIVED, batch)
+                Order.objects.filter(id__in=[order.id for order in batch]).delete()
+            archived_orders += len(batch)
+
+        journeys = (
+            past_journeys.filter(tickets__isnull=True)
+            .prefetch_related("crew")
+            .order_by("id")
+        )
+        archived_journeys = 0
+        while batch := list(journeys[:batch_size]):
+            with transaction.atomic():
+                ArchivedJourney.objects.bulk_create(
+                    ArchivedJourney(
+                        journey_id=journey.id,
+                        departure_time=journey.departure_time,
+                        payload=ArchivedJourney.compress(
+                            JourneySerializer(journey).data
+                        ),
+                    )
+                    for journey in batch
+                )
+                Journey.objects.filter(
+                    id__in=[journey.id for journey in batch]
+                ).delete()
+            archived_journeys += len(batch)
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Archived {archived_orders} orders and {archived_journeys} journeys"
+            )
+        )
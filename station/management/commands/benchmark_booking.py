@@ -0,0 +1,151 @@
+import json
+import random
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test.utils import override_settings
+
+from station.benchmarks import (
+    SCENARIOS,
+    HttpSession,
+    TestClientSession,
+    delete_benchmark_data,
+    run_requests,
+    seed_benchmark_data,
+    summarize,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Seed benchmark data and measure the booking flow (browse journeys, "
+        "view seats, place orders under contention), printing p50/p95/p99 "
+        "latency, throughput and queries per request as JSON. Requests go "
+        "through the Django test client unless --base-url points at a running "
+        "server sharing this SECRET_KEY, with throttling disabled there."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--scenario",
+            action="append",
+            choices=sorted(SCENARIOS),
+            help="Scenario to run, may be repeated (default: all)",
+        )
+        parser.add_argument("--requests", type=int, default=200)
+        parser.add_argument("--concurrency", type=int, default=1)
+        parser.add_argument("--stations", type=int, default=100)
+        parser.add_argument("--trains", type=int, default=20)
+        parser.add_argument("--journeys", type=int, default=1000)
+        parser.add_argument("--hot-journeys", type=int, default=3)
+        parser.add_argument("--seed", type=int, default=0)
+        parser.add_argument("--base-url")
+        parser.add_argument("--output", help="Write the JSON report to this file")
+        parser.add_argument(
+            "--keep-data",
+            action="store_true",
+            help="Leave the seeded benchmark objects in the database",
+        )
+
+    def handle(self, *args, **options):
+        concurrency = options["concurrency"]
+        if concurrency < 1:
+            raise CommandError("--concurrency must be at least 1.")
+
+        rng = random.Random(options["seed"])
+        delete_benchmark_data()
+        data = seed_benchmark_data(
+            rng,
+            stations=options["stations"],
+            trains=options["trains"],
+            journeys=options["journeys"],
+            users=concurrency,
+            hot_journeys=options["hot_journeys"],
+        )
+        users = list(get_user_model().objects.filter(id__in=data.user_ids))
+
+        # Measure the views, not the rate limits.
+        rest_framework = {
+            **settings.REST_FRAMEWORK,
+            "DEFAULT_THROTTLE_RATES": dict.fromkeys(
+                settings.REST_FRAMEWORK["DEFAULT_THROTTLE_RATES"]
+            ),
+        }
+        try:
+            with override_settings(
+                ALLOWED_HOSTS=["testserver"], REST_FRAMEWORK=rest_framework
+            ):
+                report = {
+                    name: self._run_scenario(SCENARIOS[name], data, users, options, rng)
+                    for name in options["scenario"] or SCENARIOS
+                }
+        finally:
+            if not options["keep_data"]:
+                delete_benchmark_data()
+
+        report = {
+            "parameters": {
+                key: options[key]
+                for key in (
+                    "requests",
+                    "concurrency",
+                    "stations",
+                    "trains",
+                    "journeys",
+                    "hot_journeys",
+                    "seed",
+                    "base_url",
+                )
+            },
+            "scenarios": report,
+        }
+        output = json.dumps(report, indent=2)
+        if options["output"]:
+            with open(options["output"], "w") as report_file:
+                report_file.write(output)
+        self.stdout.write(output)
+
+    def _session(self, user, base_url):
+        if base_url:
+            return HttpSession(user, base_url)
+        return TestClientSession(user)
+
+    def _run_scenario(self, scenario, data, users, options, rng):
+        base_url = options["base_url"]
+        concurrency = options["concurrency"]
+        per_worker = [
+            options["requests"] // concurrency
+            + (worker < options["requests"] % concurrency)
+            for worker in range(concurrency)
+        ]
+
+        if concurrency == 1:
+            start = time.perf_counter()
+            samples = run_requests(
+                scenario, self._session(users[0], base_url), data, rng, per_worker[0]
+            )
+            return summarize(samples, time.perf_counter() - start)
+
+        seeds = [rng.random() for _ in range(concurrency)]
+
+        def worker(worker_number):
+            try:
+                return run_requests(
+                    scenario,
+                    self._session(users[worker_number], base_url),
+                    data,
+                    random.Random(seeds[worker_number]),
+                    per_worker[worker_number],
+                )
+            finally:
+                connection.close()
+
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            results = list(executor.map(worker, range(concurrency)))
+        elapsed = time.perf_counter() - start
+        return summarize([sample for samples in results for sample in samples], elapsed)
@@ -0,0 +1,74 @@
+import datetime
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+from rest_framework.renderers import JSONRenderer
+
+from station.fast_serializers import JourneyListValuesSerializer
+from station.models import Journey, Route, Station, Train, TrainType
+from station.renderers import FastJSONRenderer
+from station.serializers import JourneyListSerializer
+
+
+class Command(BaseCommand):
+    help = "Compare ModelSerializer and values() serialization of journey lists"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--count", type=int, default=10_000)
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            journeys = self._create_journeys(options["count"])
+
+            start = time.perf_counter()
+            data = JourneyListSerializer(
+                journeys.select_related("train", "route__source", "route__destination"),
+                many=True,
+            ).data
+            JSONRenderer().render(data)
+            model_serializer_time = time.perf_counter() - start
+
+            start = time.perf_counter()
+            rows = JourneyListValuesSerializer.get_queryset(journeys)
+            data = JourneyListValuesSerializer(rows).data
+            FastJSONRenderer().render(data)
+            values_serializer_time = time.perf_counter() - start
+
+            transaction.set_rollback(True)
+
+        self.stdout.write(
+            f"ModelSerializer: {model_serializer_time:.3f}s\n"
+            f"ValuesListSerializer: {values_serializer_time:.3f}s\n"
+            f"Speedup: {model_serializer_time / values_serializer_time:.1f}x"
+        )
+
+    @staticmethod
+    def _create_journeys(count):
+        train = Train.objects.create(
+            name="Benchmark train",
+            cargo_num=10,
+            places_in_cargo=50,
+            train_type=TrainType.objects.create(name="Benchmark type"),
+        )
+        route = Route.objects.create(
+            source=Station.objects.create(
+                name="Benchmark source", latitude=-89.5, longitude=-179.5
+            ),
+            destination=Station.objects.create(
+                name="Benchmark destination", latitude=-89.4, longitude=-179.4
+            ),
+            distance=100,
+        )
+        departure = timezone.now()
+        Journey.objects.bulk_create(
+            Journey(
+                route=route,
+                train=train,
+                departure_time=departure + datetime.timedelta(minutes=i),
+                arrival_time=departure + datetime.timedelta(minutes=i, hours=3),
+            )
+            for i in range(count)
+        )
+        return Journey.objects.filter(train=train).order_by("id")
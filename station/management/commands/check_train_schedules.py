@@ -0,0 +1,41 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from station.models import Journey
+from station.rostering import train_conflicts
+
+
+class Command(BaseCommand):
+    help = (
+        "Scan the timetable for trains running overlapping journeys in one "
+        "sorted pass, exiting with an error when any are found"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--upcoming",
+            action="store_true",
+            help="Only check journeys that have not arrived yet",
+        )
+        parser.add_argument("--chunk-size", type=int, default=5000)
+
+    def handle(self, *args, **options):
+        journeys = Journey.objects.order_by("train_id", "departure_time", "id")
+        if options["upcoming"]:
+            journeys = journeys.filter(arrival_time__gt=timezone.now())
+        rows = journeys.values_list(
+            "id", "train_id", "departure_time", "arrival_time"
+        ).iterator(chunk_size=options["chunk_size"])
+
+        conflicts = 0
+        for journey, other in train_conflicts(rows):
+            conflicts += 1
+            self.stdout.write(
+                f"Train {journey[1]}: journey {journey[0]} departs "
+                f"{journey[2]:%Y-%m-%d %H:%M} before journey {other[0]} "
+                f"arrives {other[3]:%Y-%m-%d %H:%M}"
+            )
+
+        if conflicts:
+            raise CommandError(f"Found {conflicts} overlapping train journeys")
+        self.stdout.write(self.style.SUCCESS("No overlapping train journeys"))
@@ -0,0 +1,13 @@
+from django.core.management.base import BaseCommand
+
+from station.idempotency import expired_keys
+
+
+class Command(BaseCommand):
+    help = "Delete idempotency keys older than IDEMPOTENCY_KEY_TTL"
+
+    def handle(self, *args, **options):
+        deleted, _ = expired_keys().delete()
+        self.stdout.write(
+            self.style.SUCCESS(f"Deleted {deleted} expired idempotency keys")
+        )
@@ -0,0 +1,47 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from station.outbox import dispatch_batch, get_sink, purge_dispatched_events
+
+
+class Command(BaseCommand):
+    help = (
+        "Deliver pending booking events from the outbox to a sink in batches, "
+        "then purge dispatched events older than OUTBOX_RETENTION"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--sink",
+            help="Dotted path of the sink class (default: OUTBOX_SINK)",
+        )
+        parser.add_argument("--batch-size", type=int, default=500)
+        parser.add_argument(
+            "--follow",
+            action="store_true",
+            help="Keep tailing the outbox instead of exiting once it is empty",
+        )
+        parser.add_argument(
+            "--interval",
+            type=float,
+            default=1.0,
+            help="Seconds to wait for new events with --follow",
+        )
+
+    def handle(self, *args, **options):
+        sink = get_sink(options["sink"])
+        dispatched = 0
+        while True:
+            sent = dispatch_batch(sink, options["batch_size"])
+            dispatched += sent
+            if sent:
+                continue
+            if not options["follow"]:
+                break
+            time.sleep(options["interval"])
+
+        purged = purge_dispatched_events()
+        self.stdout.write(
+            self.style.SUCCESS(f"Dispatched {dispatched} events, purged {purged}")
+        )
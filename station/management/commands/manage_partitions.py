@@ -0,0 +1,199 @@
+import datetime
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.utils import timezone
+
+TABLE = "station_ticket"
+PARTITION_KEY = "journey_departure"
+DEFAULT_PARTITION = f"{TABLE}_default"
+
+
+def add_months(value, months):
+    month_index = value.month - 1 + months
+    return value.replace(
+        year=value.year + month_index // 12, month=month_index % 12 + 1
+    )
+
+
+def month_partitions(first, last):
+    """Yield (name, start, end) for every month from first to last inclusive"""
+    start = first.replace(day=1)
+    while start <= last:
+        end = add_months(start, 1)
+        yield f"{TABLE}_{start:%Y_%m}", start, end
+        start = end
+
+
+def partition_month(name):
+    try:
+        return datetime.datetime.strptime(name[len(TABLE) + 1 :], "%Y_%m").date()
+    except ValueError:
+        return None
+
+
+class Command(BaseCommand):
+    help = (
+        "Range-partition station_ticket by journey departure month on PostgreSQL, "
+        "create upcoming monthly partitions and detach old ones. "
+        "station_journey itself stays unpartitioned: PostgreSQL requires the "
+        "partition key in every unique constraint, so journey.id could no longer "
+        "be referenced by tickets and crews."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--convert",
+            action="store_true",
+            help="Convert the existing station_ticket table (one-time, locks the table)",
+        )
+        parser.add_argument("--months-ahead", type=int, default=3)
+        parser.add_argument(
+            "--detach-older-than",
+            type=int,
+            metavar="MONTHS",
+            help="Detach partitions that ended more than MONTHS months ago",
+        )
+
+    def handle(self, *args, **options):
+        if connection.vendor != "postgresql":
+            raise CommandError("Table partitioning requires PostgreSQL.")
+
+        today = timezone.now().date()
+        with transaction.atomic(), connection.cursor() as cursor:
+            if options["convert"]:
+                self._convert(cursor, today, options["months_ahead"])
+            if not self._is_partitioned(cursor):
+                raise CommandError(f"{TABLE} is not partitioned, run with --convert.")
+
+            last_month = add_months(today.replace(day=1), options["months_ahead"])
+            for name, start, end in month_partitions(today, last_month):
+                self._create_partition(cursor, name, start, end)
+
+            if options["detach_older_than"] is not None:
+                cutoff = add_months(today.replace(day=1), -options["detach_older_than"])
+                self._detach_partitions(cursor, cutoff)
+
+    @staticmethod
+    def _is_partitioned(cursor):
+        cursor.execute(
+            "SELECT EXISTS (SELECT 1 FROM pg_partitioned_table p "
+            "JOIN pg_class c ON c.oid = p.partrelid WHERE c.relname = %s)",
+            [TABLE],
+        )
+        return cursor.fetchone()[0]
+
+    def _convert(self, cursor, today, months_ahead):
+        if self._is_partitioned(cursor):
+            self.stdout.write(f"{TABLE} is already partitioned.")
+            return
+
+        legacy = f"{TABLE}_legacy"
+        constraints = connection.introspection.get_constraints(cursor, TABLE)
+        cursor.execute(
+            "SELECT conname FROM pg_constraint WHERE conrelid = %s::regclass", [TABLE]
+        )
+        table_constraints = {row[0] for row in cursor.fetchall()}
+
+        cursor.execute(f"ALTER TABLE {TABLE} RENAME TO {legacy}")
+        for name in constraints:
+            if name in table_constraints:
+                cursor.execute(f'ALTER TABLE {legacy} DROP CONSTRAINT "{name}"')
+            else:
+                cursor.execute(f'DROP INDEX "{name}"')
+
+        cursor.execute(
+            f"CREATE TABLE {TABLE} (LIKE {legacy} INCLUDING DEFAULTS) "
+            f"PARTITION BY RANGE ({PARTITION_KEY})"
+        )
+        cursor.execute(f"CREATE SEQUENCE {TABLE}_id_seq_new OWNED BY {TABLE}.id")
+        cursor.execute(
+            f"ALTER TABLE {TABLE} ALTER COLUMN id "
+            f"SET DEFAULT nextval('{TABLE}_id_seq_new')"
+        )
+        cursor.execute(f"CREATE TABLE {DEFAULT_PARTITION} PARTITION OF {TABLE} DEFAULT")
+
+        cursor.execute(f"SELECT MIN({PARTITION_KEY}) FROM {legacy}")
+        first = cursor.fetchone()[0]
+        first = first.date() if first else today
+        last_month = add_months(today.replace(day=1), months_ahead)
+        for name, start, end in month_partitions(first, last_month):
+            self._create_partition(cursor, name, start, end)
+
+        for name, info in constraints.items():
+            columns = ", ".join(f'"{column}"' for column in info["columns"])
+            if info["primary_key"] or info["unique"]:
+                kind = "PRIMARY KEY" if info["primary_key"] else "UNIQUE"
+                cursor.execute(
+                    f'ALTER TABLE {TABLE} ADD CONSTRAINT "{name}" '
+                    f"{kind} ({columns}, {PARTITION_KEY})"
+                )
+            elif info["foreign_key"]:
+                to_table, to_column = info["foreign_key"]
+                cursor.execute(
+                    f'ALTER TABLE {TABLE} ADD CONSTRAINT "{name}" '
+                    f'FOREIGN KEY ({columns}) REFERENCES "{to_table}" ("{to_column}") '
+                    f"DEFERRABLE INITIALLY DEFERRED"
+                )
+            elif info["index"]:
+                cursor.execute(f'CREATE INDEX "{name}" ON {TABLE} ({columns})')
+
+        cursor.execute(f"INSERT INTO {TABLE} SELECT * FROM {legacy}")
+        cursor.execute(
+            f"SELECT setval('{TABLE}_id_seq_new', COALESCE(MAX(id), 0) + 1, false) "
+            f"FROM {TABLE}"
+        )
+        cursor.execute(f"DROP TABLE {legacy}")
+        cursor.execute(f"ALTER SEQUENCE {TABLE}_id_seq_new RENAME TO {TABLE}_id_seq")
+        self.stdout.write(
+            self.style.SUCCESS(f"Converted {TABLE} to a partitioned table")
+        )
+
+    def _create_partition(self, cursor, name, start, end):
+        cursor.execute("SELECT to_regclass(%s)", [name])
+        if cursor.fetchone()[0] is not None:
+            return
+
+        bounds = f"FOR VALUES FROM ('{start.isoformat()}') TO ('{end.isoformat()}')"
+        in_range = f"{PARTITION_KEY} >= %s AND {PARTITION_KEY} < %s"
+        cursor.execute(
+            f"SELECT EXISTS (SELECT 1 FROM {DEFAULT_PARTITION} WHERE {in_range})",
+            [start, end],
+        )
+        if cursor.fetchone()[0]:
+            # Rows already landed in the default partition: move them into the
+            # new partition before attaching it.
+            cursor.execute(f"CREATE TABLE {name} (LIKE {TABLE} INCLUDING DEFAULTS)")
+            cursor.execute(
+                f"WITH moved AS (DELETE FROM {DEFAULT_PARTITION} "
+                f"WHERE {in_range} RETURNING *) INSERT INTO {name} SELECT * FROM moved",
+                [start, end],
+            )
+            cursor.execute(f"ALTER TABLE {TABLE} ATTACH PARTITION {name} {bounds}")
+        else:
+            cursor.execute(f"CREATE TABLE {name} PARTITION OF {TABLE} {bounds}")
+        self.stdout.write(f"Created partition {name}")
+
+    def _detach_partitions(self, cursor, cutoff):
+        cursor.execute(
+            "SELECT c.relname FROM pg_inherits i "
+            "JOIN pg_class c ON c.oid = i.inhrelid "
+            "JOIN pg_class p ON p.oid = i.inhparent WHERE p.relname = %s",
+            [TABLE],
+        )
+        for (name,) in cursor.fetchall():
+            month = partition_month(name)
+            if month is None or add_months(month, 1) > cutoff:
+                continue
+            cursor.execute(f"ALTER TABLE {TABLE} DETACH PARTITION {name}")
+            cursor.execute(
+                "SELECT conname FROM pg_constraint "
+                "WHERE conrelid = %s::regclass AND contype = 'f'",
+                [name],
+            )
+            # Archived tickets must not block deleting their journeys and orders.
+            for (constraint,) in cursor.fetchall():
+                cursor.execute(f'ALTER TABLE {name} DROP CONSTRAINT "{constraint}"')
+            self.stdout.write(
+                f"Detached {name}; archive it with pg_dump -t {name} or drop it"
+            )
@@ -0,0 +1,522 @@
+import datetime
+import math
+import multiprocessing
+import random
+import time
+
+import django
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, connections, transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from station.fares import fare_engine
+from station.geo import haversine_km, station_grid
+from station.models import (
+    Crew,
+    Journey,
+    Order,
+    Route,
+    SeatClass,
+    Station,
+    Ticket,
+    Train,
+    TrainType,
+)
+from station.search import station_name_index
+
+SEED_PREFIX = "Seed"
+SEED_EMAIL_DOMAIN = "seed.invalid"
+
+# Bounding box the stations are spread over, roughly continental Europe.
+MIN_LATITUDE, MAX_LATITUDE = 36.0, 60.0
+MIN_LONGITUDE, MAX_LONGITUDE = -10.0, 40.0
+
+# Tracks are longer than the great circle distance between stations.
+TRACK_DETOUR = 1.25
+
+DEFAULT_TRAIN_TYPES = ("Intercity", "Regional", "Night")
+
+FIRST_NAMES = ("Anna", "Bohdan", "Iryna", "Mark", "Olena", "Petro", "Sofia", "Taras")
+LAST_NAMES = ("Bondar", "Hrytsenko", "Koval", "Melnyk", "Shevchenko", "Tkachenko")
+
+
+def place_stations(count, rng):
+    """Spread stations over a grid of cells in snake order.
+
+    Consecutive stations sit in neighbouring cells, so linking them yields a
+    connected network; every station has its own cell, keeping coordinates
+    unique.
+    """
+    columns = math.ceil(math.sqrt(count * 2))
+    rows = math.ceil(count / columns)
+    cell_height = (MAX_LATITUDE - MIN_LATITUDE) / rows
+    cell_width = (MAX_LONGITUDE - MIN_LONGITUDE) / columns
+
+    stations = []
+    for number in range(count):
+        row, column = divmod(number, columns)
+        if row % 2:
+            column = columns - 1 - column
+        stations.append(
+            (
+                (row, column),
+                round(MIN_LATITUDE + (row + rng.uniform(0.1, 0.9)) * cell_height, 6),
+                round(MIN_LONGITUDE + (column + rng.uniform(0.1, 0.9)) * cell_width, 6),
+            )
+        )
+    return stations
+
+
+def link_stations(stations, degree):
+    """Return undirected (a, b) station position pairs of a connected network"""
+    cells = {cell: number for number, (cell, _, _) in enumerate(stations)}
+    links = {(number, number + 1) for number in range(len(stations) - 1)}
+    for number, ((row, column), latitude, longitude) in enumerate(stations):
+        neighbours = []
+        for other_row in range(row - 2, row + 3):
+            for other_column in range(column - 2, column + 3):
+                other = cells.get((other_row, other_column))
+                if other is not None and other != number:
+                    _, other_latitude, other_longitude = stations[other]
+                    neighbours.append(
+                        (
+                            haversine_km(
+                                latitude, longitude, other_latitude, other_longitude
+                            ),
+                            other,
+                        )
+                    )
+        for _, other in sorted(neighbours)[: degree // 2]:
+            links.add((min(number, other), max(number, other)))
+    return sorted(links)
+
+
+def build_layout(rng):
+    cargo_num = rng.randint(4, 12)
+    places_in_cargo = rng.choice((40, 54, 60, 68))
+    first_class = rng.randint(0, 2)
+    return [
+        {
+            "seats": places_in_cargo // 2 if cargo < first_class else places_in_cargo,
+            "seat_class": (
+                SeatClass.FIRST.value if cargo < first_class else SeatClass.SECOND.value
+            ),
+        }
+        for cargo in range(cargo_num)
+    ]
+
+
+def seat_positions(layout):
+    """Map a flat seat index to (cargo, seat) for the given layout"""
+    positions = []
+    for cargo, (seats, _) in enumerate(layout, start=1):
+        positions.extend((cargo, seat) for seat in range(1, seats + 1))
+    return positions
+
+
+_network = None
+
+
+def init_worker(network):
+    global _network
+    django.setup()
+    connections.close_all()
+    _network = network
+
+
+def seed_trains(task):
+    """Drive each train through the network, booking tickets on its journeys.
+
+    Every train runs its own timeline, so a train never has overlapping
+    journeys, and its random generator is seeded from the train's position
+    so the result does not depend on how trains are split between workers.
+    """
+    seed, trains = task
+    network = _network
+    counts = {"journeys": 0, "tickets": 0, "orders": 0}
+    crew_through = Journey.crew.through
+    batch_size = network["batch_size"]
+
+    for position, train_id, train_type_id, layout, crew_ids in trains:
+        rng = random.Random(f"{seed}:{position}")
+        positions = seat_positions(layout)
+        speed = rng.uniform(60, 160)
+        station_id = rng.choice(network["station_ids"])
+        departure = network["start"] + datetime.timedelta(minutes=rng.randint(0, 720))
+
+        journeys = []
+        for _ in range(network["journeys_per_train"]):
+            route_id, destination_id, distance = rng.choice(
+                network["adjacency"][station_id]
+            )
+            arrival = departure + datetime.timedelta(hours=distance / speed)
+            journeys.append(
+                (
+                    Journey(
+                        route_id=route_id,
+                        train_id=train_id,
+                        departure_time=departure,
+                        arrival_time=arrival,
+                    ),
+                    distance,
+                )
+            )
+            station_id = destination_id
+            departure = arrival + datetime.timedelta(minutes=rng.randint(20, 240))
+
+        with transaction.atomic():
+            Journey.objects.bulk_create(
+                [journey for journey, _ in journeys], batch_size=batch_size
+            )
+            crew_through.objects.bulk_create(
+                (
+                    crew_through(journey_id=journey.id, crew_id=crew_id)
+                    for journey, _ in journeys
+                    for crew_id in crew_ids
+                ),
+                batch_size=batch_size,
+            )
+
+            orders = []
+            tickets = []
+            for journey, distance in journeys:
+                booked = min(
+                    len(positions),
+                    rng.randint(0, 2 * network["tickets_per_journey"]),
+                )
+                seats = rng.sample(range(len(positions)), booked)
+                while seats:
+                    order = Order(user_id=rng.choice(network["user_ids"]))
+                    orders.append(order)
+                    size = rng.randint(1, 4)
+                    group, seats = seats[:size], seats[size:]
+                    for index in group:
+                        cargo, seat = positions[index]
+                        tickets.append(
+                            Ticket(
+                                order=order,
+                                journey_id=journey.id,
+                                journey_departure=journey.departure_time,
+                                cargo=cargo,
+                                seat=seat,
+                                fare=fare_engine.price(
+                                    distance, train_type_id, layout[cargo - 1][1]
+                                ),
+                            )
+                        )
+            Order.objects.bulk_create(orders, batch_size=batch_size)
+            Ticket.objects.bulk_create(tickets, batch_size=batch_size)
+
+        counts["journeys"] += len(journeys)
+        counts["orders"] += len(orders)
+        counts["tickets"] += len(tickets)
+    return counts
+
+
+class Command(BaseCommand):
+    help = (
+        "Generate a large synthetic rail network: stations linked into a "
+        "connected graph of routes, trains per train type, crews, and journeys "
+        "with booked tickets. Same --seed, same data."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--stations", type=int, default=10_000)
+        parser.add_argument(
+            "--degree",
+            type=int,
+            default=10,
+            help="Routes leaving an average station (both directions are created)",
+        )
+        parser.add_argument("--trains-per-type", type=int, default=200)
+        parser.add_argument(
+            "--crews", type=int, help="Crew members (default: two per train)"
+        )
+        parser.add_argument("--journeys-per-train", type=int, default=1_500)
+        parser.add_argument("--tickets-per-journey", type=int, default=10)
+        parser.add_argument("--users", type=int, default=1_000)
+        parser.add_argument("--days-from-now", type=int, default=1)
+        parser.add_argument("--batch-size", type=int, default=5_000)
+        parser.add_argument("--workers", type=int, default=1)
+        parser.add_argument("--seed", type=int, default=0)
+        parser.add_argument(
+            "--clear",
+            action="store_true",
+            help="Delete previously seeded data first",
+        )
+
+    def handle(self, *args, **options):
+        if options["stations"] < 2:
+            raise CommandError("--stations must be at least 2.")
+        if options["workers"] < 1:
+            raise CommandError("--workers must be at least 1.")
+        if options["workers"] > 1 and connection.vendor == "sqlite":
+            raise CommandError("SQLite allows a single writer, use --workers=1.")
+
+        started = time.perf_counter()
+        rng = random.Random(options["seed"])
+        batch_size = options["batch_size"]
+
+        if options["clear"]:
+            self._clear()
+        if Station.objects.filter(name__startswith=f"{SEED_PREFIX} ").exists():
+            raise CommandError("Seeded data already exists, run with --clear.")
+
+        station_ids = self._create_stations(rng, options)
+        adjacency = self._create_routes(station_ids, options)
+        trains = self._create_trains(rng, options)
+        user_ids = self._create_users(options)
+
+        start = (
+            timezone.now() + datetime.timedelta(days=options["days_from_now"])
+        ).replace(hour=0, minute=0, second=0, microsecond=0)
+        network = {
+            "station_ids": station_ids,
+            "adjacency": adjacency,
+            "user_ids": user_ids,
+            "start": start,
+            "journeys_per_train": options["journeys_per_train"],
+            "tickets_per_journey": options["tickets_per_journey"],
+            "batch_size": batch_size,
+        }
+        chunk_size = max(1, math.ceil(len(trains) / (options["workers"] * 4)))
+        tasks = [
+            (options["seed"], trains[offset : offset + chunk_size])
+            for offset in range(0, len(trains), chunk_size)
+        ]
+
+        counts = {"journeys": 0, "tickets": 0, "orders": 0}
+        if options["workers"] == 1:
+            init_worker(network)
+            results = map(seed_trains, tasks)
+        else:
+            connections.close_all()
+            pool = multiprocessing.Pool(
+                options["workers"], initializer=init_worker, initargs=(network,)
+            )
+            results = pool.imap_unordered(seed_trains, tasks)
+        try:
+            for result in results:
+                for key, value in result.items():
+                    counts[key] += value
+                self.stdout.write(
+                    f"{counts['journeys']} journeys, {counts['tickets']} tickets"
+                )
+        finally:
+            if options["workers"] > 1:
+                pool.close()
+                pool.join()
+
+        # bulk_create bypasses the signals that keep these in-process caches fresh.
+        station_name_index.invalidate()
+        station_grid.invalidate()
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Seeded {len(station_ids)} stations, "
+                f"{sum(len(routes) for routes in adjacency.values())} routes, "
+                f"{len(trains)} trains, {counts['journeys']} journeys, "
+                f"{counts['orders']} orders and {counts['tickets']} tickets "
+                f"in {time.perf_counter() - started:.1f}s"
+            )
+        )
+
+    @staticmethod
+    def _delete_rows(queryset):
+        """Delete the rows of queryset with a single DELETE statement.
+
+        Unlike QuerySet.delete() nothing is loaded, and neither cascades nor
+        signals run, so rows referencing these must be deleted first.
+        """
+        model = queryset.model
+        quote_name = connection.ops.quote_name
+        subquery, params = queryset.order_by().values("pk").query.sql_with_params()
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"DELETE FROM {quote_name(model._meta.db_table)} "
+                f"WHERE {quote_name(model._meta.pk.column)} IN ({subquery})",
+                params,
+            )
+
+    def _clear(self):
+        # Seeded rows are bulk created without outbox events or cache updates,
+        # and there are too many of them for the delete collector, so they are
+        # removed with plain DELETEs, dependents first.
+        users = get_user_model().objects.filter(
+            email__endswith=f"@{SEED_EMAIL_DOMAIN}"
+        )
+        journeys = Journey.objects.filter(train__name__startswith=f"{SEED_PREFIX} ")
+        stations = Station.objects.filter(name__startswith=f"{SEED_PREFIX} ")
+        with transaction.atomic():
+            self._delete_rows(
+                Ticket.objects.filter(
+                    Q(journey__in=journeys) | Q(order__user__in=users)
+                )
+            )
+            self._delete_rows(
+                Journey.crew.through.objects.filter(journey__in=journeys)
+            )
+            self._delete_rows(journeys)
+            # Orders, tokens, idempotency keys, group memberships and so on.
+            for relation in users.model._meta.related_objects:
+                self._delete_rows(
+                    relation.related_model.objects.filter(
+                        **{f"{relation.field.name}__in": users}
+                    )
+                )
+            for field in users.model._meta.many_to_many:
+                self._delete_rows(
+                    field.remote_field.through.objects.filter(
+                        **{f"{field.m2m_field_name()}__in": users}
+                    )
+                )
+            self._delete_rows(users)
+            self._delete_rows(
+                Route.objects.filter(
+                    Q(source__in=stations) | Q(destination__in=stations)
+                )
+            )
+            self._delete_rows(stations)
+            Train.objects.filter(name__startswith=f"{SEED_PREFIX} ").delete()
+            Crew.objects.filter(first_name__startswith=f"{SEED_PREFIX} ").delete()
+        station_name_index.invalidate()
+        station_grid.invalidate()
+
+    def _create_stations(self, rng, options):
+        self.stations = place_stations(options["stations"], rng)
+        Station.objects.bulk_create(
+            (
+                Station(
+                    name=f"{SEED_PREFIX} station {number:05d}",
+                    latitude=latitude,
+                    longitude=longitude,
+                )
+                for number, (_, latitude, longitude) in enumerate(self.stations)
+            ),
+            batch_size=options["batch_size"],
+        )
+        return list(
+            Station.objects.filter(name__startswith=f"{SEED_PREFIX} station ")
+            .order_by("name")
+            .values_list("id", flat=True)
+        )
+
+    def _create_routes(self, station_ids, options):
+        routes = []
+        for first, second in link_stations(self.stations, options["degree"]):
+            _, first_latitude, first_longitude = self.stations[first]
+            _, second_latitude, second_longitude = self.stations[second]
+            distance = max(
+                1,
+                round(
+                    haversine_km(
+                        first_latitude,
+                        first_longitude,
+                        second_latitude,
+                        second_longitude,
+                    )
+                    * TRACK_DETOUR
+                ),
+            )
+            for source, destination in ((first, second), (second, first)):
+                routes.append(
+                    Route(
+                        source_id=station_ids[source],
+                        destination_id=station_ids[destination],
+                        distance=distance,
+                    )
+                )
+        Route.objects.bulk_create(routes, batch_size=options["batch_size"])
+
+        adjacency = {station_id: [] for station_id in station_ids}
+        for route_id, source_id, destination_id, distance in (
+            Route.objects.filter(source_id__in=station_ids)
+            .order_by("id")
+            .values_list("id", "source_id", "destination_id", "distance")
+            .iterator(chunk_size=options["batch_size"])
+        ):
+            adjacency[source_id].append((route_id, destination_id, distance))
+        return adjacency
+
+    def _create_trains(self, rng, options):
+        train_types = list(TrainType.objects.order_by("id"))
+        if not train_types:
+            train_types = [
+                TrainType.objects.create(name=name) for name in DEFAULT_TRAIN_TYPES
+            ]
+
+        new_trains = []
+        for train_type in train_types:
+            for number in range(options["trains_per_type"]):
+                cargo_layout = build_layout(rng)
+                new_trains.append(
+                    Train(
+                        name=f"{SEED_PREFIX} {train_type.name} {number:05d}",
+                        train_type=train_type,
+                        cargo_layout=cargo_layout,
+                        cargo_num=len(cargo_layout),
+                        places_in_cargo=max(cargo["seats"] for cargo in cargo_layout),
+                    )
+                )
+        Train.objects.bulk_create(new_trains, batch_size=options["batch_size"])
+        train_rows = list(
+            Train.objects.filter(name__startswith=f"{SEED_PREFIX} ")
+            .order_by("name")
+            .values_list("id", "train_type_id", "cargo_layout")
+        )
+
+        crew_count = options["crews"] or 2 * len(train_rows)
+        Crew.objects.bulk_create(
+            (
+                Crew(
+                    first_name=f"{SEED_PREFIX} {rng.choice(FIRST_NAMES)}",
+                    last_name=rng.choice(LAST_NAMES),
+                )
+                for _ in range(crew_count)
+            ),
+            batch_size=options["batch_size"],
+        )
+        crew_ids = list(
+            Crew.objects.filter(first_name__startswith=f"{SEED_PREFIX} ")
+            .order_by("id")
+            .values_list("id", flat=True)
+        )
+
+        # A train keeps its pair of crew members, so with the default crew
+        # count nobody is scheduled on two trains at once.
+        return [
+            (
+                position,
+                train_id,
+                train_type_id,
+                tuple((cargo["seats"], cargo["seat_class"]) for cargo in cargo_layout),
+                [
+                    crew_ids[(2 * position) % len(crew_ids)],
+                    crew_ids[(2 * position + 1) % len(crew_ids)],
+                ],
+            )
+            for position, (train_id, train_type_id, cargo_layout) in enumerate(
+                train_rows
+            )
+        ]
+
+    def _create_users(self, options):
+        password = make_password(None)
+        get_user_model().objects.bulk_create(
+            (
+                get_user_model()(
+                    email=f"user{number:06d}@{SEED_EMAIL_DOMAIN}", password=password
+                )
+                for number in range(options["users"])
+            ),
+            batch_size=options["batch_size"],
+        )
+        return list(
+            get_user_model()
+            .objects.filter(email__endswith=f"@{SEED_EMAIL_DOMAIN}")
+            .order_by("email")
+            .values_list("id", flat=True)
+        )
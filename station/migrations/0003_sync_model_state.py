@@ -0,0 +1,113 @@
+# Generated by Django 5.0.6 on 2026-10-19 09:35
+
+import django.db.models.deletion
+import station.models
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("station", "0002_initial"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name="order",
+            options={"ordering": ["-created_at"]},
+        ),
+        migrations.AlterModelOptions(
+            name="route",
+            options={
+                "ordering": ("source", "destination"),
+                "verbose_name": "Route",
+                "verbose_name_plural": "Routes",
+            },
+        ),
+        migrations.AlterModelOptions(
+            name="station",
+            options={
+                "ordering": ("name",),
+                "verbose_name": "Station",
+                "verbose_name_plural": "Stations",
+            },
+        ),
+        migrations.AddField(
+            model_name="train",
+            name="image",
+            field=models.ImageField(
+                null=True, upload_to=station.models.train_image_file_path
+            ),
+        ),
+        migrations.AlterField(
+            model_name="order",
+            name="user",
+            field=models.ForeignKey(
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="orders",
+                to=settings.AUTH_USER_MODEL,
+            ),
+        ),
+        migrations.AlterField(
+            model_name="station",
+            name="name",
+            field=models.CharField(max_length=100, unique=True),
+        ),
+        migrations.AlterField(
+            model_name="ticket",
+            name="journey",
+            field=models.ForeignKey(
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="tickets",
+                to="station.journey",
+            ),
+        ),
+        migrations.AlterField(
+            model_name="ticket",
+            name="order",
+            field=models.ForeignKey(
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="tickets",
+                to="station.order",
+            ),
+        ),
+        migrations.AlterField(
+            model_name="train",
+            name="name",
+            field=models.CharField(max_length=100, unique=True),
+        ),
+        migrations.AlterField(
+            model_name="traintype",
+            name="name",
+            field=models.CharField(max_length=100, unique=True),
+        ),
+        migrations.AlterUniqueTogether(
+            name="route",
+            unique_together={("source", "destination")},
+        ),
+        migrations.AlterUniqueTogether(
+            name="station",
+            unique_together={("latitude", "longitude")},
+        ),
+        migrations.AddIndex(
+            model_name="journey",
+            index=models.Index(
+                fields=["route", "train"], name="station_jou_route_i_b7588d_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="journey",
+            index=models.Index(
+                fields=["departure_time", "arrival_time"],
+                name="station_jou_departu_cd8172_idx",
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="ticket",
+            constraint=models.UniqueConstraint(
+                fields=("journey", "cargo", "seat"), name="journey_seat_unique"
+            ),
+        ),
+    ]
@@ -0,0 +1,42 @@
+# Generated by Django 5.0.6 on 2026-10-19 09:37
+
+import station.models
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("station", "0004_idempotencykey"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="train",
+            name="thumbnail",
+            field=models.ImageField(
+                blank=True,
+                null=True,
+                upload_to=station.models.train_thumbnail_file_path,
+            ),
+        ),
+        migrations.AddField(
+            model_name="train",
+            name="thumbnail_height",
+            field=models.PositiveIntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name="train",
+            name="thumbnail_webp",
+            field=models.ImageField(
+                blank=True,
+                null=True,
+                upload_to=station.models.train_thumbnail_file_path,
+            ),
+        ),
+        migrations.AddField(
+            model_name="train",
+            name="thumbnail_width",
+            field=models.PositiveIntegerField(blank=True, null=True),
+        ),
+    ]
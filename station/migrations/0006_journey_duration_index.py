@@ -0,0 +1,23 @@
+# Generated by Django 5.0.6 on 2026-10-19 09:43
+
+import django.db.models.expressions
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("station", "0005_train_thumbnails"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="journey",
+            index=models.Index(
+                django.db.models.expressions.CombinedExpression(
+                    models.F("arrival_time"), "-", models.F("departure_time")
+                ),
+                name="journey_duration_idx",
+            ),
+        ),
+    ]
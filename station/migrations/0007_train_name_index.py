@@ -0,0 +1,39 @@
+# Generated by Django 5.0.6 on 2026-10-19 09:44
+
+import django.db.models.functions.text
+from django.contrib.postgres.operations import TrigramExtension
+from django.db import migrations, models
+
+
+def create_name_trigram_index(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    schema_editor.execute(
+        "CREATE INDEX IF NOT EXISTS train_name_trgm_idx ON station_train "
+        "USING gin ((UPPER(name::text)) gin_trgm_ops)"
+    )
+
+
+def drop_name_trigram_index(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    schema_editor.execute("DROP INDEX IF EXISTS train_name_trgm_idx")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("station", "0006_journey_duration_index"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="train",
+            index=models.Index(
+                django.db.models.functions.text.Upper("name"),
+                name="train_name_upper_idx",
+            ),
+        ),
+        TrigramExtension(),
+        migrations.RunPython(create_name_trigram_index, drop_name_trigram_index),
+    ]
@@ -0,0 +1,27 @@
+from django.db import migrations
+
+
+def create_name_trigram_index(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    schema_editor.execute(
+        "CREATE INDEX IF NOT EXISTS station_name_trgm_idx ON station_station "
+        "USING gin ((UPPER(name::text)) gin_trgm_ops)"
+    )
+
+
+def drop_name_trigram_index(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    schema_editor.execute("DROP INDEX IF EXISTS station_name_trgm_idx")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("station", "0007_train_name_index"),
+    ]
+
+    operations = [
+        migrations.RunPython(create_name_trigram_index, drop_name_trigram_index),
+    ]
@@ -0,0 +1,71 @@
+# Generated by Django 5.0.6 on 2026-10-19 09:47
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("station", "0008_station_name_trigram_index"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="ticket",
+            name="fare",
+            field=models.DecimalField(
+                blank=True, decimal_places=2, max_digits=10, null=True
+            ),
+        ),
+        migrations.CreateModel(
+            name="Fare",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "seat_class",
+                    models.CharField(
+                        choices=[("first", "First class"), ("second", "Second class")],
+                        max_length=20,
+                    ),
+                ),
+                ("base_price", models.DecimalField(decimal_places=2, max_digits=8)),
+                ("price_per_km", models.DecimalField(decimal_places=4, max_digits=8)),
+                (
+                    "train_type",
+                    models.ForeignKey(
+                        blank=True,
+                        help_text="Leave empty for the fare used by train types without their own",
+                        null=True,
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="fares",
+                        to="station.traintype",
+                    ),
+                ),
+            ],
+        ),
+        migrations.AddConstraint(
+            model_name="fare",
+            constraint=models.UniqueConstraint(
+                condition=models.Q(("train_type__isnull", False)),
+                fields=("train_type", "seat_class"),
+                name="fare_train_type_seat_class_unique",
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="fare",
+            constraint=models.UniqueConstraint(
+                condition=models.Q(("train_type__isnull", True)),
+                fields=("seat_class",),
+                name="fare_default_seat_class_unique",
+            ),
+        ),
+    ]
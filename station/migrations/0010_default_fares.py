@@ -0,0 +1,34 @@
+from decimal import Decimal
+
+from django.db import migrations
+
+DEFAULT_FARES = (
+    ("first", Decimal("10.00"), Decimal("0.1500")),
+    ("second", Decimal("5.00"), Decimal("0.1000")),
+)
+
+
+def create_default_fares(apps, schema_editor):
+    Fare = apps.get_model("station", "Fare")
+    for seat_class, base_price, price_per_km in DEFAULT_FARES:
+        Fare.objects.get_or_create(
+            train_type=None,
+            seat_class=seat_class,
+            defaults={"base_price": base_price, "price_per_km": price_per_km},
+        )
+
+
+def delete_default_fares(apps, schema_editor):
+    Fare = apps.get_model("station", "Fare")
+    Fare.objects.filter(train_type=None).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("station", "0009_fares"),
+    ]
+
+    operations = [
+        migrations.RunPython(create_default_fares, delete_default_fares),
+    ]
@@ -0,0 +1,24 @@
+# Generated by Django 5.0.6 on 2026-10-19 09:49
+
+import station.models
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("station", "0010_default_fares"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="train",
+            name="cargo_layout",
+            field=models.JSONField(
+                blank=True,
+                help_text='Per cargo seats and class, ex. [{"seats": 40, "seat_class": "first"}, {"seats": 60, "seat_class": "second"}]',
+                null=True,
+                validators=[station.models.validate_cargo_layout],
+            ),
+        ),
+    ]
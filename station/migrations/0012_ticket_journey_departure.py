@@ -0,0 +1,57 @@
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery
+
+
+def copy_journey_departure(apps, schema_editor):
+    Journey = apps.get_model("station", "Journey")
+    Ticket = apps.get_model("station", "Ticket")
+    Ticket.objects.update(
+        journey_departure=Subquery(
+            Journey.objects.filter(pk=OuterRef("journey_id")).values(
+                "departure_time"
+            )[:1]
+        )
+    )
+
+
+def create_departure_brin_index(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    schema_editor.execute(
+        "CREATE INDEX IF NOT EXISTS journey_departure_brin_idx "
+        "ON station_journey USING brin (departure_time)"
+    )
+
+
+def drop_departure_brin_index(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    schema_editor.execute("DROP INDEX IF EXISTS journey_departure_brin_idx")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("station", "0011_train_cargo_layout"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="ticket",
+            name="journey_departure",
+            field=models.DateTimeField(editable=False, null=True),
+        ),
+        migrations.RunPython(copy_journey_departure, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name="ticket",
+            name="journey_departure",
+            field=models.DateTimeField(editable=False),
+        ),
+        migrations.AddIndex(
+            model_name="ticket",
+            index=models.Index(
+                fields=["journey_departure"], name="station_tic_journey_9b11f2_idx"
+            ),
+        ),
+        migrations.RunPython(create_departure_brin_index, drop_departure_brin_index),
+    ]
@@ -0,0 +1,70 @@
+# Generated by Django 5.0.6 on 2026-10-19 09:53
+
+import django.db.models.deletion
+import station.models
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("station", "0012_ticket_journey_departure"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ArchivedJourney",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("journey_id", models.BigIntegerField(unique=True)),
+                ("departure_time", models.DateTimeField(db_index=True)),
+                ("payload", models.BinaryField()),
+            ],
+            bases=(station.models.ArchivedPayloadMixin, models.Model),
+        ),
+        migrations.CreateModel(
+            name="ArchivedOrder",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("order_id", models.BigIntegerField(unique=True)),
+                ("created_at", models.DateTimeField()),
+                ("payload", models.BinaryField()),
+                (
+                    "user",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="archived_orders",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+            options={
+                "ordering": ["-created_at"],
+                "indexes": [
+                    models.Index(
+                        fields=["user", "-created_at"],
+                        name="station_arc_user_id_439524_idx",
+                    )
+                ],
+            },
+            bases=(station.models.ArchivedPayloadMixin, models.Model),
+        ),
+    ]
@@ -0,0 +1,41 @@
+from django.db import migrations
+from django.db.models import F
+
+
+def create_period_gist_index(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    # tstzrange() raises on a lower bound above the upper one, so the index
+    # cannot be built while such journeys exist.
+    Journey = apps.get_model("station", "Journey")
+    inverted = list(
+        Journey.objects.filter(departure_time__gt=F("arrival_time"))
+        .order_by("id")
+        .values_list("id", flat=True)[:20]
+    )
+    if inverted:
+        raise ValueError(
+            "Journeys arriving before they depart must be fixed before "
+            f"journey_period_gist_idx can be created, ids: {inverted}"
+        )
+    schema_editor.execute(
+        "CREATE INDEX IF NOT EXISTS journey_period_gist_idx ON station_journey "
+        "USING gist (tstzrange(departure_time, arrival_time))"
+    )
+
+
+def drop_period_gist_index(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    schema_editor.execute("DROP INDEX IF EXISTS journey_period_gist_idx")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("station", "0014_outbox_events"),
+    ]
+
+    operations = [
+        migrations.RunPython(create_period_gist_index, drop_period_gist_index),
+    ]
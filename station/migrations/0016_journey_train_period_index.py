@@ -0,0 +1,20 @@
+# Generated by Django 5.0.6 on 2026-10-19 10:24
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("station", "0015_journey_period_index"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="journey",
+            index=models.Index(
+                fields=["train", "departure_time", "arrival_time"],
+                name="journey_train_period_idx",
+            ),
+        ),
+    ]
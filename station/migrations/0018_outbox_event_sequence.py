@@ -0,0 +1,32 @@
+# Generated by Django 5.0.6 on 2026-10-19 11:31
+
+from django.db import migrations, models
+
+
+def number_dispatched_events(apps, schema_editor):
+    OutboxEvent = apps.get_model("station", "OutboxEvent")
+    events = OutboxEvent.objects.filter(dispatched_at__isnull=False).order_by("id")
+    batch = []
+    for sequence, event in enumerate(events.only("id").iterator(), start=1):
+        event.sequence = sequence
+        batch.append(event)
+        if len(batch) == 1000:
+            OutboxEvent.objects.bulk_update(batch, ["sequence"])
+            batch = []
+    OutboxEvent.objects.bulk_update(batch, ["sequence"])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("station", "0017_outbox_ticket_updated"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="outboxevent",
+            name="sequence",
+            field=models.BigIntegerField(blank=True, null=True, unique=True),
+        ),
+        migrations.RunPython(number_dispatched_events, migrations.RunPython.noop),
+    ]
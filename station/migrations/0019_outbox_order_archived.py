@@ -0,0 +1,28 @@
+# Generated by Django 5.0.6 on 2026-10-19 11:35
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("station", "0018_outbox_event_sequence"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="outboxevent",
+            name="event_type",
+            field=models.CharField(
+                choices=[
+                    ("order.created", "Order Created"),
+                    ("order.deleted", "Order Deleted"),
+                    ("order.archived", "Order Archived"),
+                    ("ticket.created", "Ticket Created"),
+                    ("ticket.updated", "Ticket Updated"),
+                    ("ticket.deleted", "Ticket Deleted"),
+                ],
+                max_length=30,
+            ),
+        ),
+    ]
@@ -1,9 +1,14 @@
+import json
 import os
 import uuid
+import zlib
 
 from django.conf import settings
-from django.db import models
-from django.db.models import UniqueConstraint
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import models, transaction
+from django.db.models import ExpressionWrapper, F, Q, UniqueConstraint
+from django.db.models.functions import Upper
 from django.utils.text import slugify
 from rest_framework.exceptions import ValidationError
 
@@ -49,6 +54,42 @@ class TrainType(models.Model):
         return self.name
 
 
+class SeatClass(models.TextChoices):
+    FIRST = "first", "First class"
+    SECOND = "second", "Second class"
+
+
+class Fare(models.Model):
+    train_type = models.ForeignKey(
+        TrainType,
+        null=True,
+        blank=True,
+        on_delete=models.CASCADE,
+        related_name="fares",
+        help_text="Leave empty for the fare used by train types without their own",
+    )
+    seat_class = models.CharField(max_length=20, choices=SeatClass.choices)
+    base_price = models.DecimalField(max_digits=8, decimal_places=2)
+    price_per_km = models.DecimalField(max_digits=8, decimal_places=4)
+
+    def __str__(self):
+        return f"{self.train_type or 'Default'} {self.get_seat_class_display()}"
+
+    class Meta:
+        constraints = [
+            UniqueConstraint(
+                fields=["train_type", "seat_class"],
+                condition=Q(train_type__isnull=False),
+                name="fare_train_type_seat_class_unique",
+            ),
+            UniqueConstraint(
+                fields=["seat_class"],
+                condition=Q(train_type__isnull=True),
+                name="fare_default_seat_class_unique",
+            ),
+        ]
+
+
 def train_image_file_path(instance, filename):
     _, extension = os.path.splitext(filename)
     filename = f"{slugify(instance.name)}-{uuid.uuid4()}{extension}"
@@ -56,20 +97,80 @@ def train_image_file_path(instance, filename):
     return os.path.join("uploads/movies/", filename)
 
 
+def train_thumbnail_file_path(instance, filename):
+    return os.path.join("uploads/trains/thumbnails/", filename)
+
+
+def build_cargo_layout(cargo_layout, cargo_num, places_in_cargo):
+    """Return ((seats, seat_class), ...) per cargo, defaulting to uniform cargos"""
+    if cargo_layout:
+        return tuple((cargo["seats"], cargo["seat_class"]) for cargo in cargo_layout)
+    return ((places_in_cargo, SeatClass.SECOND.value),) * cargo_num
+
+
+def validate_cargo_layout(value):
+    if not isinstance(value, list) or not value:
+        raise DjangoValidationError("Cargo layout must be a non-empty list.")
+    for cargo in value:
+        if (
+            not isinstance(cargo, dict)
+            or set(cargo) != {"seats", "seat_class"}
+            or not isinstance(cargo["seats"], int)
+            or cargo["seats"] < 1
+            or cargo["seat_class"] not in SeatClass.values
+        ):
+            raise DjangoValidationError(
+                "Each cargo must be {'seats': <positive int>, "
+                f"'seat_class': <one of {', '.join(SeatClass.values)}>}}."
+            )
+
+
 class Train(models.Model):
     name = models.CharField(max_length=100, unique=True)
     cargo_num = models.IntegerField()
     places_in_cargo = models.IntegerField()
     train_type = models.ForeignKey(TrainType, on_delete=models.CASCADE)
     image = models.ImageField(null=True, upload_to=train_image_file_path)
+    thumbnail = models.ImageField(
+        null=True, blank=True, upload_to=train_thumbnail_file_path
+    )
+    thumbnail_webp = models.ImageField(
+        null=True, blank=True, upload_to=train_thumbnail_file_path
+    )
+    thumbnail_width = models.PositiveIntegerField(null=True, blank=True)
+    thumbnail_height = models.PositiveIntegerField(null=True, blank=True)
+    cargo_layout = models.JSONField(
+        null=True,
+        blank=True,
+        validators=[validate_cargo_layout],
+        help_text="Per cargo seats and class, ex. "
+        '[{"seats": 40, "seat_class": "first"}, {"seats": 60, "seat_class": "second"}]',
+    )
+
+    @property
+    def layout(self):
+        return build_cargo_layout(
+            self.cargo_layout, self.cargo_num, self.places_in_cargo
+        )
 
     @property
     def total_capacity(self):
-        return self.cargo_num * self.places_in_cargo
+        return sum(seats for seats, _ in self.layout)
+
+    def save(self, *args, **kwargs):
+        if self.cargo_layout:
+            self.cargo_num = len(self.cargo_layout)
+            self.places_in_cargo = max(cargo["seats"] for cargo in self.cargo_layout)
+        return super().save(*args, **kwargs)
 
     def __str__(self):
         return self.name
 
+    class Meta:
+        indexes = [
+            models.Index(Upper("name"), name="train_name_upper_idx"),
+        ]
+
 
 class Crew(models.Model):
     first_name = models.CharField(max_length=100)
@@ -83,6 +184,16 @@ class Crew(models.Model):
         return f"{self.full_name}"
 
 
+def format_travel_duration(duration):
+    hours, remainder = divmod(duration.seconds, 3600)
+    return f"{duration.days} days, {hours} hours"
+
+
+class JourneyQuerySet(models.QuerySet):
+    def with_duration(self):
+        return self.annotate(duration=Journey.duration_expression())
+
+
 class Journey(models.Model):
     route = models.ForeignKey(Route, on_delete=models.CASCADE)
     train = models.ForeignKey(Train, on_delete=models.CASCADE)
@@ -90,12 +201,73 @@ class Journey(models.Model):
     arrival_time = models.DateTimeField()
     crew = models.ManyToManyField(Crew, related_name="journeys")
 
+    objects = JourneyQuerySet.as_manager()
+
+    @staticmethod
+    def duration_expression():
+        return ExpressionWrapper(
+            F("arrival_time") - F("departure_time"),
+            output_field=models.DurationField(),
+        )
+
     @property
     def travel_duration(self):
-        duration = self.arrival_time - self.departure_time
-        days = duration.days
-        hours, remainder = divmod(duration.seconds, 3600)
-        return f"{days} days, {hours} hours"
+        return format_travel_duration(self.arrival_time - self.departure_time)
+
+    @staticmethod
+    def validate_train_schedule(
+        train, departure_time, arrival_time, journey_id, error_to_raise
+    ):
+        """Reject journeys for a train that is already running at that time.
+
+        Inside a transaction the train row is locked first, so concurrent
+        writes for the same train run the check one after another.
+        """
+        if departure_time >= arrival_time:
+            raise error_to_raise(
+                {"arrival_time": "arrival_time must be after departure_time"}
+            )
+        if transaction.get_connection().in_atomic_block:
+            list(
+                Train.objects.select_for_update()
+                .filter(pk=getattr(train, "pk", train))
+                .values_list("id", flat=True)
+            )
+        overlapping = (
+            Journey.objects.filter(
+                train=train,
+                departure_time__lt=arrival_time,
+                arrival_time__gt=departure_time,
+            )
+            .exclude(id=journey_id)
+            .order_by("departure_time")
+            .values("id", "departure_time", "arrival_time")
+            .first()
+        )
+        if overlapping is not None:
+            raise error_to_raise(
+                {
+                    "train": f"train is already running journey {overlapping['id']} "
+                    f"from {overlapping['departure_time']:%Y-%m-%d %H:%M} "
+                    f"to {overlapping['arrival_time']:%Y-%m-%d %H:%M}"
+                }
+            )
+
+    def clean(self):
+        if self.train_id and self.departure_time and self.arrival_time:
+            Journey.validate_train_schedule(
+                self.train_id,
+                self.departure_time,
+                self.arrival_time,
+                self.id,
+                DjangoValidationError,
+            )
+
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+        self.tickets.exclude(journey_departure=self.departure_time).update(
+            journey_departure=self.departure_time
+        )
 
     def __str__(self):
         return f"Journey on {self.departure_time} from {self.route}"
@@ -103,7 +275,15 @@ class Journey(models.Model):
     class Meta:
         indexes = [
             models.Index(fields=["route", "train"]),
+            models.Index(
+                fields=["train", "departure_time", "arrival_time"],
+                name="journey_train_period_idx",
+            ),
             models.Index(fields=["departure_time", "arrival_time"]),
+            models.Index(
+                F("arrival_time") - F("departure_time"),
+                name="journey_duration_idx",
+            ),
         ]
 
 
@@ -125,6 +305,10 @@ class Ticket(models.Model):
         Journey, on_delete=models.CASCADE, related_name="tickets"
     )
     order = models.ForeignKey(Order, on_delete=models.CASCADE, related_name="tickets")
+    fare = models.DecimalField(max_digits=10, decimal_places=2, null=True, blank=True)
+    # Copy of journey.departure_time, the partition key of a partitioned
+    # station_ticket table (see the manage_partitions command).
+    journey_departure = models.DateTimeField(editable=False)
 
     class Meta:
         constraints = [
@@ -132,29 +316,33 @@ class Ticket(models.Model):
                 fields=["journey", "cargo", "seat"], name="journey_seat_unique"
             ),
         ]
+        indexes = [
+            models.Index(fields=["journey_departure"]),
+        ]
 
     @staticmethod
-    def validate_ticket(cargo, seat, train, error_to_raise):
-        for ticket_attr_value, ticket_attr_name, train_attr_name in [
-            (cargo, "cargo", "cargo_num"),
-            (seat, "seat", "places_in_cargo"),
-        ]:
-            count_attrs = getattr(train, train_attr_name)
-            if not (1 <= ticket_attr_value <= count_attrs):
-                raise error_to_raise(
-                    {
-                        ticket_attr_name: f"{ticket_attr_name} "
-                        f"number must be in available range: "
-                        f"(1, {train_attr_name}): "
-                        f"(1, {count_attrs})"
-                    }
-                )
+    def validate_ticket(cargo, seat, layout, error_to_raise):
+        if not (1 <= cargo <= len(layout)):
+            raise error_to_raise(
+                {
+                    "cargo": f"cargo number must be in available range: "
+                    f"(1, cargo_num): (1, {len(layout)})"
+                }
+            )
+        seats, _ = layout[cargo - 1]
+        if not (1 <= seat <= seats):
+            raise error_to_raise(
+                {
+                    "seat": f"seat number must be in available range: "
+                    f"(1, places_in_cargo): (1, {seats})"
+                }
+            )
 
     def clean(self):
         Ticket.validate_ticket(
             self.cargo,
             self.seat,
-            self.journey.train,
+            self.journey.train.layout,
             ValidationError,
         )
 
@@ -165,6 +353,7 @@ class Ticket(models.Model):
         using=None,
         update_fields=None,
     ):
+        self.journey_departure = self.journey.departure_time
         self.full_clean()
         return super(Ticket, self).save(
             force_insert, force_update, using, update_fields
@@ -172,3 +361,98 @@ class Ticket(models.Model):
 
     def __str__(self):
         return f"{self.journey} {self.cargo} {self.seat}"
+
+
+class IdempotencyKey(models.Model):
+    key = models.CharField(max_length=255)
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="idempotency_keys",
+    )
+    request_hash = models.CharField(max_length=64)
+    response_status = models.PositiveSmallIntegerField()
+    response_body = models.JSONField(encoder=DjangoJSONEncoder)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        constraints = [
+            UniqueConstraint(fields=["user", "key"], name="user_idempotency_key_unique"),
+        ]
+        indexes = [
+            models.Index(fields=["created_at"]),
+        ]
+
+    def __str__(self):
+        return f"{self.user} {self.key}"
+
+
+class ArchivedPayloadMixin:
+    @property
+    def data(self):
+        return json.loads(zlib.decompress(self.payload))
+
+    @staticmethod
+    def compress(data):
+        return zlib.compress(json.dumps(data, cls=DjangoJSONEncoder).encode())
+
+
+class ArchivedJourney(ArchivedPayloadMixin, models.Model):
+    journey_id = models.BigIntegerField(unique=True)
+    departure_time = models.DateTimeField(db_index=True)
+    payload = models.BinaryField()
+
+    def __str__(self):
+        return f"Archived journey {self.journey_id}"
+
+
+class ArchivedOrder(ArchivedPayloadMixin, models.Model):
+    order_id = models.BigIntegerField(unique=True)
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="archived_orders",
+    )
+    created_at = models.DateTimeField()
+    payload = models.BinaryField()
+
+    class Meta:
+        ordering = ["-created_at"]
+        indexes = [
+            models.Index(fields=["user", "-created_at"]),
+        ]
+
+    def __str__(self):
+        return f"Archived order {self.order_id}"
+
+
+class OutboxEvent(models.Model):
+    class EventType(models.TextChoices):
+        ORDER_CREATED = "order.created"
+        ORDER_DELETED = "order.deleted"
+        ORDER_ARCHIVED = "order.archived"
+        TICKET_CREATED = "ticket.created"
+        TICKET_UPDATED = "ticket.updated"
+        TICKET_DELETED = "ticket.deleted"
+
+    event_type = models.CharField(max_length=30, choices=EventType.choices)
+    aggregate_id = models.BigIntegerField()
+    payload = models.JSONField(encoder=DjangoJSONEncoder)
+    created_at = models.DateTimeField(auto_now_add=True, db_index=True)
+    dispatched_at = models.DateTimeField(null=True, blank=True)
+    # Position in delivery order, assigned by dispatch_batch. Unlike ids,
+    # sequences become visible in order, so the feed can page by them.
+    sequence = models.BigIntegerField(null=True, blank=True, unique=True)
+
+    class Meta:
+        ordering = ["id"]
+        indexes = [
+            models.Index(
+                fields=["id"],
+                condition=Q(dispatched_at__isnull=True),
+                name="outbox_pending_idx",
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.event_type} {self.aggregate_id}"
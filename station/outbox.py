@@ -0,0 +1,207 @@
+import json
+import queue
+import urllib.request
+from pathlib import Path
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import connection, transaction
+from django.db.models import Max
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+from station.live import publish_seat_changes
+from station.models import OutboxEvent
+
+EventType = OutboxEvent.EventType
+
+# pg_advisory_xact_lock key serializing dispatch_batch runs.
+DISPATCH_LOCK_ID = 7_200_501
+
+
+def ticket_payload(ticket):
+    return {
+        "id": ticket.id,
+        "order": ticket.order_id,
+        "journey": ticket.journey_id,
+        "cargo": ticket.cargo,
+        "seat": ticket.seat,
+        "fare": ticket.fare,
+    }
+
+
+def order_payload(order):
+    return {
+        "id": order.id,
+        "user": order.user_id,
+        "created_at": order.created_at,
+        "tickets": [ticket_payload(ticket) for ticket in order.tickets.all()],
+    }
+
+
+ORDER_EVENTS = (
+    EventType.ORDER_CREATED,
+    EventType.ORDER_DELETED,
+    EventType.ORDER_ARCHIVED,
+)
+
+
+def event_payload(event_type, instance):
+    if event_type in ORDER_EVENTS:
+        return order_payload(instance)
+    return ticket_payload(instance)
+
+
+def record_event(event_type, instance, previous=None):
+    """Store an event for instance, inside the caller's transaction.
+
+    previous is the {"journey", "cargo", "seat"} of an updated ticket before
+    the change.
+    """
+    if event_type != EventType.TICKET_UPDATED:
+        return record_events(event_type, [instance])[0]
+    payload = event_payload(event_type, instance)
+    if previous is not None:
+        payload["previous"] = previous
+    event = OutboxEvent.objects.create(
+        event_type=event_type, aggregate_id=instance.id, payload=payload
+    )
+    if previous is not None and any(
+        previous[field] != payload[field] for field in previous
+    ):
+        publish_seat_changes([previous], taken=False)
+        publish_seat_changes([payload], taken=True)
+    return event
+
+
+def record_events(event_type, instances):
+    """Store one event per instance with a single insert, see record_event"""
+    events = []
+    tickets = []
+    for instance in instances:
+        payload = event_payload(event_type, instance)
+        tickets.extend(payload.get("tickets", [payload]))
+        events.append(
+            OutboxEvent(
+                event_type=event_type, aggregate_id=instance.id, payload=payload
+            )
+        )
+    if not events:
+        return []
+    OutboxEvent.objects.bulk_create(events)
+    if event_type == EventType.ORDER_ARCHIVED:
+        # Archived orders are for journeys that already arrived, their seats
+        # are not released.
+        return events
+    publish_seat_changes(
+        tickets,
+        taken=event_type in (EventType.ORDER_CREATED, EventType.TICKET_CREATED),
+    )
+    return events
+
+
+def event_data(event):
+    return {
+        "id": event.id,
+        "sequence": event.sequence,
+        "event_type": event.event_type,
+        "aggregate_id": event.aggregate_id,
+        "payload": event.payload,
+        "created_at": event.created_at,
+    }
+
+
+class FileSink:
+    """Append events to a JSON lines file"""
+
+    def __init__(self, path="outbox.jsonl"):
+        self.path = Path(path)
+
+    def send(self, events):
+        with self.path.open("a") as events_file:
+            for event in events:
+                events_file.write(json.dumps(event, cls=DjangoJSONEncoder) + "\n")
+
+
+class WebhookSink:
+    """POST each batch of events as a JSON list"""
+
+    def __init__(self, url, timeout=10):
+        self.url = url
+        self.timeout = timeout
+
+    def send(self, events):
+        request = urllib.request.Request(
+            self.url,
+            method="POST",
+            data=json.dumps(events, cls=DjangoJSONEncoder).encode(),
+            headers={"Content-Type": "application/json"},
+        )
+        with urllib.request.urlopen(request, timeout=self.timeout) as response:
+            response.read()
+
+
+local_queue = queue.Queue()
+
+
+class LocalQueueSink:
+    """Put events on an in-process queue, for consumers in the same process"""
+
+    def __init__(self, target=None):
+        self.queue = target if target is not None else local_queue
+
+    def send(self, events):
+        for event in events:
+            self.queue.put(event)
+
+
+def get_sink(path=None):
+    """Build the sink at path, or the configured OUTBOX_SINK with its options"""
+    if path is None:
+        return import_string(settings.OUTBOX_SINK)(**settings.OUTBOX_SINK_OPTIONS)
+    return import_string(path)()
+
+
+def dispatch_batch(sink, batch_size):
+    """Deliver the oldest undispatched events, returns how many were sent.
+
+    Delivery happens before the events are marked, so a failing sink leaves
+    them pending and they are sent again on the next run. Batches take
+    the next sequence numbers under a lock held until commit, so sequences
+    become visible in order even when event ids commit out of order.
+    """
+    with transaction.atomic():
+        if connection.vendor == "postgresql":
+            with connection.cursor() as cursor:
+                cursor.execute("SELECT pg_advisory_xact_lock(%s)", [DISPATCH_LOCK_ID])
+        pending = OutboxEvent.objects.filter(dispatched_at__isnull=True)
+        events = list(pending.order_by("id")[:batch_size])
+        if not events:
+            return 0
+        last_sequence = (
+            OutboxEvent.objects.aggregate(Max("sequence"))["sequence__max"] or 0
+        )
+        dispatched_at = timezone.now()
+        for sequence, event in enumerate(events, start=last_sequence + 1):
+            event.sequence = sequence
+            event.dispatched_at = dispatched_at
+        sink.send([event_data(event) for event in events])
+        OutboxEvent.objects.bulk_update(events, ["sequence", "dispatched_at"])
+    return len(events)
+
+
+def purge_dispatched_events(now=None):
+    """Delete dispatched events older than OUTBOX_RETENTION.
+
+    The last dispatched event is kept so sequences continue from it.
+    """
+    now = now or timezone.now()
+    last_sequence = OutboxEvent.objects.aggregate(Max("sequence"))["sequence__max"]
+    return (
+        OutboxEvent.objects.filter(
+            dispatched_at__isnull=False,
+            created_at__lt=now - settings.OUTBOX_RETENTION,
+        )
+        .exclude(sequence=last_sequence)
+        .delete()[0]
+    )
@@ -0,0 +1,134 @@
+from django.contrib.postgres.fields import DateTimeRangeField
+from django.db import connections
+from django.db.models import Func
+
+from station.models import Journey
+
+CrewAssignment = Journey.crew.through
+
+
+class CrewScheduleConflict(Exception):
+    def __init__(self, conflicts):
+        super().__init__("Crew members would serve overlapping journeys.")
+        self.conflicts = conflicts
+
+
+class TsTzRange(Func):
+    function = "TSTZRANGE"
+    output_field = DateTimeRangeField()
+
+
+def overlapping(queryset, start, end, prefix=""):
+    """Filter rows whose [departure_time, arrival_time) period overlaps [start, end).
+
+    On PostgreSQL the condition matches the expression of
+    journey_period_gist_idx, so the range lookup is served by the index.
+    """
+    departure, arrival = f"{prefix}departure_time", f"{prefix}arrival_time"
+    if connections[queryset.db].vendor == "postgresql":
+        return queryset.alias(period=TsTzRange(departure, arrival)).filter(
+            period__overlap=(start, end)
+        )
+    return queryset.filter(**{f"{departure}__lt": end, f"{arrival}__gt": start})
+
+
+def crew_conflicts(assignments):
+    """Find overlapping journeys for a batch of (crew_id, journey) assignments.
+
+    The crews' existing journeys are loaded with one range query over the
+    period covered by the batch, assignments in the same batch are checked
+    against each other as well. Returns one conflict per overlapping pair.
+    """
+    if not assignments:
+        return []
+    start = min(journey.departure_time for _, journey in assignments)
+    end = max(journey.arrival_time for _, journey in assignments)
+
+    schedules = {}
+    scheduled = overlapping(
+        CrewAssignment.objects.filter(
+            crew_id__in={crew_id for crew_id, _ in assignments}
+        ),
+        start,
+        end,
+        prefix="journey__",
+    ).values_list(
+        "crew_id", "journey_id", "journey__departure_time", "journey__arrival_time"
+    )
+    for crew_id, journey_id, departure_time, arrival_time in scheduled:
+        schedules.setdefault(crew_id, {})[journey_id] = (departure_time, arrival_time)
+    for crew_id, journey in assignments:
+        schedules.setdefault(crew_id, {})[journey.id] = (
+            journey.departure_time,
+            journey.arrival_time,
+        )
+
+    conflicts = []
+    for crew_id, journey in assignments:
+        for other_id, (departure_time, arrival_time) in schedules[crew_id].items():
+            if (
+                other_id != journey.id
+                and departure_time < journey.arrival_time
+                and journey.departure_time < arrival_time
+            ):
+                conflicts.append(
+                    {
+                        "crew": crew_id,
+                        "journey": journey.id,
+                        "conflicting_journey": other_id,
+                    }
+                )
+    return conflicts
+
+
+def assign_crews(assignments):
+    """Add (crew_id, journey) assignments with a single bulk insert.
+
+    Pairs that already exist are left alone. Run inside a transaction that
+    locked the crews so concurrent rosters cannot both pass the checks.
+    """
+    return CrewAssignment.objects.bulk_create(
+        [
+            CrewAssignment(crew_id=crew_id, journey_id=journey.id)
+            for crew_id, journey in assignments
+        ],
+        ignore_conflicts=True,
+    )
+
+
+def schedule_conflicts(journeys):
+    """Map journey ids to the ids of the other journeys overlapping them.
+
+    journeys must be sorted by departure_time.
+    """
+    conflicts = {journey["id"]: [] for journey in journeys}
+    active = []
+    for journey in journeys:
+        active = [
+            other
+            for other in active
+            if other["arrival_time"] > journey["departure_time"]
+        ]
+        for other in active:
+            conflicts[journey["id"]].append(other["id"])
+            conflicts[other["id"]].append(journey["id"])
+        active.append(journey)
+    return conflicts
+
+
+def train_conflicts(journeys):
+    """Yield (journey, conflicting_journey) pairs of overlapping train journeys.
+
+    journeys are (id, train_id, departure_time, arrival_time) rows sorted by
+    train and departure time, each one is compared with the journey of the
+    same train that arrives last so far, so the sweep is linear.
+    """
+    train_id = latest = None
+    for journey in journeys:
+        if journey[1] != train_id:
+            train_id, latest = journey[1], journey
+            continue
+        if journey[2] < latest[3]:
+            yield journey, latest
+        if journey[3] > latest[3]:
+            latest = journey
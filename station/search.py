@@ -0,0 +1,118 @@
+from bisect import bisect_left
+from collections import Counter
+
+from django.db import connection
+from django.db.models import Case, IntegerField, Q, Value, When
+from django.db.models.functions import Upper
+
+from station.models import Station
+from station.snapshots import SharedSnapshot
+
+TRIGRAM_SIMILARITY_THRESHOLD = 0.3
+
+
+def trigrams(text):
+    padded = f"  {text} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class StationNameIndex:
+    """In-memory prefix and trigram index over station names.
+
+    Built lazily from the database and rebuilt after a station change is
+    committed in any worker.
+    """
+
+    def __init__(self):
+        self._snapshot = SharedSnapshot("station-name-index", self._build)
+
+    def invalidate(self):
+        self._snapshot.invalidate()
+
+    def _build(self):
+        entries = sorted(
+            (name.casefold(), station_id, name)
+            for station_id, name in Station.objects.values_list("id", "name")
+        )
+        postings = {}
+        trigram_counts = []
+        for position, (key, _, _) in enumerate(entries):
+            key_trigrams = trigrams(key)
+            trigram_counts.append(len(key_trigrams))
+            for trigram in key_trigrams:
+                postings.setdefault(trigram, []).append(position)
+
+        return (
+            [key for key, _, _ in entries],
+            [(station_id, name) for _, station_id, name in entries],
+            postings,
+            trigram_counts,
+        )
+
+    def search(self, query, limit):
+        keys, stations, postings, trigram_counts = self._snapshot.get()
+        query = query.casefold()
+
+        matches = []
+        position = bisect_left(keys, query)
+        while (
+            position < len(keys)
+            and len(matches) < limit
+            and keys[position].startswith(query)
+        ):
+            matches.append(position)
+            position += 1
+
+        if len(matches) < limit and len(query) >= 3:
+            query_trigrams = trigrams(query)
+            shared = Counter()
+            for trigram in query_trigrams:
+                shared.update(postings.get(trigram, ()))
+            scored = []
+            for candidate, count in shared.items():
+                similarity = count / (
+                    len(query_trigrams) + trigram_counts[candidate] - count
+                )
+                if similarity >= TRIGRAM_SIMILARITY_THRESHOLD:
+                    scored.append((-similarity, keys[candidate], candidate))
+            prefix_matches = set(matches)
+            for _, _, candidate in sorted(scored):
+                if len(matches) >= limit:
+                    break
+                if candidate not in prefix_matches:
+                    matches.append(candidate)
+
+        return [
+            {"id": stations[position][0], "name": stations[position][1]}
+            for position in matches
+        ]
+
+
+station_name_index = StationNameIndex()
+
+
+def _search_postgres(query, limit):
+    from django.contrib.postgres.search import TrigramSimilarity
+
+    query = query.upper()
+    stations = (
+        Station.objects.annotate(upper_name=Upper("name"))
+        .filter(Q(upper_name__startswith=query) | Q(upper_name__trigram_similar=query))
+        .annotate(
+            is_prefix=Case(
+                When(upper_name__startswith=query, then=Value(1)),
+                default=Value(0),
+                output_field=IntegerField(),
+            ),
+            similarity=TrigramSimilarity(Upper("name"), query),
+        )
+        .order_by("-is_prefix", "-similarity", "name")
+        .values("id", "name")[:limit]
+    )
+    return list(stations)
+
+
+def autocomplete_stations(query, limit):
+    if connection.vendor == "postgresql":
+        return _search_postgres(query, limit)
+    return station_name_index.search(query, limit)
@@ -1,11 +1,114 @@
+from django.core.exceptions import FieldDoesNotExist
 from django.db import transaction
 from rest_framework import serializers
 from rest_framework.exceptions import ValidationError
 
-from station.models import Station, Route, TrainType, Train, Crew, Journey, Order, Ticket
-
-
-class StationSerializer(serializers.ModelSerializer):
+from station.fares import fare_engine
+from station.models import (
+    Station,
+    Route,
+    TrainType,
+    Train,
+    Crew,
+    Journey,
+    Order,
+    Ticket,
+    OutboxEvent,
+)
+from station.outbox import record_event
+from station.rostering import CrewScheduleConflict, assign_crews, crew_conflicts
+
+
+class SparseFieldsetMixin:
+    """ModelSerializer trimmed to ?fields= that nests only ?expand= relations.
+
+    Relations in expandable_fields keep their default representation, usually
+    a primary key, unless expanded. computed_fields lists the columns behind
+    fields that are not model columns, so the queryset can select only the
+    columns the response needs.
+    """
+
+    expandable_fields = {}
+    default_expand = ()
+    computed_fields = {}
+
+    def __init__(self, *args, fields=None, expand=None, **kwargs):
+        self.expand = set(self.default_expand if expand is None else expand)
+        # Explicitly expanded relations are returned even when not in fields.
+        self.sparse_fields = None if fields is None else {*fields, *(expand or ())}
+        super().__init__(*args, **kwargs)
+
+    def get_fields(self):
+        fields = super().get_fields()
+        for name, (serializer_class, options) in self.expandable_fields.items():
+            if name in self.expand:
+                fields[name] = serializer_class(read_only=True, **options)
+        if self.sparse_fields is not None:
+            fields = {
+                name: field
+                for name, field in fields.items()
+                if name in self.sparse_fields
+            }
+        return fields
+
+    @classmethod
+    def optimize_queryset(cls, queryset, fields=None, expand=None):
+        """Select the columns and relations the serializer is going to read"""
+        serializer = cls(fields=fields, expand=expand)
+        model = cls.Meta.model
+        columns = {model._meta.pk.name}
+        for name, field in serializer.fields.items():
+            if name in cls.computed_fields:
+                columns.update(cls.computed_fields[name])
+                continue
+            try:
+                model_field = model._meta.get_field(field.source)
+            except FieldDoesNotExist:
+                # Unknown attribute, it may read any column.
+                columns = None
+                break
+            if model_field.concrete and not model_field.many_to_many:
+                columns.add(model_field.name)
+
+        select, prefetch = traversed_relations(serializer)
+        if columns is not None:
+            queryset = queryset.only(*columns)
+        if select:
+            # select_related() without lookups would follow every relation.
+            queryset = queryset.select_related(*select)
+        return queryset.prefetch_related(*prefetch)
+
+
+def traversed_relations(serializer, prefix=""):
+    """select_related and prefetch_related lookups the serializer follows"""
+    select, prefetch = [], []
+    model = serializer.Meta.model
+    for field in serializer.fields.values():
+        try:
+            model_field = model._meta.get_field(field.source)
+        except FieldDoesNotExist:
+            continue
+        if not model_field.is_relation:
+            continue
+
+        lookup = prefix + model_field.name
+        if model_field.many_to_many or model_field.one_to_many:
+            prefetch.append(lookup)
+            nested, nested_lookups = getattr(field, "child", None), prefetch
+        elif isinstance(field, serializers.PrimaryKeyRelatedField):
+            # Reads the foreign key column only.
+            continue
+        else:
+            select.append(lookup)
+            nested, nested_lookups = field, select
+        if isinstance(nested, serializers.ModelSerializer):
+            nested_select, nested_prefetch = traversed_relations(nested, f"{lookup}__")
+            nested_lookups.extend(nested_select)
+            prefetch.extend(nested_prefetch)
+    return select, prefetch
+
+
+class StationSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     class Meta:
         model = Station
         fields = "__all__"
@@ -28,9 +131,12 @@ class RouteListSerializer(RouteSerializer):
     )
 
 
-class RouteRetrieveSerializer(RouteSerializer):
-    source = StationSerializer()
-    destination = StationSerializer()
+class RouteRetrieveSerializer(SparseFieldsetMixin, RouteSerializer):
+    expandable_fields = {
+        "source": (StationSerializer, {}),
+        "destination": (StationSerializer, {}),
+    }
+    default_expand = ("source", "destination")
 
 
 class TrainTypeSerializer(serializers.ModelSerializer):
@@ -47,17 +153,119 @@ class CrewSerializer(serializers.ModelSerializer):
         fields = ["id", "full_name"]
 
 
+class CrewAssignmentSerializer(serializers.Serializer):
+    journey = serializers.IntegerField()
+    crew = serializers.ListField(child=serializers.IntegerField(), allow_empty=False)
+
+
+class CrewRosterSerializer(serializers.Serializer):
+    max_assignments = 1000
+
+    assignments = CrewAssignmentSerializer(many=True, allow_empty=False)
+
+    def validate_assignments(self, assignments):
+        journey_ids = {assignment["journey"] for assignment in assignments}
+        crew_ids = {
+            crew_id for assignment in assignments for crew_id in assignment["crew"]
+        }
+        pairs = len(
+            {
+                (assignment["journey"], crew_id)
+                for assignment in assignments
+                for crew_id in assignment["crew"]
+            }
+        )
+        if pairs > self.max_assignments:
+            raise ValidationError(
+                f"At most {self.max_assignments} crew assignments at once."
+            )
+
+        journeys = Journey.objects.only("departure_time", "arrival_time").in_bulk(
+            journey_ids
+        )
+        missing_journeys = journey_ids - set(journeys)
+        missing_crews = crew_ids - set(
+            Crew.objects.filter(id__in=crew_ids).values_list("id", flat=True)
+        )
+        errors = [
+            f"Unknown {name} ids: {', '.join(map(str, sorted(missing)))}."
+            for name, missing in (
+                ("journey", missing_journeys),
+                ("crew", missing_crews),
+            )
+            if missing
+        ]
+        if errors:
+            raise ValidationError(errors)
+        for assignment in assignments:
+            assignment["journey"] = journeys[assignment["journey"]]
+        return assignments
+
+    def create(self, validated_data):
+        assignments = list(
+            dict.fromkeys(
+                (crew_id, assignment["journey"])
+                for assignment in validated_data["assignments"]
+                for crew_id in assignment["crew"]
+            )
+        )
+        with transaction.atomic():
+            # Serialize rosters touching the same crews.
+            list(
+                Crew.objects.select_for_update()
+                .filter(id__in={crew_id for crew_id, _ in assignments})
+                .order_by("id")
+                .values_list("id", flat=True)
+            )
+            conflicts = crew_conflicts(assignments)
+            if conflicts:
+                raise CrewScheduleConflict(conflicts)
+            assign_crews(assignments)
+        return validated_data
+
+    def to_representation(self, instance):
+        return {
+            "assignments": [
+                {"journey": assignment["journey"].id, "crew": assignment["crew"]}
+                for assignment in instance["assignments"]
+            ]
+        }
+
+
 class TrainSerializer(serializers.ModelSerializer):
     total_capacity = serializers.ReadOnlyField()
 
     class Meta:
         model = Train
         fields = "__all__"
+        # Images only change through the upload_image action, which also
+        # regenerates the thumbnails.
+        read_only_fields = (
+            "image",
+            "thumbnail",
+            "thumbnail_webp",
+            "thumbnail_width",
+            "thumbnail_height",
+        )
 
 
 class TrainListSerializer(TrainSerializer):
     train_type = serializers.SlugRelatedField(read_only=True, slug_field="name")
 
+    class Meta(TrainSerializer.Meta):
+        fields = (
+            "id",
+            "name",
+            "cargo_num",
+            "places_in_cargo",
+            "train_type",
+            "total_capacity",
+            "thumbnail",
+            "thumbnail_webp",
+            "thumbnail_width",
+            "thumbnail_height",
+        )
+
 
 class TrainImageSerializer(serializers.ModelSerializer):
     class Meta:
@@ -65,9 +273,14 @@ class TrainImageSerializer(serializers.ModelSerializer):
         fields = ["id", "image"]
 
 
-class TrainRetrieveSerializer(TrainSerializer):
+class TrainRetrieveSerializer(SparseFieldsetMixin, TrainSerializer):
     train_type = serializers.SlugRelatedField(read_only=True, slug_field="name")
 
+    expandable_fields = {"train_type": (TrainTypeSerializer, {})}
+    computed_fields = {
+        "total_capacity": ("cargo_num", "places_in_cargo", "cargo_layout")
+    }
+
 
 class JourneySerializer(serializers.ModelSerializer):
     travel_duration = serializers.ReadOnlyField()
@@ -76,6 +289,65 @@ class JourneySerializer(serializers.ModelSerializer):
         model = Journey
         fields = "__all__"
 
+    def _schedule(self, attrs):
+        return {
+            name: attrs.get(name, getattr(self.instance, name, None))
+            for name in ("train", "departure_time", "arrival_time")
+        }
+
+    def _validate_train_schedule(self, attrs):
+        schedule = self._schedule(attrs)
+        Journey.validate_train_schedule(
+            schedule["train"],
+            schedule["departure_time"],
+            schedule["arrival_time"],
+            getattr(self.instance, "id", None),
+            ValidationError,
+        )
+
+    def validate(self, attrs):
+        data = super(JourneySerializer, self).validate(attrs=attrs)
+        self._validate_train_schedule(attrs)
+        return data
+
+    def _validate_crew_schedule(self):
+        if "crew" in self.validated_data:
+            crew_ids = {crew.id for crew in self.validated_data["crew"]}
+        else:
+            crew_ids = set(self.instance.crew.values_list("id", flat=True))
+        # Serialize with rosters and other journey edits touching the crews.
+        list(
+            Crew.objects.select_for_update()
+            .filter(id__in=crew_ids)
+            .order_by("id")
+            .values_list("id", flat=True)
+        )
+        schedule = self._schedule(self.validated_data)
+        journey = Journey(
+            id=getattr(self.instance, "id", None),
+            departure_time=schedule["departure_time"],
+            arrival_time=schedule["arrival_time"],
+        )
+        conflicts = crew_conflicts([(crew_id, journey) for crew_id in crew_ids])
+        if conflicts:
+            raise ValidationError(
+                {
+                    "crew": [
+                        f"crew member {conflict['crew']} is already serving "
+                        f"journey {conflict['conflicting_journey']} at that time"
+                        for conflict in conflicts
+                    ]
+                }
+            )
+
+    def save(self, **kwargs):
+        # validate() fails fast, the checks are repeated here under row locks
+        # so concurrent writes cannot both pass them.
+        with transaction.atomic():
+            self._validate_train_schedule(self.validated_data)
+            self._validate_crew_schedule()
+            return super().save(**kwargs)
+
 
 class JourneyListSerializer(serializers.ModelSerializer):
     train_name = serializers.CharField(source="train.name", read_only=True)
@@ -101,35 +373,51 @@ class JourneyListSerializer(serializers.ModelSerializer):
         return obj.train.total_capacity - booked_tickets
 
 
-class JourneyRetrieveSerializer(JourneySerializer):
-    train = TrainSerializer()
-    crew = CrewSerializer(many=True, read_only=True)
-    routes = RouteListSerializer(many=True, read_only=True)
+class JourneyRetrieveSerializer(SparseFieldsetMixin, JourneySerializer):
+    expandable_fields = {
+        "route": (RouteListSerializer, {}),
+        "train": (TrainSerializer, {}),
+        "crew": (CrewSerializer, {"many": True}),
+    }
+    default_expand = ("train", "crew")
+    computed_fields = {"travel_duration": ("departure_time", "arrival_time")}
 
 
 class TicketSerializer(serializers.ModelSerializer):
+    journey = serializers.PrimaryKeyRelatedField(
+        queryset=Journey.objects.select_related("train")
+    )
+
     class Meta:
         model = Ticket
-        fields = ("id", "cargo", "seat", "journey", "order")
+        fields = ("id", "cargo", "seat", "journey", "order", "fare")
+        read_only_fields = ("fare",)
 
     def validate(self, attrs):
         data = super(TicketSerializer, self).validate(attrs=attrs)
         Ticket.validate_ticket(
             attrs["cargo"],
             attrs["seat"],
-            attrs["journey"].train,
+            attrs["journey"].train.layout,
             ValidationError,
         )
         return data
 
 
+class OrderTicketSerializer(TicketSerializer):
+    class Meta:
+        model = Ticket
+        fields = ("id", "cargo", "seat", "journey", "fare")
+        read_only_fields = ("fare",)
+
+
 class TicketListSerializer(serializers.ModelSerializer):
     journey = serializers.SerializerMethodField()
     order = serializers.SerializerMethodField()
 
     class Meta:
         model = Ticket
-        fields = ("id", "cargo", "seat", "journey", "order")
+        fields = ("id", "cargo", "seat", "journey", "order", "fare")
 
     def get_journey(self, obj):
         return str(obj.journey)
@@ -144,7 +432,7 @@ class TickerRetrieveSerializer(TicketSerializer):
 
     class Meta:
         model = Ticket
-        fields = ("id", "cargo", "seat", "journey", "order")
+        fields = ("id", "cargo", "seat", "journey", "order", "fare")
 
     def get_journey(self, obj):
         return str(obj.journey)
@@ -154,7 +442,7 @@ class TickerRetrieveSerializer(TicketSerializer):
 
 
 class OrderSerializer(serializers.ModelSerializer):
-    tickets = TicketSerializer(many=True, allow_empty=False)
+    tickets = OrderTicketSerializer(many=True, allow_empty=False)
 
     class Meta:
         model = Order
@@ -164,10 +452,28 @@ class OrderSerializer(serializers.ModelSerializer):
         with transaction.atomic():
             tickets_data = validated_data.pop("tickets")
             order = Order.objects.create(**validated_data)
-            for ticket_data in tickets_data:
-                Ticket.objects.create(order=order, **ticket_data)
+            tickets = [
+                Ticket(order=order, **ticket_data) for ticket_data in tickets_data
+            ]
+            fare_engine.price_tickets(tickets)
+            for ticket in tickets:
+                ticket.save()
+            record_event(OutboxEvent.EventType.ORDER_CREATED, order)
             return order
 
 
 class OrderListSerializer(OrderSerializer):
     tickets = TicketListSerializer(many=True, read_only=True)
+
+
+class OutboxEventSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = OutboxEvent
+        fields = (
+            "id",
+            "sequence",
+            "event_type",
+            "aggregate_id",
+            "payload",
+            "created_at",
+        )
@@ -0,0 +1,61 @@
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save, pre_delete, pre_save
+from django.dispatch import receiver
+
+from station.fares import fare_engine
+from station.geo import station_grid
+from station.models import Fare, Journey, OutboxEvent, Station, Ticket
+from station.outbox import record_event, record_events
+from station.search import station_name_index
+
+EventType = OutboxEvent.EventType
+
+
+@receiver([post_save, post_delete], sender=Station)
+def invalidate_station_indexes(sender, **kwargs):
+    transaction.on_commit(station_name_index.invalidate)
+    transaction.on_commit(station_grid.invalidate)
+
+
+@receiver([post_save, post_delete], sender=Fare)
+def invalidate_fares(sender, **kwargs):
+    transaction.on_commit(fare_engine.invalidate)
+
+
+@receiver(pre_save, sender=Ticket)
+def set_ticket_fare(sender, instance, **kwargs):
+    fare_engine.price_tickets([instance])
+
+
+@receiver(pre_save, sender=Ticket)
+def remember_ticket_seat(sender, instance, raw=False, **kwargs):
+    if not raw and not instance._state.adding:
+        instance._previous_seat = (
+            Ticket.objects.filter(pk=instance.pk)
+            .values("journey", "cargo", "seat")
+            .first()
+        )
+
+
+@receiver(post_save, sender=Ticket)
+def record_ticket_updated(sender, instance, created, raw=False, **kwargs):
+    # New tickets are recorded by their callers, as ticket.created or as part
+    # of order.created.
+    if not created and not raw:
+        record_event(EventType.TICKET_UPDATED, instance, instance._previous_seat)
+
+
+# Deleting a ticket or an order records its event where the delete is made,
+# so tickets keep their fast cascade delete. Parents that cascade to them
+# record the events of their dependents in one insert before they go.
+@receiver(pre_delete, sender=Journey)
+def record_journey_tickets_deleted(sender, instance, **kwargs):
+    record_events(EventType.TICKET_DELETED, instance.tickets.all())
+
+
+@receiver(pre_delete, sender=get_user_model())
+def record_user_orders_deleted(sender, instance, **kwargs):
+    record_events(
+        EventType.ORDER_DELETED, instance.orders.prefetch_related("tickets")
+    )
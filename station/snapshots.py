@@ -0,0 +1,54 @@
+import threading
+import time
+import uuid
+
+from django.conf import settings
+from django.core.cache import caches
+
+from app.db_routers import primary_reads
+
+
+def _shared_cache():
+    alias = settings.LOCAL_SNAPSHOT_CACHE_ALIAS
+    return caches[alias] if alias else None
+
+
+class SharedSnapshot:
+    """Value built from the database and kept in process memory.
+
+    invalidate() bumps a version key in the shared cache so every worker
+    rebuilds its copy on the next read, and copies expire after
+    LOCAL_SNAPSHOT_TTL seconds in case an invalidation is lost. Invalidate
+    from transaction.on_commit so a rolled back change never drops the copy.
+    Copies are always built from the primary, never from a lagging replica.
+    """
+
+    def __init__(self, name, build):
+        self.key = f"snapshot-version:{name}"
+        self._build = build
+        self._lock = threading.Lock()
+        self._value = None
+        self._version = None
+        self._expires_at = 0.0
+
+    def invalidate(self):
+        with self._lock:
+            self._value = None
+        shared_cache = _shared_cache()
+        if shared_cache is not None:
+            shared_cache.set(self.key, uuid.uuid4().hex, None)
+
+    def get(self):
+        shared_cache = _shared_cache()
+        version = shared_cache.get(self.key) if shared_cache is not None else None
+        with self._lock:
+            if (
+                self._value is None
+                or self._version != version
+                or time.monotonic() >= self._expires_at
+            ):
+                with primary_reads():
+                    self._value = self._build()
+                self._version = version
+                self._expires_at = time.monotonic() + settings.LOCAL_SNAPSHOT_TTL
+            return self._value
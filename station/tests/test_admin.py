@@ -0,0 +1,93 @@
+import datetime
+from unittest import skipUnless
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from station.admin import EstimatedCountPaginator
+from station.models import Journey, Order, Route, Station, Ticket, Train, TrainType
+
+
+class LargeTableAdminTests(TestCase):
+    def setUp(self):
+        self.admin = get_user_model().objects.create_superuser(
+            email="admin@test.com", password="password123"
+        )
+        self.client.force_login(self.admin)
+        self.train = Train.objects.create(
+            name="Train 1",
+            cargo_num=2,
+            places_in_cargo=50,
+            train_type=TrainType.objects.create(name="Type A"),
+        )
+        self.stations = [
+            Station.objects.create(name=f"Station {i}", latitude=i, longitude=i)
+            for i in range(6)
+        ]
+
+    def _add_rows(self, count):
+        for _ in range(count):
+            number = Route.objects.count()
+            route = Route.objects.create(
+                source=self.stations[number],
+                destination=self.stations[number + 1],
+                distance=100,
+            )
+            departure = timezone.now() + datetime.timedelta(days=1)
+            journey = Journey.objects.create(
+                route=route,
+                train=self.train,
+                departure_time=departure,
+                arrival_time=departure + datetime.timedelta(hours=2),
+            )
+            order = Order.objects.create(user=self.admin)
+            Ticket.objects.create(cargo=1, seat=1, journey=journey, order=order)
+
+    def _count_queries(self, url):
+        with CaptureQueriesContext(connection) as queries:
+            res = self.client.get(url)
+        self.assertEqual(res.status_code, 200)
+        return len(queries)
+
+    def test_changelist_queries_do_not_grow_with_rows(self):
+        urls = [
+            reverse(f"admin:station_{model}_changelist")
+            for model in ("ticket", "journey", "route", "order")
+        ]
+        self._add_rows(1)
+        few = [self._count_queries(url) for url in urls]
+
+        self._add_rows(4)
+        many = [self._count_queries(url) for url in urls]
+
+        self.assertEqual(many, few)
+
+    def test_order_change_page_renders_tickets(self):
+        self._add_rows(1)
+        order = Order.objects.get()
+
+        res = self.client.get(reverse("admin:station_order_change", args=[order.id]))
+
+        self.assertEqual(res.status_code, 200)
+        self.assertContains(res, "vForeignKeyRawIdAdminField")
+
+    def test_paginator_counts_exactly_without_postgres(self):
+        self._add_rows(2)
+
+        paginator = EstimatedCountPaginator(Ticket.objects.order_by("id"), 100)
+
+        self.assertEqual(paginator.count, 2)
+
+    @skipUnless(connection.vendor == "postgresql", "requires PostgreSQL")
+    def test_estimate_includes_partitions(self):
+        self._add_rows(3)
+        with connection.cursor() as cursor:
+            cursor.execute("ANALYZE station_ticket")
+
+        estimate = EstimatedCountPaginator._estimate(Ticket.objects.all(), connection)
+
+        self.assertEqual(estimate, 3)
@@ -0,0 +1,130 @@
+import datetime
+from io import StringIO
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from station.models import (
+    ArchivedJourney,
+    ArchivedOrder,
+    Journey,
+    Order,
+    OutboxEvent,
+    Route,
+    Station,
+    Ticket,
+    Train,
+    TrainType,
+)
+
+
+class ArchivePastJourneysTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            email="test@test.com", password="password123"
+        )
+        self.client.force_authenticate(self.user)
+        self.route = Route.objects.create(
+            source=Station.objects.create(name="A", latitude=1.0, longitude=1.0),
+            destination=Station.objects.create(name="B", latitude=2.0, longitude=2.0),
+            distance=10,
+        )
+        self.train = Train.objects.create(
+            name="Train 1",
+            cargo_num=1,
+            places_in_cargo=10,
+            train_type=TrainType.objects.create(name="Type A"),
+        )
+        self.old_journey = self._journey(days_ago=400)
+        self.recent_journey = self._journey(days_ago=1)
+
+        self.old_order = self._order(self.old_journey)
+        self.mixed_order = self._order(self.old_journey, self.recent_journey)
+
+    def _journey(self, days_ago):
+        departure = timezone.now() - datetime.timedelta(days=days_ago)
+        return Journey.objects.create(
+            route=self.route,
+            train=self.train,
+            departure_time=departure,
+            arrival_time=departure + datetime.timedelta(hours=2),
+        )
+
+    def _order(self, *journeys):
+        order = Order.objects.create(user=self.user)
+        for journey in journeys:
+            Ticket.objects.create(
+                cargo=1,
+                seat=journey.tickets.count() + 1,
+                journey=journey,
+                order=order,
+            )
+        return order
+
+    def _archive(self):
+        call_command("archive_past_journeys", "--days=365", stdout=StringIO())
+
+    def test_only_fully_past_orders_are_archived(self):
+        self._archive()
+
+        self.assertFalse(Order.objects.filter(id=self.old_order.id).exists())
+        self.assertTrue(Order.objects.filter(id=self.mixed_order.id).exists())
+        archived = ArchivedOrder.objects.get(order_id=self.old_order.id)
+        self.assertEqual(archived.data["tickets"][0]["journey"], self.old_journey.id)
+
+    def test_archived_orders_recorded_as_archived(self):
+        with mock.patch("station.outbox.publish_seat_changes") as publish:
+            self._archive()
+
+        publish.assert_not_called()
+        events = OutboxEvent.objects.values_list("event_type", "aggregate_id")
+        self.assertEqual(list(events), [("order.archived", self.old_order.id)])
+
+    def test_journeys_archived_once_ticketless(self):
+        self.mixed_order.tickets.filter(journey=self.old_journey).delete()
+
+        self._archive()
+
+        self.assertFalse(Journey.objects.filter(id=self.old_journey.id).exists())
+        archived = ArchivedJourney.objects.get(journey_id=self.old_journey.id)
+        self.assertEqual(archived.data["route"], self.route.id)
+        self.assertTrue(Journey.objects.filter(id=self.recent_journey.id).exists())
+
+    def test_archived_order_readable_through_api(self):
+        self._archive()
+
+        res = self.client.get(reverse("station:order-detail", args=[self.old_order.id]))
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertTrue(res.data["archived"])
+        self.assertEqual(res.data["id"], self.old_order.id)
+
+        res = self.client.get(reverse("station:order-archived"))
+        self.assertEqual(
+            [order["id"] for order in res.data["results"]], [self.old_order.id]
+        )
+
+    def test_archived_order_hidden_from_other_users(self):
+        self._archive()
+        other_user = get_user_model().objects.create_user(
+            email="other@test.com", password="password123"
+        )
+        self.client.force_authenticate(other_user)
+
+        res = self.client.get(reverse("station:order-detail", args=[self.old_order.id]))
+
+        self.assertEqual(res.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_non_numeric_order_id_not_found(self):
+        self._archive()
+
+        res = self.client.get(reverse("station:order-detail", args=["abc"]))
+
+        self.assertEqual(res.status_code, status.HTTP_404_NOT_FOUND)
@@ -0,0 +1,101 @@
+import datetime
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from station.models import Crew, Journey, Route, Station, Train, TrainType
+
+STATION_BATCH_URL = reverse("station:station-batch")
+TRAIN_BATCH_URL = reverse("station:train-batch")
+JOURNEY_BATCH_URL = reverse("station:journey-batch")
+
+
+class BatchRetrieveTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(
+            get_user_model().objects.create_user(
+                email="test@test.com", password="password123"
+            )
+        )
+        train_type = TrainType.objects.create(name="Type A")
+        crew = Crew.objects.create(first_name="John", last_name="Doe")
+        departure = timezone.now() + datetime.timedelta(days=1)
+        self.stations = []
+        self.trains = []
+        self.journeys = []
+        for i in range(20):
+            source = Station.objects.create(name=f"Source {i}", latitude=i, longitude=i)
+            destination = Station.objects.create(
+                name=f"Destination {i}", latitude=-i - 1, longitude=-i - 1
+            )
+            train = Train.objects.create(
+                name=f"Train {i}",
+                cargo_num=2,
+                places_in_cargo=10,
+                train_type=train_type,
+            )
+            journey = Journey.objects.create(
+                route=Route.objects.create(
+                    source=source, destination=destination, distance=100
+                ),
+                train=train,
+                departure_time=departure,
+                arrival_time=departure + datetime.timedelta(hours=2),
+            )
+            journey.crew.add(crew)
+            self.stations.append(source)
+            self.trains.append(train)
+            self.journeys.append(journey)
+
+    @staticmethod
+    def _ids(objects):
+        return ",".join(str(obj.id) for obj in objects)
+
+    def test_journeys_in_requested_order_with_fixed_queries(self):
+        journeys = self.journeys[::-1]
+
+        with self.assertNumQueries(2):
+            res = self.client.get(JOURNEY_BATCH_URL, {"ids": self._ids(journeys)})
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [journey["id"] for journey in res.data],
+            [journey.id for journey in journeys],
+        )
+        self.assertEqual(res.data[0]["crew"][0]["full_name"], "John Doe")
+        detail = self.client.get(
+            reverse("station:journey-detail", args=[journeys[0].id])
+        )
+        self.assertEqual(res.data[0], detail.data)
+
+    def test_trains_and_stations(self):
+        with self.assertNumQueries(1):
+            res = self.client.get(TRAIN_BATCH_URL, {"ids": self._ids(self.trains)})
+        self.assertEqual(len(res.data), 20)
+        self.assertEqual(res.data[0]["train_type"], "Type A")
+
+        with self.assertNumQueries(1):
+            res = self.client.get(
+                STATION_BATCH_URL, {"ids": self._ids(self.stations[:3])}
+            )
+        self.assertEqual(
+            [station["name"] for station in res.data],
+            ["Source 0", "Source 1", "Source 2"],
+        )
+
+    def test_missing_and_duplicate_ids_are_skipped(self):
+        train = self.trains[0]
+
+        res = self.client.get(TRAIN_BATCH_URL, {"ids": f"{train.id},{train.id},999999"})
+
+        self.assertEqual([item["id"] for item in res.data], [train.id])
+
+    def test_invalid_ids(self):
+        for params in ({}, {"ids": "1,a"}, {"ids": ",".join(map(str, range(101)))}):
+            res = self.client.get(TRAIN_BATCH_URL, params)
+            self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
@@ -0,0 +1,68 @@
+import json
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import SimpleTestCase, TestCase
+
+from station.benchmarks import percentile, summarize
+from station.models import Journey, Order, Station
+
+
+class BenchmarkStatsTests(SimpleTestCase):
+    def test_percentile_uses_nearest_rank(self):
+        values = list(range(1, 101))
+
+        self.assertEqual(percentile(values, 0.50), 50)
+        self.assertEqual(percentile(values, 0.95), 95)
+        self.assertEqual(percentile(values, 0.99), 99)
+        self.assertEqual(percentile([7], 0.99), 7)
+        self.assertIsNone(percentile([], 0.5))
+
+    def test_summarize(self):
+        samples = [(0.010, 200, 3), (0.020, 200, 5), (0.030, 400, None)]
+
+        report = summarize(samples, elapsed=0.5)
+
+        self.assertEqual(report["requests"], 3)
+        self.assertEqual(report["statuses"], {"200": 2, "400": 1})
+        self.assertEqual(report["throughput_rps"], 6.0)
+        self.assertEqual(report["latency_ms"]["p50"], 20.0)
+        self.assertEqual(report["latency_ms"]["p99"], 30.0)
+        self.assertEqual(report["queries_per_request"], 4.0)
+
+
+class BenchmarkBookingCommandTests(TestCase):
+    def _run(self, *args):
+        out = StringIO()
+        call_command(
+            "benchmark_booking",
+            "--requests=6",
+            "--stations=5",
+            "--trains=2",
+            "--journeys=10",
+            *args,
+            stdout=out,
+        )
+        return json.loads(out.getvalue())
+
+    def test_reports_all_scenarios_and_cleans_up(self):
+        report = self._run()
+
+        self.assertEqual(
+            set(report["scenarios"]), {"browse_journeys", "view_seats", "place_order"}
+        )
+        for scenario in report["scenarios"].values():
+            self.assertEqual(scenario["requests"], 6)
+            self.assertNotIn("429", scenario["statuses"])
+            self.assertGreater(scenario["queries_per_request"], 0)
+            self.assertIsNotNone(scenario["latency_ms"]["p95"])
+        self.assertEqual(report["scenarios"]["browse_journeys"]["statuses"], {"200": 6})
+        self.assertFalse(Station.objects.exists())
+        self.assertFalse(Journey.objects.exists())
+        self.assertFalse(Order.objects.exists())
+
+    def test_keep_data(self):
+        self._run("--scenario=view_seats", "--keep-data")
+
+        self.assertEqual(Station.objects.count(), 5)
+        self.assertEqual(Journey.objects.count(), 10)
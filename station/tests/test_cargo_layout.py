@@ -0,0 +1,134 @@
+import datetime
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.exceptions import ValidationError
+from rest_framework.test import APIClient
+
+from station.models import Journey, Order, Route, Station, Ticket, Train, TrainType
+
+CARGO_LAYOUT = [
+    {"seats": 2, "seat_class": "first"},
+    {"seats": 4, "seat_class": "second"},
+]
+
+
+class CargoLayoutTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            email="test@test.com", password="password123"
+        )
+        self.client.force_authenticate(self.user)
+        self.train = Train.objects.create(
+            name="Intercity",
+            cargo_num=1,
+            places_in_cargo=1,
+            train_type=TrainType.objects.create(name="Express"),
+            cargo_layout=CARGO_LAYOUT,
+        )
+        self.journey = Journey.objects.create(
+            route=Route.objects.create(
+                source=Station.objects.create(name="A", latitude=1.0, longitude=1.0),
+                destination=Station.objects.create(
+                    name="B", latitude=2.0, longitude=2.0
+                ),
+                distance=100,
+            ),
+            train=self.train,
+            departure_time=timezone.now(),
+            arrival_time=timezone.now() + datetime.timedelta(hours=2),
+        )
+        self.order = Order.objects.create(user=self.user)
+
+    def test_layout_sets_capacity_and_cargo_counts(self):
+        self.train.refresh_from_db()
+
+        self.assertEqual(self.train.total_capacity, 6)
+        self.assertEqual((self.train.cargo_num, self.train.places_in_cargo), (2, 4))
+
+    def test_seat_range_checked_per_cargo(self):
+        with self.assertRaises(ValidationError):
+            Ticket.objects.create(
+                cargo=1, seat=3, journey=self.journey, order=self.order
+            )
+        Ticket.objects.create(cargo=2, seat=3, journey=self.journey, order=self.order)
+
+    def test_validation_uses_loaded_train(self):
+        journey = Journey.objects.select_related("train").get(pk=self.journey.pk)
+
+        with self.assertNumQueries(0):
+            Ticket.validate_ticket(2, 4, journey.train.layout, ValidationError)
+
+    def test_layout_change_applies_without_signals(self):
+        Train.objects.filter(pk=self.train.pk).update(
+            cargo_layout=[{"seats": 1, "seat_class": "first"}] * 2
+        )
+
+        with self.assertRaises(ValidationError):
+            Ticket.objects.create(
+                cargo=2,
+                seat=3,
+                journey=Journey.objects.get(pk=self.journey.pk),
+                order=self.order,
+            )
+
+    def test_fare_uses_cargo_seat_class(self):
+        first = Ticket.objects.create(
+            cargo=1, seat=1, journey=self.journey, order=self.order
+        )
+        second = Ticket.objects.create(
+            cargo=2, seat=1, journey=self.journey, order=self.order
+        )
+
+        self.assertEqual(first.fare, Decimal("25.00"))
+        self.assertEqual(second.fare, Decimal("15.00"))
+
+    def test_seat_map(self):
+        Ticket.objects.create(cargo=2, seat=3, journey=self.journey, order=self.order)
+
+        res = self.client.get(reverse("station:journey-seats", args=[self.journey.id]))
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            res.data["cargos"],
+            [
+                {
+                    "cargo": 1,
+                    "seat_class": "first",
+                    "seats": 2,
+                    "taken": [],
+                    "available": 2,
+                },
+                {
+                    "cargo": 2,
+                    "seat_class": "second",
+                    "seats": 4,
+                    "taken": [3],
+                    "available": 3,
+                },
+            ],
+        )
+
+    def test_journey_list_availability_from_layout(self):
+        Ticket.objects.create(cargo=1, seat=1, journey=self.journey, order=self.order)
+
+        res = self.client.get(reverse("station:journey-list"))
+
+        self.assertEqual(res.data["results"][0]["available_tickets"], 5)
+
+    def test_invalid_layout_rejected(self):
+        train = Train(
+            name="Broken",
+            cargo_num=1,
+            places_in_cargo=1,
+            train_type=self.train.train_type,
+            cargo_layout=[{"seats": 0, "seat_class": "first"}],
+        )
+        with self.assertRaises(DjangoValidationError):
+            train.full_clean()
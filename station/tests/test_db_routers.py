@@ -0,0 +1,144 @@
+import datetime
+from unittest import skipUnless
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.http import HttpResponse
+from django.test import RequestFactory, SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from app.db_routers import ReplicaRouter, ReplicaRoutingMiddleware
+from station.models import Journey, Route, Station, Train, TrainType
+from station.snapshots import SharedSnapshot
+
+JOURNEY_URL = reverse("station:journey-list")
+ORDER_URL = reverse("station:order-list")
+
+
+@override_settings(DATABASE_REPLICAS=["replica"])
+class ReplicaRoutingMiddlewareTests(SimpleTestCase):
+    def setUp(self):
+        self.factory = RequestFactory()
+        self.router = ReplicaRouter()
+
+    def _read_db(self, request, status_code=200):
+        seen = []
+
+        def get_response(request):
+            seen.append(self.router.db_for_read(Journey))
+            return HttpResponse(status=status_code)
+
+        response = ReplicaRoutingMiddleware(get_response)(request)
+        return seen[0], response
+
+    def test_safe_catalogue_request_reads_from_replica(self):
+        db, _ = self._read_db(self.factory.get(JOURNEY_URL))
+
+        self.assertEqual(db, "replica")
+        self.assertEqual(self.router.db_for_read(Journey), "default")
+
+    def test_shared_snapshots_built_from_primary(self):
+        snapshot = SharedSnapshot(
+            "routing-test", lambda: self.router.db_for_read(Station)
+        )
+        snapshot.invalidate()
+
+        def get_response(request):
+            return HttpResponse(snapshot.get())
+
+        response = ReplicaRoutingMiddleware(get_response)(
+            self.factory.get(reverse("station:station-nearby"))
+        )
+
+        self.assertEqual(response.content, b"default")
+
+    def test_orders_read_from_primary(self):
+        db, _ = self._read_db(self.factory.get(ORDER_URL))
+
+        self.assertEqual(db, "default")
+
+    def test_writes_use_primary_and_pin_the_client(self):
+        db, response = self._read_db(self.factory.post(ORDER_URL), status_code=201)
+
+        self.assertEqual(db, "default")
+        self.assertEqual(self.router.db_for_write(Journey), "default")
+        self.assertIn(settings.REPLICA_PIN_COOKIE, response.cookies)
+
+    def test_failed_write_does_not_pin(self):
+        _, response = self._read_db(self.factory.post(ORDER_URL), status_code=400)
+
+        self.assertNotIn(settings.REPLICA_PIN_COOKIE, response.cookies)
+
+    def test_pinned_client_reads_from_primary(self):
+        request = self.factory.get(JOURNEY_URL)
+        request.COOKIES[settings.REPLICA_PIN_COOKIE] = "1"
+
+        db, _ = self._read_db(request)
+
+        self.assertEqual(db, "default")
+
+    @override_settings(DATABASE_REPLICAS=[])
+    def test_no_replicas_configured(self):
+        db, _ = self._read_db(self.factory.get(JOURNEY_URL))
+
+        self.assertEqual(db, "default")
+
+
+# Replicas that do not mirror the primary in tests, e.g. app.settings_replicas_local
+UNMIRRORED_REPLICAS = [
+    alias
+    for alias in settings.DATABASE_REPLICAS
+    if not settings.DATABASES[alias].get("TEST", {}).get("MIRROR")
+]
+
+
+@skipUnless(UNMIRRORED_REPLICAS, "requires app.settings_replicas_local")
+class TwoDatabaseRoutingTests(TestCase):
+    """Primary and replica are independent databases, nothing replicates"""
+
+    databases = {"default", *UNMIRRORED_REPLICAS}
+
+    def setUp(self):
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            email="test@test.com", password="password123"
+        )
+        self.client.force_authenticate(self.user)
+        route = Route.objects.create(
+            source=Station.objects.create(name="A", latitude=1.0, longitude=1.0),
+            destination=Station.objects.create(name="B", latitude=2.0, longitude=2.0),
+            distance=10,
+        )
+        train = Train.objects.create(
+            name="Train 1",
+            cargo_num=1,
+            places_in_cargo=10,
+            train_type=TrainType.objects.create(name="Type A"),
+        )
+        departure = timezone.now() + datetime.timedelta(days=1)
+        self.journey = Journey.objects.create(
+            route=route,
+            train=train,
+            departure_time=departure,
+            arrival_time=departure + datetime.timedelta(hours=2),
+        )
+
+    def test_reads_served_by_replica(self):
+        res = self.client.get(JOURNEY_URL)
+
+        self.assertEqual(res.data["count"], 0)
+
+    def test_client_reads_its_writes_after_ordering(self):
+        res = self.client.post(
+            ORDER_URL,
+            {"tickets": [{"cargo": 1, "seat": 1, "journey": self.journey.id}]},
+            format="json",
+        )
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+
+        res = self.client.get(JOURNEY_URL)
+
+        self.assertEqual(res.data["count"], 1)
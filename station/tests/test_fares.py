@@ -0,0 +1,147 @@
+import datetime
+from decimal import Decimal
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import caches
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from station.fares import fare_engine
+from station.models import (
+    Fare,
+    Journey,
+    Order,
+    Route,
+    SeatClass,
+    Station,
+    Ticket,
+    Train,
+    TrainType,
+)
+
+QUOTE_URL = reverse("station:journey-quote")
+ORDER_URL = reverse("station:order-list")
+
+
+class FareTests(TestCase):
+    def setUp(self):
+        caches[settings.THROTTLE_CACHE_ALIAS].clear()
+        fare_engine.invalidate()
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            email="test@test.com", password="password123"
+        )
+        self.client.force_authenticate(self.user)
+        self.express = TrainType.objects.create(name="Express")
+        self.regional = TrainType.objects.create(name="Regional")
+        Fare.objects.create(
+            train_type=self.express,
+            seat_class=SeatClass.SECOND,
+            base_price=Decimal("8.00"),
+            price_per_km=Decimal("0.2000"),
+        )
+        route = Route.objects.create(
+            source=Station.objects.create(name="A", latitude=1.0, longitude=1.0),
+            destination=Station.objects.create(name="B", latitude=2.0, longitude=2.0),
+            distance=100,
+        )
+        self.journeys = [
+            Journey.objects.create(
+                route=route,
+                train=Train.objects.create(
+                    name=f"Train {train_type.name}",
+                    cargo_num=5,
+                    places_in_cargo=50,
+                    train_type=train_type,
+                ),
+                departure_time=timezone.now(),
+                arrival_time=timezone.now() + datetime.timedelta(hours=2),
+            )
+            for train_type in (self.express, self.regional)
+        ]
+
+    def test_quote_uses_train_type_fare_with_default_fallback(self):
+        ids = ",".join(str(journey.id) for journey in self.journeys)
+
+        res = self.client.get(QUOTE_URL, {"ids": ids})
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual([quote["fare"] for quote in res.data], ["28.00", "15.00"])
+
+    def test_quote_for_seat_class(self):
+        res = self.client.get(
+            QUOTE_URL, {"ids": self.journeys[0].id, "seat_class": "first"}
+        )
+
+        self.assertEqual(res.data[0]["fare"], "25.00")
+
+    def test_quote_prices_batch_in_one_query(self):
+        fare_engine.quote_journeys([self.journeys[0].id], SeatClass.SECOND)
+        ids = [journey.id for journey in self.journeys]
+
+        with self.assertNumQueries(1):
+            fare_engine.quote_journeys(ids, SeatClass.SECOND)
+
+    def test_fare_change_invalidates_cache(self):
+        fare_engine.quote_journeys([self.journeys[1].id], SeatClass.SECOND)
+        Fare.objects.filter(train_type=None, seat_class=SeatClass.SECOND).update(
+            base_price=Decimal("6.00")
+        )
+        with self.captureOnCommitCallbacks(execute=True):
+            Fare.objects.get(train_type=None, seat_class=SeatClass.SECOND).save()
+
+        quotes = fare_engine.quote_journeys([self.journeys[1].id], SeatClass.SECOND)
+
+        self.assertEqual(quotes[self.journeys[1].id], Decimal("16.00"))
+
+    def test_fare_stored_on_ticket(self):
+        order = Order.objects.create(user=self.user)
+        ticket = Ticket.objects.create(
+            cargo=1, seat=1, journey=self.journeys[0], order=order
+        )
+
+        ticket.refresh_from_db()
+        self.assertEqual(ticket.fare, Decimal("28.00"))
+
+    def test_ticket_fare_ignores_stale_fare_table(self):
+        fare_engine.quote_journeys([self.journeys[0].id], SeatClass.SECOND)
+        Fare.objects.filter(train_type=self.express).update(base_price=Decimal("10.00"))
+        order = Order.objects.create(user=self.user)
+
+        ticket = Ticket.objects.create(
+            cargo=1, seat=1, journey=self.journeys[0], order=order
+        )
+
+        self.assertEqual(ticket.fare, Decimal("30.00"))
+
+    def test_order_prices_tickets_in_one_batch(self):
+        tickets = [
+            {"cargo": 1, "seat": seat, "journey": journey.id}
+            for journey in self.journeys
+            for seat in (1, 2)
+        ]
+
+        with CaptureQueriesContext(connection) as queries:
+            res = self.client.post(ORDER_URL, {"tickets": tickets}, format="json")
+
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        fare_queries = [
+            query for query in queries if 'FROM "station_fare"' in query["sql"]
+        ]
+        self.assertEqual(len(fare_queries), 1)
+        self.assertEqual(
+            sorted(Ticket.objects.values_list("fare", flat=True)),
+            [Decimal("15.00")] * 2 + [Decimal("28.00")] * 2,
+        )
+
+    def test_invalid_seat_class_rejected(self):
+        res = self.client.get(
+            QUOTE_URL, {"ids": self.journeys[0].id, "seat_class": "luxury"}
+        )
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
@@ -0,0 +1,126 @@
+import datetime
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.utils import timezone
+from rest_framework.test import APIRequestFactory
+
+from station.fast_serializers import (
+    JourneyListValuesSerializer,
+    RouteListValuesSerializer,
+    TrainListValuesSerializer,
+    ValuesListSerializer,
+)
+from station.models import (
+    Journey,
+    Order,
+    Route,
+    Station,
+    Ticket,
+    Train,
+    TrainType,
+)
+from station.renderers import FastJSONRenderer
+from station.serializers import (
+    JourneyListSerializer,
+    RouteListSerializer,
+    TrainListSerializer,
+)
+
+
+class ValuesListSerializerCompatibilityTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.train = Train.objects.create(
+            name="Train 1",
+            cargo_num=5,
+            places_in_cargo=50,
+            train_type=TrainType.objects.create(name="Type A"),
+            thumbnail="uploads/trains/thumbnails/train.jpg",
+        )
+        route = Route.objects.create(
+            source=Station.objects.create(name="Source", latitude=10.0, longitude=20.0),
+            destination=Station.objects.create(
+                name="Destination", latitude=30.0, longitude=40.0
+            ),
+            distance=100,
+        )
+        for days, hours in ((0, 2), (2, 30)):
+            departure = timezone.now() + datetime.timedelta(days=days)
+            Journey.objects.create(
+                route=route,
+                train=cls.train,
+                departure_time=departure,
+                arrival_time=departure + datetime.timedelta(hours=hours),
+            )
+        order = Order.objects.create(
+            user=get_user_model().objects.create_user(
+                email="test@test.com", password="password123"
+            )
+        )
+        Ticket.objects.create(
+            cargo=1, seat=1, journey=Journey.objects.first(), order=order
+        )
+
+    def setUp(self):
+        self.context = {"request": APIRequestFactory().get("/")}
+
+    def assert_same_output(self, queryset, serializer_class, values_serializer_class):
+        expected = serializer_class(queryset, many=True, context=self.context).data
+        rows = values_serializer_class.get_queryset(queryset)
+
+        self.assertEqual(
+            values_serializer_class(rows, context=self.context).data,
+            [dict(item) for item in expected],
+        )
+
+    def test_route_list(self):
+        self.assert_same_output(
+            Route.objects.all(), RouteListSerializer, RouteListValuesSerializer
+        )
+
+    def test_train_list(self):
+        self.assert_same_output(
+            Train.objects.all(), TrainListSerializer, TrainListValuesSerializer
+        )
+
+    def test_values_are_returned_unchanged_by_default(self):
+        class StationValuesSerializer(ValuesListSerializer):
+            values = ("id", "name")
+
+        rows = StationValuesSerializer.get_queryset(Station.objects.order_by("id"))
+
+        self.assertEqual(
+            StationValuesSerializer(rows).data,
+            list(Station.objects.order_by("id").values("id", "name")),
+        )
+
+    def test_journey_list(self):
+        self.assert_same_output(
+            Journey.objects.order_by("id"),
+            JourneyListSerializer,
+            JourneyListValuesSerializer,
+        )
+
+    def test_journey_list_is_one_query(self):
+        rows = JourneyListValuesSerializer.get_queryset(Journey.objects.order_by("id"))
+
+        with self.assertNumQueries(1):
+            JourneyListValuesSerializer(rows, context=self.context).data
+
+
+class FastJSONRendererTests(TestCase):
+    def test_matches_json_renderer_output(self):
+        data = {"name": "Київ", "distance": 10, "results": [{"id": 1}]}
+
+        self.assertEqual(
+            FastJSONRenderer().render(data),
+            b'{"name":"\xd0\x9a\xd0\xb8\xd1\x97\xd0\xb2","distance":10,"results":[{"id":1}]}',
+        )
+
+    def test_indent_falls_back_to_json_renderer(self):
+        rendered = FastJSONRenderer().render(
+            {"id": 1}, "application/json; indent=2", {}
+        )
+
+        self.assertEqual(rendered, b'{\n  "id": 1\n}')
@@ -0,0 +1,112 @@
+import datetime
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from station.models import (
+    IdempotencyKey,
+    Journey,
+    Order,
+    Route,
+    Station,
+    Ticket,
+    Train,
+    TrainType,
+)
+
+ORDER_URL = reverse("station:order-list")
+
+
+class IdempotentOrderCreateTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            email="test@test.com", password="password123"
+        )
+        self.client.force_authenticate(self.user)
+        train = Train.objects.create(
+            name="Train 1",
+            cargo_num=5,
+            places_in_cargo=50,
+            train_type=TrainType.objects.create(name="Type A"),
+        )
+        route = Route.objects.create(
+            source=Station.objects.create(name="Source", latitude=10.0, longitude=20.0),
+            destination=Station.objects.create(
+                name="Destination", latitude=30.0, longitude=40.0
+            ),
+            distance=100,
+        )
+        self.journey = Journey.objects.create(
+            route=route,
+            train=train,
+            departure_time=timezone.now(),
+            arrival_time=timezone.now() + datetime.timedelta(hours=2),
+        )
+        self.payload = {
+            "tickets": [{"cargo": 1, "seat": 1, "journey": self.journey.id}]
+        }
+
+    def post(self, payload, key):
+        return self.client.post(
+            ORDER_URL, payload, format="json", HTTP_IDEMPOTENCY_KEY=key
+        )
+
+    def test_retry_replays_stored_response(self):
+        first = self.post(self.payload, "key-1")
+        self.assertEqual(first.status_code, status.HTTP_201_CREATED)
+
+        with self.assertNumQueries(1):
+            retry = self.post(self.payload, "key-1")
+
+        self.assertEqual(retry.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(retry.data, first.data)
+        self.assertEqual(Order.objects.count(), 1)
+        self.assertEqual(Ticket.objects.count(), 1)
+
+    def test_reused_key_with_different_body_rejected(self):
+        self.post(self.payload, "key-1")
+        other = {"tickets": [{"cargo": 1, "seat": 2, "journey": self.journey.id}]}
+
+        res = self.post(other, "key-1")
+
+        self.assertEqual(res.status_code, status.HTTP_422_UNPROCESSABLE_ENTITY)
+        self.assertEqual(Ticket.objects.count(), 1)
+
+    def test_failed_request_not_stored(self):
+        invalid = {"tickets": [{"cargo": 99, "seat": 1, "journey": self.journey.id}]}
+
+        res = self.post(invalid, "key-1")
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(IdempotencyKey.objects.exists())
+
+    def test_keys_are_scoped_per_user(self):
+        self.post(self.payload, "key-1")
+        other_user = get_user_model().objects.create_user(
+            email="other@test.com", password="password123"
+        )
+        self.client.force_authenticate(other_user)
+        payload = {"tickets": [{"cargo": 2, "seat": 1, "journey": self.journey.id}]}
+
+        res = self.post(payload, "key-1")
+
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(Order.objects.count(), 2)
+
+    @override_settings(IDEMPOTENCY_KEY_TTL=datetime.timedelta(hours=1))
+    def test_clear_idempotency_keys_command(self):
+        self.post(self.payload, "key-1")
+        IdempotencyKey.objects.update(
+            created_at=timezone.now() - datetime.timedelta(hours=2)
+        )
+
+        call_command("clear_idempotency_keys", stdout=StringIO())
+
+        self.assertFalse(IdempotencyKey.objects.exists())
@@ -0,0 +1,198 @@
+import asyncio
+import datetime
+import json
+import threading
+
+from asgiref.sync import sync_to_async
+from django.contrib.auth import get_user_model
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.authtoken.models import Token
+from rest_framework_simplejwt.tokens import AccessToken
+
+from station.live import SeatAvailabilityBroker, seat_changes, split_change
+from station.models import (
+    Journey,
+    Order,
+    OutboxEvent,
+    Route,
+    Station,
+    Ticket,
+    Train,
+    TrainType,
+)
+from station.outbox import record_event
+
+
+class SeatAvailabilityBrokerTests(SimpleTestCase):
+    def test_seat_changes_grouped_per_journey(self):
+        tickets = [
+            {"journey": 1, "cargo": 1, "seat": 2},
+            {"journey": 2, "cargo": 3, "seat": 4},
+            {"journey": 1, "cargo": 1, "seat": 3},
+        ]
+
+        self.assertEqual(
+            seat_changes(tickets, taken=True),
+            [
+                {
+                    "journey": 1,
+                    "taken": [[1, 2], [1, 3]],
+                    "released": [],
+                    "available_delta": -2,
+                },
+                {
+                    "journey": 2,
+                    "taken": [[3, 4]],
+                    "released": [],
+                    "available_delta": -1,
+                },
+            ],
+        )
+
+    def test_large_changes_split_under_notify_limit(self):
+        change = seat_changes(
+            [{"journey": 1, "cargo": 999, "seat": seat} for seat in range(1000)],
+            taken=False,
+        )[0]
+        change["taken"] = [[1, 1]]
+
+        parts = split_change(change)
+
+        self.assertEqual(len(parts), 3)
+        self.assertLess(max(len(json.dumps(part).encode()) for part in parts), 8000)
+        self.assertEqual(sum(part["available_delta"] for part in parts), 999)
+        self.assertEqual(
+            [seat for part in parts for seat in part["released"]], change["released"]
+        )
+
+    def test_publish_from_other_thread_reaches_journey_subscribers(self):
+        broker = SeatAvailabilityBroker()
+
+        async def scenario():
+            watching = broker.subscribe(1)
+            other = broker.subscribe(2)
+            publisher = threading.Thread(
+                target=broker.publish, args=({"journey": 1, "taken": [[1, 1]]},)
+            )
+            publisher.start()
+            publisher.join()
+            change = await asyncio.wait_for(watching.queue.get(), 1)
+            broker.unsubscribe(1, watching)
+            broker.unsubscribe(2, other)
+            return change, other.queue.empty()
+
+        change, other_empty = asyncio.run(scenario())
+
+        self.assertEqual(change["taken"], [[1, 1]])
+        self.assertTrue(other_empty)
+        self.assertEqual(broker._subscriptions, {})
+
+    @override_settings(SEAT_STREAM_QUEUE_SIZE=1)
+    def test_slow_subscriber_is_marked_overflowed(self):
+        broker = SeatAvailabilityBroker()
+
+        async def scenario():
+            subscription = broker.subscribe(1)
+            subscription.push({"journey": 1})
+            subscription.push({"journey": 1})
+            return subscription.overflowed
+
+        self.assertTrue(asyncio.run(scenario()))
+
+
+class JourneySeatsStreamTests(TestCase):
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(
+            email="test@test.com", password="password123"
+        )
+        self.train = Train.objects.create(
+            name="Train 1",
+            cargo_num=1,
+            places_in_cargo=10,
+            train_type=TrainType.objects.create(name="Type A"),
+        )
+        departure = timezone.now() + datetime.timedelta(days=1)
+        self.journey = Journey.objects.create(
+            route=Route.objects.create(
+                source=Station.objects.create(name="A", latitude=1.0, longitude=1.0),
+                destination=Station.objects.create(
+                    name="B", latitude=2.0, longitude=2.0
+                ),
+                distance=10,
+            ),
+            train=self.train,
+            departure_time=departure,
+            arrival_time=departure + datetime.timedelta(hours=2),
+        )
+        self.order = Order.objects.create(user=self.user)
+        Ticket.objects.create(cargo=1, seat=1, journey=self.journey, order=self.order)
+        self.url = reverse("station:journey-seats-stream", args=[self.journey.id])
+        self.headers = {"Authorization": f"Bearer {AccessToken.for_user(self.user)}"}
+
+    def _book_seat(self, seat):
+        with self.captureOnCommitCallbacks(execute=True):
+            ticket = Ticket.objects.create(
+                cargo=1, seat=seat, journey=self.journey, order=self.order
+            )
+            record_event(OutboxEvent.EventType.TICKET_CREATED, ticket)
+
+    @staticmethod
+    def _parse(message):
+        event, data = message.decode().strip().split("\n")
+        return event.removeprefix("event: "), json.loads(data.removeprefix("data: "))
+
+    async def test_stream_sends_snapshot_then_changes(self):
+        response = await self.async_client.get(self.url, headers=self.headers)
+        self.assertEqual(response["Content-Type"], "text/event-stream")
+        stream = response.streaming_content
+
+        event, snapshot = self._parse(await anext(stream))
+        self.assertEqual(event, "snapshot")
+        self.assertEqual(snapshot["available"], 9)
+        self.assertEqual(snapshot["taken"], [[1, 1]])
+
+        await sync_to_async(self._book_seat)(5)
+        event, change = self._parse(await asyncio.wait_for(anext(stream), 1))
+        await stream.aclose()
+
+        self.assertEqual(event, "seats")
+        self.assertEqual(
+            change,
+            {
+                "journey": self.journey.id,
+                "taken": [[1, 5]],
+                "released": [],
+                "available_delta": -1,
+            },
+        )
+
+    async def test_stream_accepts_api_tokens(self):
+        token = await Token.objects.acreate(user=self.user)
+
+        response = await self.async_client.get(
+            self.url, headers={"Authorization": f"Token {token.key}"}
+        )
+        event, _ = self._parse(await anext(response.streaming_content))
+        await response.streaming_content.aclose()
+
+        self.assertEqual(event, "snapshot")
+
+    async def test_stream_requires_authentication(self):
+        response = await self.async_client.get(self.url)
+
+        self.assertEqual(response.status_code, 401)
+
+    async def test_unknown_journey(self):
+        response = await self.async_client.get(
+            reverse("station:journey-seats-stream", args=[self.journey.id + 1]),
+            headers=self.headers,
+        )
+
+        self.assertEqual(response.status_code, 404)
+
+    def test_not_served_over_wsgi(self):
+        response = self.client.get(self.url, headers=self.headers)
+
+        self.assertEqual(response.status_code, 501)
@@ -0,0 +1,224 @@
+import datetime
+import json
+import queue
+import tempfile
+from io import StringIO
+from pathlib import Path
+from unittest import mock
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import caches
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from station.models import (
+    Journey,
+    Order,
+    OutboxEvent,
+    Route,
+    Station,
+    Ticket,
+    Train,
+    TrainType,
+)
+from station.outbox import FileSink, LocalQueueSink, dispatch_batch
+
+ORDER_URL = reverse("station:order-list")
+EVENTS_URL = reverse("station:outboxevent-list")
+
+
+class FailingSink:
+    def send(self, events):
+        raise ConnectionError("sink is down")
+
+
+class OutboxTests(TestCase):
+    def setUp(self):
+        caches[settings.THROTTLE_CACHE_ALIAS].clear()
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            email="test@test.com", password="password123"
+        )
+        self.client.force_authenticate(self.user)
+        route = Route.objects.create(
+            source=Station.objects.create(name="A", latitude=1.0, longitude=1.0),
+            destination=Station.objects.create(name="B", latitude=2.0, longitude=2.0),
+            distance=10,
+        )
+        train = Train.objects.create(
+            name="Train 1",
+            cargo_num=1,
+            places_in_cargo=10,
+            train_type=TrainType.objects.create(name="Type A"),
+        )
+        departure = timezone.now() + datetime.timedelta(days=1)
+        self.journey = Journey.objects.create(
+            route=route,
+            train=train,
+            departure_time=departure,
+            arrival_time=departure + datetime.timedelta(hours=2),
+        )
+
+    def _order(self, seat=1):
+        return self.client.post(
+            ORDER_URL,
+            {"tickets": [{"cargo": 1, "seat": seat, "journey": self.journey.id}]},
+            format="json",
+        )
+
+    def test_order_create_and_delete_record_events(self):
+        order_id = self._order().data["id"]
+        self.client.delete(reverse("station:order-detail", args=[order_id]))
+
+        events = list(OutboxEvent.objects.values_list("event_type", "aggregate_id"))
+        self.assertEqual(
+            events, [("order.created", order_id), ("order.deleted", order_id)]
+        )
+        payload = OutboxEvent.objects.first().payload
+        self.assertEqual(payload["tickets"][0]["seat"], 1)
+        self.assertEqual(payload["user"], self.user.id)
+
+    def test_ticket_update_and_delete_record_events(self):
+        order_id = self._order().data["id"]
+        ticket = Order.objects.get(id=order_id).tickets.get()
+        url = reverse("station:ticket-detail", args=[ticket.id])
+
+        self.client.put(
+            url,
+            {"cargo": 1, "seat": 2, "journey": self.journey.id, "order": order_id},
+            format="json",
+        )
+        self.client.delete(url)
+
+        events = list(OutboxEvent.objects.values_list("event_type", "aggregate_id"))
+        self.assertEqual(
+            events,
+            [
+                ("order.created", order_id),
+                ("ticket.updated", ticket.id),
+                ("ticket.deleted", ticket.id),
+            ],
+        )
+        updated = OutboxEvent.objects.get(event_type="ticket.updated").payload
+        self.assertEqual(updated["seat"], 2)
+        self.assertEqual(
+            updated["previous"], {"journey": self.journey.id, "cargo": 1, "seat": 1}
+        )
+
+    def test_journey_delete_records_cascaded_tickets(self):
+        self._order(seat=1)
+        self._order(seat=2)
+        ticket_ids = set(Ticket.objects.values_list("id", flat=True))
+
+        self.journey.delete()
+
+        deleted = OutboxEvent.objects.filter(event_type="ticket.deleted")
+        self.assertEqual(
+            set(deleted.values_list("aggregate_id", flat=True)), ticket_ids
+        )
+
+    def test_user_delete_records_cascaded_orders(self):
+        order_ids = {self._order(seat=1).data["id"], self._order(seat=2).data["id"]}
+
+        self.user.delete()
+
+        self.assertEqual(
+            set(OutboxEvent.objects.values_list("event_type", "aggregate_id")),
+            {("order.created", id) for id in order_ids}
+            | {("order.deleted", id) for id in order_ids},
+        )
+        deleted = OutboxEvent.objects.filter(event_type="order.deleted")
+        self.assertEqual(
+            sorted(event.payload["tickets"][0]["seat"] for event in deleted), [1, 2]
+        )
+
+    def test_event_rolls_back_with_failed_order(self):
+        with mock.patch(
+            "station.serializers.record_event", side_effect=RuntimeError
+        ), self.assertRaises(RuntimeError):
+            self._order()
+
+        self.assertFalse(Order.objects.exists())
+        self.assertFalse(OutboxEvent.objects.exists())
+
+    def test_dispatch_delivers_once_in_order(self):
+        self._order(seat=1)
+        self._order(seat=2)
+        sink = LocalQueueSink(queue.Queue())
+
+        self.assertEqual(dispatch_batch(sink, batch_size=1), 1)
+        self.assertEqual(dispatch_batch(sink, batch_size=10), 1)
+        self.assertEqual(dispatch_batch(sink, batch_size=10), 0)
+
+        delivered = [sink.queue.get_nowait() for _ in range(sink.queue.qsize())]
+        self.assertEqual(
+            [event["payload"]["tickets"][0]["seat"] for event in delivered], [1, 2]
+        )
+        self.assertFalse(OutboxEvent.objects.filter(dispatched_at=None).exists())
+
+    def test_failed_delivery_keeps_events_pending(self):
+        self._order()
+
+        with self.assertRaises(ConnectionError):
+            dispatch_batch(FailingSink(), batch_size=10)
+
+        self.assertTrue(OutboxEvent.objects.filter(dispatched_at=None).exists())
+
+    def test_dispatch_command_writes_file_sink(self):
+        self._order()
+        with tempfile.TemporaryDirectory() as directory:
+            path = Path(directory) / "events.jsonl"
+            with override_settings(
+                OUTBOX_SINK="station.outbox.FileSink",
+                OUTBOX_SINK_OPTIONS={"path": path},
+            ):
+                call_command("dispatch_outbox", stdout=StringIO())
+
+            lines = path.read_text().splitlines()
+        self.assertEqual(json.loads(lines[0])["event_type"], "order.created")
+        self.assertIsInstance(FileSink(path), FileSink)
+
+    def test_feed_since(self):
+        first = self._order(seat=1).data["id"]
+        second = self._order(seat=2).data["id"]
+        dispatch_batch(LocalQueueSink(queue.Queue()), batch_size=10)
+        admin = get_user_model().objects.create_superuser(
+            email="admin@test.com", password="password123"
+        )
+        self.client.force_authenticate(admin)
+
+        res = self.client.get(EVENTS_URL, {"limit": 1})
+        self.assertEqual([event["aggregate_id"] for event in res.data], [first])
+
+        res = self.client.get(EVENTS_URL, {"since": res.data[-1]["sequence"]})
+        self.assertEqual([event["aggregate_id"] for event in res.data], [second])
+
+        res = self.client.get(EVENTS_URL, {"since": "x"})
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_feed_serves_only_dispatched_events(self):
+        first = self._order(seat=1).data["id"]
+        dispatch_batch(LocalQueueSink(queue.Queue()), batch_size=10)
+        second = self._order(seat=2).data["id"]
+        self.client.force_authenticate(
+            get_user_model().objects.create_superuser(
+                email="admin@test.com", password="password123"
+            )
+        )
+
+        res = self.client.get(EVENTS_URL)
+        self.assertEqual([event["aggregate_id"] for event in res.data], [first])
+
+        dispatch_batch(LocalQueueSink(queue.Queue()), batch_size=10)
+        res = self.client.get(EVENTS_URL, {"since": res.data[-1]["sequence"]})
+        self.assertEqual([event["aggregate_id"] for event in res.data], [second])
+
+    def test_feed_is_admin_only(self):
+        res = self.client.get(EVENTS_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_403_FORBIDDEN)
@@ -0,0 +1,85 @@
+import datetime
+
+from django.contrib.auth import get_user_model
+from django.core.management import CommandError, call_command
+from django.test import TestCase
+from django.utils import timezone
+
+from station.management.commands.manage_partitions import (
+    month_partitions,
+    partition_month,
+)
+from station.models import Journey, Order, Route, Station, Ticket, Train, TrainType
+
+
+class MonthPartitionTests(TestCase):
+    def test_month_partitions_cover_year_boundary(self):
+        partitions = list(
+            month_partitions(datetime.date(2024, 11, 15), datetime.date(2025, 1, 1))
+        )
+
+        self.assertEqual(
+            partitions,
+            [
+                (
+                    "station_ticket_2024_11",
+                    datetime.date(2024, 11, 1),
+                    datetime.date(2024, 12, 1),
+                ),
+                (
+                    "station_ticket_2024_12",
+                    datetime.date(2024, 12, 1),
+                    datetime.date(2025, 1, 1),
+                ),
+                (
+                    "station_ticket_2025_01",
+                    datetime.date(2025, 1, 1),
+                    datetime.date(2025, 2, 1),
+                ),
+            ],
+        )
+
+    def test_partition_month_ignores_default_partition(self):
+        self.assertEqual(
+            partition_month("station_ticket_2024_03"), datetime.date(2024, 3, 1)
+        )
+        self.assertIsNone(partition_month("station_ticket_default"))
+
+    def test_command_requires_postgresql(self):
+        with self.assertRaises(CommandError):
+            call_command("manage_partitions")
+
+
+class TicketJourneyDepartureTests(TestCase):
+    def test_partition_key_follows_journey_departure(self):
+        departure = timezone.now()
+        journey = Journey.objects.create(
+            route=Route.objects.create(
+                source=Station.objects.create(name="A", latitude=1.0, longitude=1.0),
+                destination=Station.objects.create(
+                    name="B", latitude=2.0, longitude=2.0
+                ),
+                distance=10,
+            ),
+            train=Train.objects.create(
+                name="Train 1",
+                cargo_num=1,
+                places_in_cargo=10,
+                train_type=TrainType.objects.create(name="Type A"),
+            ),
+            departure_time=departure,
+            arrival_time=departure + datetime.timedelta(hours=1),
+        )
+        order = Order.objects.create(
+            user=get_user_model().objects.create_user(
+                email="test@test.com", password="password123"
+            )
+        )
+        ticket = Ticket.objects.create(cargo=1, seat=1, journey=journey, order=order)
+        self.assertEqual(ticket.journey_departure, departure)
+
+        journey.departure_time = departure + datetime.timedelta(days=40)
+        journey.save()
+
+        ticket.refresh_from_db()
+        self.assertEqual(ticket.journey_departure, journey.departure_time)
@@ -0,0 +1,233 @@
+import datetime
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from station.models import Crew, Journey, Route, Station, Train, TrainType
+
+ASSIGN_URL = reverse("station:crew-assign")
+JOURNEY_URL = reverse("station:journey-list")
+
+
+def schedule_url(crew_id):
+    return reverse("station:crew-schedule", args=[crew_id])
+
+
+class CrewRosteringTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.admin = get_user_model().objects.create_superuser(
+            email="admin@test.com", password="password123"
+        )
+        self.client.force_authenticate(self.admin)
+        self.route = Route.objects.create(
+            source=Station.objects.create(name="Kyiv", latitude=50.45, longitude=30.52),
+            destination=Station.objects.create(
+                name="Lviv", latitude=49.84, longitude=24.03
+            ),
+            distance=540,
+        )
+        self.train_type = TrainType.objects.create(name="Express")
+        self.start = timezone.now().replace(microsecond=0) + datetime.timedelta(days=1)
+        # 0-4h, 3-7h, 5-9h and 10-14h after start.
+        self.journeys = [self._journey(offset, offset + 4) for offset in (0, 3, 5, 10)]
+        self.crew = Crew.objects.create(first_name="John", last_name="Doe")
+        self.other_crew = Crew.objects.create(first_name="Jane", last_name="Roe")
+
+    def _journey(self, start_hour, end_hour):
+        # One train per journey, only the crew may be double booked.
+        return Journey.objects.create(
+            route=self.route,
+            train=Train.objects.create(
+                name=f"Intercity {start_hour}",
+                cargo_num=2,
+                places_in_cargo=10,
+                train_type=self.train_type,
+            ),
+            departure_time=self.start + datetime.timedelta(hours=start_hour),
+            arrival_time=self.start + datetime.timedelta(hours=end_hour),
+        )
+
+    def _assign(self, *assignments):
+        return self.client.post(
+            ASSIGN_URL,
+            {
+                "assignments": [
+                    {"journey": journey.id, "crew": [crew.id for crew in crews]}
+                    for journey, crews in assignments
+                ]
+            },
+            format="json",
+        )
+
+    def test_bulk_assignment_uses_one_insert(self):
+        first, _, third, fourth = self.journeys
+
+        # Journeys, crews, the crew lock, the range query and the insert,
+        # plus the savepoint around them.
+        with self.assertNumQueries(7):
+            res = self._assign(
+                (first, [self.crew, self.other_crew]),
+                (third, [self.crew]),
+                (fourth, [self.crew, self.other_crew]),
+            )
+
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(
+            set(self.crew.journeys.values_list("id", flat=True)),
+            {first.id, third.id, fourth.id},
+        )
+        self.assertEqual(
+            set(self.other_crew.journeys.values_list("id", flat=True)),
+            {first.id, fourth.id},
+        )
+
+    def test_overlap_with_existing_journey_is_rejected(self):
+        first, second, _, fourth = self.journeys
+        first.crew.add(self.crew)
+
+        res = self._assign((fourth, [self.crew]), (second, [self.crew]))
+
+        self.assertEqual(res.status_code, status.HTTP_409_CONFLICT)
+        self.assertEqual(
+            res.data["conflicts"],
+            [
+                {
+                    "crew": self.crew.id,
+                    "journey": second.id,
+                    "conflicting_journey": first.id,
+                }
+            ],
+        )
+        self.assertEqual(list(fourth.crew.all()), [])
+
+    def test_overlap_within_batch_is_rejected(self):
+        first, second, _, _ = self.journeys
+
+        res = self._assign((first, [self.crew]), (second, [self.crew, self.other_crew]))
+
+        self.assertEqual(res.status_code, status.HTTP_409_CONFLICT)
+        self.assertEqual(
+            {conflict["crew"] for conflict in res.data["conflicts"]}, {self.crew.id}
+        )
+
+    def test_back_to_back_and_repeated_assignments_are_allowed(self):
+        first, _, third, _ = self.journeys
+        back_to_back = self._journey(4, 5)
+        first.crew.add(self.crew)
+
+        res = self._assign((first, [self.crew]), (back_to_back, [self.crew]))
+
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(self.crew.journeys.count(), 2)
+
+    def test_unknown_ids_and_permissions(self):
+        res = self.client.post(
+            ASSIGN_URL,
+            {"assignments": [{"journey": 999999, "crew": [self.crew.id]}]},
+            format="json",
+        )
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+        self.client.force_authenticate(
+            get_user_model().objects.create_user(
+                email="user@test.com", password="password123"
+            )
+        )
+        res = self._assign((self.journeys[0], [self.crew]))
+        self.assertEqual(res.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_schedule_flags_overlapping_journeys(self):
+        first, second, third, fourth = self.journeys
+        for journey in self.journeys:
+            journey.crew.add(self.crew)
+
+        with self.assertNumQueries(2):
+            res = self.client.get(
+                schedule_url(self.crew.id),
+                {
+                    "from": self.start.isoformat(),
+                    "to": (self.start + datetime.timedelta(hours=12)).isoformat(),
+                },
+            )
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [(journey["id"], journey["conflicts"]) for journey in res.data["journeys"]],
+            [
+                (first.id, [second.id]),
+                (second.id, [first.id, third.id]),
+                (third.id, [second.id]),
+                (fourth.id, []),
+            ],
+        )
+        self.assertEqual(res.data["journeys"][0]["source"], "Kyiv")
+
+    def test_schedule_period_is_bounded(self):
+        res = self.client.get(
+            schedule_url(self.crew.id),
+            {
+                "from": self.start.isoformat(),
+                "to": (self.start + datetime.timedelta(days=40)).isoformat(),
+            },
+        )
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_schedule_rejects_invalid_dates(self):
+        res = self.client.get(
+            schedule_url(self.crew.id), {"from": "2026-13-01T00:00:00"}
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("from", res.data)
+
+    def _other_train(self):
+        return Train.objects.create(
+            name="Regional",
+            cargo_num=1,
+            places_in_cargo=10,
+            train_type=self.train_type,
+        )
+
+    def _at(self, hour):
+        return (self.start + datetime.timedelta(hours=hour)).isoformat()
+
+    def test_journey_create_rejects_busy_crew(self):
+        self.journeys[0].crew.add(self.crew)
+        train = self._other_train()
+
+        res = self.client.post(
+            JOURNEY_URL,
+            {
+                "route": self.route.id,
+                "train": train.id,
+                "departure_time": self._at(1),
+                "arrival_time": self._at(2),
+                "crew": [self.crew.id],
+            },
+            format="json",
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn(f"journey {self.journeys[0].id}", res.data["crew"][0])
+
+    def test_journey_time_change_rechecks_crew(self):
+        self.journeys[0].crew.add(self.crew)
+        journey = self._journey(20, 24)
+        journey.crew.add(self.crew)
+
+        res = self.client.patch(
+            reverse("station:journey-detail", args=[journey.id]),
+            {"departure_time": self._at(1), "arrival_time": self._at(2)},
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("crew", res.data)
+        journey.refresh_from_db()
+        self.assertEqual(
+            journey.departure_time, self.start + datetime.timedelta(hours=20)
+        )
@@ -0,0 +1,129 @@
+import random
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.db.models import F
+from django.test import TestCase
+from rest_framework.authtoken.models import Token
+
+from station.management.commands.seed_network import (
+    Command,
+    link_stations,
+    place_stations,
+)
+from station.models import (
+    Crew,
+    Journey,
+    Order,
+    OutboxEvent,
+    Route,
+    Station,
+    Ticket,
+    Train,
+)
+
+
+class SeedNetworkTests(TestCase):
+    options = (
+        "--stations=40",
+        "--degree=4",
+        "--trains-per-type=2",
+        "--journeys-per-train=6",
+        "--tickets-per-journey=5",
+        "--users=5",
+        "--batch-size=50",
+    )
+
+    def _seed(self, *args):
+        call_command("seed_network", *self.options, *args, stdout=StringIO())
+
+    def _snapshot(self):
+        return (
+            list(Station.objects.order_by("name").values_list("latitude", "longitude")),
+            list(
+                Journey.objects.order_by("train__name", "departure_time").values_list(
+                    "route__source__name", "departure_time", "arrival_time"
+                )
+            ),
+            list(
+                Ticket.objects.order_by(
+                    "journey__train__name", "journey__departure_time", "cargo", "seat"
+                ).values_list("cargo", "seat", "fare")
+            ),
+        )
+
+    def test_network_is_connected(self):
+        self._seed()
+
+        adjacency = {}
+        for source_id, destination_id in Route.objects.values_list(
+            "source_id", "destination_id"
+        ):
+            adjacency.setdefault(source_id, set()).add(destination_id)
+        station_ids = set(Station.objects.values_list("id", flat=True))
+        seen = set()
+        pending = [next(iter(station_ids))]
+        while pending:
+            station_id = pending.pop()
+            if station_id not in seen:
+                seen.add(station_id)
+                pending.extend(adjacency.get(station_id, ()))
+
+        self.assertEqual(seen, station_ids)
+        self.assertFalse(Route.objects.filter(distance__lt=1).exists())
+
+    def test_trains_and_tickets_are_consistent(self):
+        self._seed()
+
+        self.assertEqual(Train.objects.count(), 6)
+        self.assertEqual(Crew.objects.count(), 12)
+        self.assertEqual(Journey.objects.count(), 36)
+        for train in Train.objects.all():
+            journeys = list(train.journey_set.order_by("departure_time"))
+            for previous, following in zip(journeys, journeys[1:]):
+                self.assertLessEqual(previous.arrival_time, following.departure_time)
+                self.assertEqual(
+                    previous.route.destination_id, following.route.source_id
+                )
+            layout = train.layout
+            for cargo, seat in Ticket.objects.filter(journey__train=train).values_list(
+                "cargo", "seat"
+            ):
+                self.assertLessEqual(seat, layout[cargo - 1][0])
+        self.assertFalse(
+            Ticket.objects.exclude(
+                journey_departure=F("journey__departure_time")
+            ).exists()
+        )
+
+    def test_same_seed_same_data(self):
+        self._seed()
+        first = self._snapshot()
+
+        self._seed("--clear")
+
+        self.assertEqual(self._snapshot(), first)
+
+    def test_clear_deletes_only_seeded_rows(self):
+        self._seed()
+        Token.objects.create(user=get_user_model().objects.first())
+        kept = Station.objects.create(name="Kyiv", latitude=50.45, longitude=30.52)
+
+        Command()._clear()
+
+        self.assertEqual(list(Station.objects.all()), [kept])
+        for model in (Route, Train, Crew, Journey, Order, Ticket, Token):
+            self.assertFalse(model.objects.exists(), model)
+        self.assertFalse(get_user_model().objects.exists())
+        self.assertFalse(OutboxEvent.objects.exists())
+
+
+class StationPlacementTests(TestCase):
+    def test_consecutive_stations_are_neighbours(self):
+        stations = place_stations(25, random.Random(1))
+
+        self.assertEqual(len({(lat, lon) for _, lat, lon in stations}), 25)
+        for (first, _, _), (second, _, _) in zip(stations, stations[1:]):
+            self.assertEqual(abs(first[0] - second[0]) + abs(first[1] - second[1]), 1)
+        self.assertIn((0, 1), link_stations(stations, degree=2))
@@ -0,0 +1,128 @@
+import datetime
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from station.models import Crew, Journey, Route, Station, Train, TrainType
+
+
+def journey_detail_url(journey_id):
+    return reverse("station:journey-detail", args=[journey_id])
+
+
+class SparseFieldsetTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(
+            get_user_model().objects.create_user(
+                email="test@test.com", password="password123"
+            )
+        )
+        source = Station.objects.create(name="Kyiv", latitude=50.45, longitude=30.52)
+        destination = Station.objects.create(
+            name="Lviv", latitude=49.84, longitude=24.03
+        )
+        self.train = Train.objects.create(
+            name="Intercity",
+            cargo_num=2,
+            places_in_cargo=10,
+            train_type=TrainType.objects.create(name="Express"),
+        )
+        departure = timezone.now() + datetime.timedelta(days=1)
+        self.journey = Journey.objects.create(
+            route=Route.objects.create(
+                source=source, destination=destination, distance=540
+            ),
+            train=self.train,
+            departure_time=departure,
+            arrival_time=departure + datetime.timedelta(hours=5),
+        )
+        self.crew = Crew.objects.create(first_name="John", last_name="Doe")
+        self.journey.crew.add(self.crew)
+
+    def test_default_journey_detail_nests_train_and_crew(self):
+        res = self.client.get(journey_detail_url(self.journey.id))
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data["train"]["name"], "Intercity")
+        self.assertEqual(
+            res.data["crew"], [{"id": self.crew.id, "full_name": "John Doe"}]
+        )
+        self.assertEqual(res.data["route"], self.journey.route_id)
+        self.assertNotIn("routes", res.data)
+
+    def test_fields_select_only_requested_columns(self):
+        with CaptureQueriesContext(connection) as queries:
+            res = self.client.get(
+                journey_detail_url(self.journey.id),
+                {"fields": "id,travel_duration"},
+            )
+
+        self.assertEqual(
+            res.data, {"id": self.journey.id, "travel_duration": "0 days, 5 hours"}
+        )
+        self.assertEqual(len(queries), 1)
+        self.assertNotIn("station_train", queries[0]["sql"])
+        self.assertNotIn('"route_id"', queries[0]["sql"])
+
+    def test_expand_relations(self):
+        with self.assertNumQueries(2):
+            res = self.client.get(
+                journey_detail_url(self.journey.id),
+                {"fields": "id,train,crew", "expand": "route"},
+            )
+
+        self.assertEqual(res.data["train"], self.train.id)
+        self.assertEqual(res.data["crew"], [self.crew.id])
+        self.assertEqual(
+            res.data["route"],
+            {
+                "id": self.journey.route_id,
+                "source": "Kyiv",
+                "destination": "Lviv",
+                "distance": 540,
+            },
+        )
+
+        with self.assertNumQueries(1):
+            res = self.client.get(
+                journey_detail_url(self.journey.id),
+                {"fields": "id,route", "expand": "train"},
+            )
+        self.assertEqual(set(res.data), {"id", "route", "train"})
+        self.assertEqual(res.data["train"]["name"], "Intercity")
+
+    def test_train_and_station_fields(self):
+        res = self.client.get(
+            reverse("station:train-detail", args=[self.train.id]),
+            {"fields": "name,total_capacity", "expand": "train_type"},
+        )
+        self.assertEqual(
+            res.data,
+            {
+                "name": "Intercity",
+                "total_capacity": 20,
+                "train_type": {"id": self.train.train_type_id, "name": "Express"},
+            },
+        )
+
+        res = self.client.get(reverse("station:station-list"), {"fields": "name"})
+        self.assertEqual(res.data["results"], [{"name": "Kyiv"}, {"name": "Lviv"}])
+
+    def test_unknown_fields_are_rejected(self):
+        for params in ({"fields": "id,routes"}, {"expand": "train_type"}):
+            res = self.client.get(journey_detail_url(self.journey.id), params)
+            self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+        res = self.client.get(
+            reverse("station:station-detail", args=[self.journey.route.source_id]),
+            {"expand": "routes"},
+        )
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(res.data["expand"], "Expansion is not supported.")
@@ -0,0 +1,73 @@
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from station.geo import StationGrid, haversine_km, station_grid
+from station.models import Station
+
+NEARBY_URL = reverse("station:station-nearby")
+
+
+class HaversineTests(TestCase):
+    def test_known_distance(self):
+        kyiv_to_lviv = haversine_km(50.4501, 30.5234, 49.8397, 24.0297)
+        self.assertAlmostEqual(kyiv_to_lviv, 467.5, delta=1)
+
+
+class StationNearbyTests(TestCase):
+    def setUp(self):
+        station_grid.invalidate()
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            email="test@test.com", password="password123"
+        )
+        self.client.force_authenticate(self.user)
+        Station.objects.create(name="Kyiv", latitude=50.4401, longitude=30.4893)
+        Station.objects.create(name="Darnytsia", latitude=50.4556, longitude=30.6295)
+        Station.objects.create(name="Lviv", latitude=49.8397, longitude=24.0297)
+        Station.objects.create(name="West", latitude=0.0, longitude=179.99)
+        Station.objects.create(name="East", latitude=0.0, longitude=-179.99)
+
+    def _names(self, params):
+        res = self.client.get(NEARBY_URL, params)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        return [station["name"] for station in res.data]
+
+    def test_nearest_first_within_radius(self):
+        names = self._names({"lat": 50.45, "lon": 30.52, "radius": 20})
+        self.assertEqual(names, ["Kyiv", "Darnytsia"])
+
+    def test_search_across_antimeridian(self):
+        names = self._names({"lat": 0.0, "lon": 179.999, "radius": 5})
+        self.assertEqual(names, ["West", "East"])
+
+    def test_grid_rebuilt_after_station_change(self):
+        self._names({"lat": 50.45, "lon": 30.52})
+        with self.captureOnCommitCallbacks(execute=True):
+            Station.objects.create(name="Centre", latitude=50.45, longitude=30.52)
+
+        self.assertEqual(self._names({"lat": 50.45, "lon": 30.52, "limit": 1}), ["Centre"])
+
+    def test_invalidation_from_another_worker(self):
+        other_worker_grid = StationGrid()
+        self._names({"lat": 50.45, "lon": 30.52})
+        Station.objects.create(name="Centre", latitude=50.45, longitude=30.52)
+
+        other_worker_grid.invalidate()
+
+        self.assertEqual(self._names({"lat": 50.45, "lon": 30.52, "limit": 1}), ["Centre"])
+
+    @override_settings(LOCAL_SNAPSHOT_TTL=0)
+    def test_grid_expires(self):
+        self._names({"lat": 50.45, "lon": 30.52})
+        Station.objects.bulk_create(
+            [Station(name="Centre", latitude=50.45, longitude=30.52)]
+        )
+
+        self.assertEqual(self._names({"lat": 50.45, "lon": 30.52, "limit": 1}), ["Centre"])
+
+    def test_invalid_coordinates_rejected(self):
+        res = self.client.get(NEARBY_URL, {"lat": 91, "lon": 0})
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
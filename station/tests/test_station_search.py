@@ -0,0 +1,76 @@
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from station.models import Station
+from station.search import StationNameIndex, station_name_index
+
+AUTOCOMPLETE_URL = reverse("station:station-autocomplete")
+
+
+class StationAutocompleteTests(TestCase):
+    def setUp(self):
+        station_name_index.invalidate()
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            email="test@test.com", password="password123"
+        )
+        self.client.force_authenticate(self.user)
+        for index, name in enumerate(["Kyiv", "Kyiv-Pasazhyrskyi", "Lviv", "Kharkiv"]):
+            Station.objects.create(name=name, latitude=index, longitude=index)
+
+    def _names(self, params):
+        res = self.client.get(AUTOCOMPLETE_URL, params)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        return [station["name"] for station in res.data]
+
+    def test_prefix_matches_come_first(self):
+        self.assertEqual(self._names({"q": "ky"}), ["Kyiv", "Kyiv-Pasazhyrskyi"])
+
+    def test_fuzzy_match_for_misspelled_name(self):
+        self.assertEqual(self._names({"q": "kharkov"})[0], "Kharkiv")
+
+    def test_limit(self):
+        self.assertEqual(self._names({"q": "ky", "limit": 1}), ["Kyiv"])
+
+    def test_index_rebuilt_after_station_change(self):
+        self._names({"q": "ky"})
+        with self.captureOnCommitCallbacks(execute=True):
+            Station.objects.create(name="Kyivska", latitude=10, longitude=10)
+
+        self.assertIn("Kyivska", self._names({"q": "kyivs"}))
+
+    def test_rolled_back_change_keeps_index(self):
+        self._names({"q": "ky"})
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            with self.assertRaises(RuntimeError), transaction.atomic():
+                Station.objects.create(name="Kyivska", latitude=10, longitude=10)
+                raise RuntimeError
+
+        self.assertEqual(callbacks, [])
+        self.assertNotIn("Kyivska", self._names({"q": "kyivs"}))
+
+    def test_invalidation_from_another_worker(self):
+        other_worker_index = StationNameIndex()
+        self._names({"q": "ky"})
+        Station.objects.create(name="Kyivska", latitude=10, longitude=10)
+
+        other_worker_index.invalidate()
+
+        self.assertIn("Kyivska", self._names({"q": "kyivs"}))
+
+    @override_settings(LOCAL_SNAPSHOT_TTL=0)
+    def test_index_expires(self):
+        self._names({"q": "ky"})
+        Station.objects.bulk_create(
+            [Station(name="Kyivska", latitude=10, longitude=10)]
+        )
+
+        self.assertIn("Kyivska", self._names({"q": "kyivs"}))
+
+    def test_query_required(self):
+        res = self.client.get(AUTOCOMPLETE_URL)
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
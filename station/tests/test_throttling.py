@@ -0,0 +1,47 @@
+from unittest import mock
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import caches
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from station.throttling import FixedWindowUserRateThrottle, OrderCreateRateThrottle
+
+
+class FixedWindowThrottleTests(TestCase):
+    def setUp(self):
+        caches[settings.THROTTLE_CACHE_ALIAS].clear()
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            email="test@test.com", password="password123"
+        )
+
+    @mock.patch.object(OrderCreateRateThrottle, "THROTTLE_RATES", {"orders": "2/minute"})
+    def test_order_create_has_stricter_scope(self):
+        self.client.force_authenticate(self.user)
+        order_url = reverse("station:order-list")
+
+        responses = [self.client.post(order_url, {}, format="json") for _ in range(3)]
+
+        self.assertEqual(
+            [res.status_code for res in responses],
+            [
+                status.HTTP_400_BAD_REQUEST,
+                status.HTTP_400_BAD_REQUEST,
+                status.HTTP_429_TOO_MANY_REQUESTS,
+            ],
+        )
+        self.assertEqual(self.client.get(order_url).status_code, status.HTTP_200_OK)
+
+    @mock.patch.object(FixedWindowUserRateThrottle, "timer", staticmethod(lambda: 150.0))
+    def test_state_is_one_counter_per_window(self):
+        self.client.force_authenticate(self.user)
+
+        for _ in range(3):
+            self.client.get(reverse("station:station-list"))
+
+        key = f"throttle_user_{self.user.pk}:2"
+        self.assertEqual(caches[settings.THROTTLE_CACHE_ALIAS].get(key), 3)
@@ -0,0 +1,160 @@
+import os
+import shutil
+import tempfile
+from io import BytesIO
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from PIL import Image
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from station import images
+from station.models import Train, TrainType
+
+MEDIA_ROOT = tempfile.mkdtemp()
+
+
+def tearDownModule():
+    shutil.rmtree(MEDIA_ROOT, ignore_errors=True)
+
+
+def image_upload(size=(800, 600), name="train.jpg"):
+    buffer = BytesIO()
+    Image.new("RGB", size, "red").save(buffer, format="JPEG")
+    return SimpleUploadedFile(name, buffer.getvalue(), content_type="image/jpeg")
+
+
+@override_settings(
+    MEDIA_ROOT=MEDIA_ROOT,
+    IMAGE_PROCESSING_ASYNC=False,
+    TRAIN_THUMBNAIL_SIZE=(320, 320),
+)
+class TrainImageUploadTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_superuser(
+            email="admin@test.com", password="password123"
+        )
+        self.client.force_authenticate(self.user)
+        self.train = Train.objects.create(
+            name="Express Train",
+            cargo_num=5,
+            places_in_cargo=50,
+            train_type=TrainType.objects.create(name="Type A"),
+        )
+        self.url = reverse("station:train-upload-image", args=[self.train.id])
+
+    def test_upload_generates_thumbnails(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            res = self.client.post(
+                self.url, {"image": image_upload()}, format="multipart"
+            )
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.train.refresh_from_db()
+        self.assertEqual(
+            (self.train.thumbnail_width, self.train.thumbnail_height), (320, 240)
+        )
+        self.assertTrue(self.train.thumbnail_webp.name.endswith(".webp"))
+        with Image.open(self.train.thumbnail_webp.path) as webp:
+            self.assertEqual(webp.format, "WEBP")
+            self.assertEqual(webp.size, (320, 240))
+
+    def test_new_upload_deletes_previous_files(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(self.url, {"image": image_upload()}, format="multipart")
+        self.train.refresh_from_db()
+        old_files = [
+            self.train.image.path,
+            self.train.thumbnail.path,
+            self.train.thumbnail_webp.path,
+        ]
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(self.url, {"image": image_upload()}, format="multipart")
+
+        self.train.refresh_from_db()
+        self.assertTrue(os.path.exists(self.train.thumbnail.path))
+        self.assertFalse(any(os.path.exists(path) for path in old_files))
+
+    def test_background_failure_is_logged(self):
+        with mock.patch(
+            "station.images.process_train_image", side_effect=OSError("broken")
+        ), self.assertLogs("station.images", level="ERROR") as logs:
+            images._submit(self.train.id, ())
+            images.get_executor().shutdown(wait=True)
+            images._executor = None
+
+        self.assertIn(f"train {self.train.id} failed", logs.output[0])
+
+    def test_list_exposes_thumbnail_urls(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(self.url, {"image": image_upload()}, format="multipart")
+
+        res = self.client.get(reverse("station:train-list"))
+
+        train = res.data["results"][0]
+        self.assertIn("thumbnail", train)
+        self.assertTrue(train["thumbnail_webp"].endswith(".webp"))
+        self.assertNotIn("image", train)
+
+    def test_image_not_writable_through_train_update(self):
+        res = self.client.patch(
+            reverse("station:train-detail", args=[self.train.id]),
+            {"image": image_upload(), "name": "Renamed"},
+            format="multipart",
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.train.refresh_from_db()
+        self.assertEqual(self.train.name, "Renamed")
+        self.assertFalse(self.train.image)
+
+    def test_upload_invalid_image_returns_errors(self):
+        res = self.client.post(self.url, {"image": "not an image"}, format="multipart")
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("image", res.data)
+
+
+@override_settings(
+    MEDIA_ROOT=MEDIA_ROOT,
+    MEDIA_SERVE_MODE="x-accel",
+    MEDIA_ACCEL_REDIRECT_PREFIX="/protected-media/",
+)
+class TrainImageServingTests(TestCase):
+    def setUp(self):
+        with open(f"{MEDIA_ROOT}/train.jpg", "wb") as file:
+            file.write(image_upload().read())
+
+    def test_x_accel_redirect_delegates_to_web_server(self):
+        res = self.client.get("/media/train.jpg")
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res["X-Accel-Redirect"], "/protected-media/train.jpg")
+        self.assertEqual(res["Content-Type"], "image/jpeg")
+        self.assertIn("max-age", res["Cache-Control"])
+        self.assertEqual(res.content, b"")
+
+    def test_missing_or_traversal_path_not_found(self):
+        self.assertEqual(self.client.get("/media/missing.jpg").status_code, 404)
+        self.assertEqual(self.client.get("/media/../settings.py").status_code, 404)
+
+    def test_x_accel_redirect_path_is_quoted(self):
+        with open(f"{MEDIA_ROOT}/new train.jpg", "wb") as file:
+            file.write(image_upload().read())
+
+        res = self.client.get("/media/new%20train.jpg")
+
+        self.assertEqual(res["X-Accel-Redirect"], "/protected-media/new%20train.jpg")
+
+    def test_django_mode_serves_only_with_debug(self):
+        with override_settings(MEDIA_SERVE_MODE="django", DEBUG=False):
+            self.assertEqual(self.client.get("/media/train.jpg").status_code, 404)
+        with override_settings(MEDIA_SERVE_MODE="django", DEBUG=True):
+            res = self.client.get("/media/train.jpg")
+            self.assertEqual(res.status_code, status.HTTP_200_OK)
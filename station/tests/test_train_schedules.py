@@ -0,0 +1,154 @@
+import datetime
+from io import StringIO
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.exceptions import ValidationError
+from django.core.management import CommandError, call_command
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from station.models import Crew, Journey, Route, Station, Train, TrainType
+from station.rostering import train_conflicts
+from station.serializers import JourneySerializer
+
+JOURNEY_URL = reverse("station:journey-list")
+
+
+class TrainScheduleTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(
+            get_user_model().objects.create_superuser(
+                email="admin@test.com", password="password123"
+            )
+        )
+        self.route = Route.objects.create(
+            source=Station.objects.create(name="Kyiv", latitude=50.45, longitude=30.52),
+            destination=Station.objects.create(
+                name="Lviv", latitude=49.84, longitude=24.03
+            ),
+            distance=540,
+        )
+        train_type = TrainType.objects.create(name="Express")
+        self.train = Train.objects.create(
+            name="Intercity", cargo_num=2, places_in_cargo=10, train_type=train_type
+        )
+        self.other_train = Train.objects.create(
+            name="Regional", cargo_num=2, places_in_cargo=10, train_type=train_type
+        )
+        self.crew = Crew.objects.create(first_name="John", last_name="Doe")
+        self.start = timezone.now().replace(microsecond=0) + datetime.timedelta(days=1)
+        self.journey = self._journey(self.train, 0, 4)
+
+    def _at(self, hour):
+        return self.start + datetime.timedelta(hours=hour)
+
+    def _journey(self, train, start_hour, end_hour):
+        return Journey.objects.create(
+            route=self.route,
+            train=train,
+            departure_time=self._at(start_hour),
+            arrival_time=self._at(end_hour),
+        )
+
+    def _payload(self, train, start_hour, end_hour):
+        return {
+            "route": self.route.id,
+            "train": train.id,
+            "departure_time": self._at(start_hour).isoformat(),
+            "arrival_time": self._at(end_hour).isoformat(),
+            "crew": [self.crew.id],
+        }
+
+    def test_overlapping_journey_for_train_is_rejected(self):
+        res = self.client.post(
+            JOURNEY_URL, self._payload(self.train, 3, 6), format="json"
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn(f"journey {self.journey.id}", res.data["train"][0])
+        self.assertEqual(Journey.objects.count(), 1)
+
+    def test_schedule_rechecked_under_train_lock_on_save(self):
+        # A journey inserted between validation and save must still be caught.
+        with mock.patch.object(
+            JourneySerializer, "validate", side_effect=lambda attrs: attrs
+        ), mock.patch.object(
+            Train.objects, "select_for_update", wraps=Train.objects.select_for_update
+        ) as lock:
+            res = self.client.post(
+                JOURNEY_URL, self._payload(self.train, 3, 6), format="json"
+            )
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("train", res.data)
+        lock.assert_called_once_with()
+        self.assertEqual(Journey.objects.count(), 1)
+
+    def test_other_train_and_back_to_back_journeys_are_allowed(self):
+        for payload in (
+            self._payload(self.other_train, 1, 3),
+            self._payload(self.train, 4, 6),
+        ):
+            res = self.client.post(JOURNEY_URL, payload, format="json")
+            self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+
+    def test_update_ignores_the_journey_itself(self):
+        url = reverse("station:journey-detail", args=[self.journey.id])
+
+        res = self.client.patch(url, {"arrival_time": self._at(5).isoformat()})
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+
+        self._journey(self.train, 6, 8)
+        res = self.client.patch(url, {"arrival_time": self._at(7).isoformat()})
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_arrival_must_follow_departure(self):
+        res = self.client.post(
+            JOURNEY_URL, self._payload(self.other_train, 3, 3), format="json"
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("arrival_time", res.data)
+
+    def test_model_clean(self):
+        journey = Journey(
+            route=self.route,
+            train=self.train,
+            departure_time=self._at(2),
+            arrival_time=self._at(5),
+        )
+        with self.assertRaises(ValidationError):
+            journey.full_clean()
+
+    def test_sweep_reports_each_overlap(self):
+        day = datetime.datetime(2026, 1, 1)
+        rows = [
+            (1, 1, day.replace(hour=0), day.replace(hour=10)),
+            (2, 1, day.replace(hour=2), day.replace(hour=3)),
+            (3, 1, day.replace(hour=5), day.replace(hour=6)),
+            (4, 1, day.replace(hour=10), day.replace(hour=12)),
+            (5, 2, day.replace(hour=11), day.replace(hour=13)),
+        ]
+
+        self.assertEqual(
+            [(journey[0], other[0]) for journey, other in train_conflicts(rows)],
+            [(2, 1), (3, 1)],
+        )
+
+    def test_check_train_schedules_command(self):
+        out = StringIO()
+        call_command("check_train_schedules", stdout=out)
+        self.assertIn("No overlapping train journeys", out.getvalue())
+
+        # Written directly, as an import or a race could.
+        overlapping = self._journey(self.train, 2, 6)
+
+        out = StringIO()
+        with self.assertRaises(CommandError):
+            call_command("check_train_schedules", "--upcoming", stdout=out)
+        self.assertIn(f"journey {overlapping.id}", out.getvalue())
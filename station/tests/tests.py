@@ -5,7 +5,7 @@ from django.test import TestCase
 from django.urls import reverse
 from rest_framework import status
 from rest_framework.test import APIClient
-from station.models import Ticket, Journey, Route, Station, Train, TrainType, Order
+from station.models import Crew, Ticket, Journey, Route, Station, Train, TrainType, Order
 
 ORDER_URL = reverse("station:order-list")
 TRAIN_URL = reverse("station:train-list")
@@ -231,3 +231,95 @@ class AuthenticatedJourneyApiTests(TestCase):
         res = self.client.get(JOURNEY_URL)
         self.assertEqual(res.status_code, status.HTTP_200_OK)
 
+    def _create_journey(self, hours, day=1):
+        # One journey per day, so the train never runs two at once.
+        departure_time = datetime.datetime(
+            2024, 1, day, 8, tzinfo=datetime.timezone.utc
+        )
+        return Journey.objects.create(
+            route=self.route,
+            train=self.train,
+            departure_time=departure_time,
+            arrival_time=departure_time + datetime.timedelta(hours=hours),
+        )
+
+    def test_filter_journeys_by_max_duration(self):
+        long_journey = self._create_journey(hours=30)
+
+        res = self.client.get(JOURNEY_URL, {"max_duration": "03:00:00"})
+
+        ids = [journey["id"] for journey in res.data["results"]]
+        self.assertIn(self.journey.id, ids)
+        self.assertNotIn(long_journey.id, ids)
+
+    def test_order_journeys_by_duration(self):
+        long_journey = self._create_journey(hours=30)
+        short_journey = self._create_journey(hours=1, day=3)
+
+        res = self.client.get(JOURNEY_URL, {"ordering": "-duration"})
+
+        ids = [journey["id"] for journey in res.data["results"]]
+        self.assertEqual(ids, [long_journey.id, self.journey.id, short_journey.id])
+
+    def test_invalid_duration_params_rejected(self):
+        for params in ({"max_duration": "soon"}, {"ordering": "train"}):
+            res = self.client.get(JOURNEY_URL, params)
+            self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class TrainFilterApiTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            email="test@test.com", password="password123"
+        )
+        self.client.force_authenticate(self.user)
+        self.passenger = TrainType.objects.create(name="Passenger")
+        self.cargo = TrainType.objects.create(name="Cargo")
+        self.express = Train.objects.create(
+            name="Express 1", cargo_num=5, places_in_cargo=50, train_type=self.passenger
+        )
+        self.freight = Train.objects.create(
+            name="Freight 1", cargo_num=5, places_in_cargo=50, train_type=self.cargo
+        )
+
+    def _train_names(self, params):
+        res = self.client.get(TRAIN_URL, params)
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        return [train["name"] for train in res.data["results"]]
+
+    def test_filter_trains_by_name_prefix(self):
+        self.assertEqual(self._train_names({"name": "exp"}), ["Express 1"])
+
+    def test_filter_trains_by_train_types(self):
+        self.assertEqual(
+            self._train_names({"train_types": f"{self.cargo.id}"}), ["Freight 1"]
+        )
+
+    def test_filter_trains_by_crews_without_duplicates(self):
+        crew = Crew.objects.create(first_name="John", last_name="Doe")
+        other_crew = Crew.objects.create(first_name="Jane", last_name="Doe")
+        route = Route.objects.create(
+            source=Station.objects.create(name="A", latitude=1.0, longitude=1.0),
+            destination=Station.objects.create(name="B", latitude=2.0, longitude=2.0),
+            distance=10,
+        )
+        for day in (1, 2):
+            departure_time = datetime.datetime(
+                2024, 1, day, 8, tzinfo=datetime.timezone.utc
+            )
+            journey = Journey.objects.create(
+                route=route,
+                train=self.express,
+                departure_time=departure_time,
+                arrival_time=departure_time + datetime.timedelta(hours=1),
+            )
+            journey.crew.add(crew, other_crew)
+
+        names = self._train_names({"crews": f"{crew.id},{other_crew.id}"})
+
+        self.assertEqual(names, ["Express 1"])
+
+    def test_invalid_ids_rejected(self):
+        res = self.client.get(TRAIN_URL, {"train_types": "a,b"})
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
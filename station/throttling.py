@@ -0,0 +1,19 @@
+from rest_framework import throttling
+
+from app.throttling import FixedWindowThrottleMixin
+
+
+class FixedWindowAnonRateThrottle(
+    FixedWindowThrottleMixin, throttling.AnonRateThrottle
+):
+    pass
+
+
+class FixedWindowUserRateThrottle(
+    FixedWindowThrottleMixin, throttling.UserRateThrottle
+):
+    pass
+
+
+class OrderCreateRateThrottle(FixedWindowUserRateThrottle):
+    scope = "orders"
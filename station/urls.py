@@ -9,6 +9,8 @@ from station.views import (
     JourneyViewSet,
     OrderViewSet,
     TicketViewSet,
+    OutboxEventViewSet,
+    journey_seats_stream,
 )
 
 router = DefaultRouter()
@@ -20,8 +22,14 @@ router.register(r"crews", CrewViewSet)
 router.register(r"journeys", JourneyViewSet)
 router.register(r"orders", OrderViewSet)
 router.register(r"tickets", TicketViewSet)
+router.register(r"events", OutboxEventViewSet)
 
 urlpatterns = [
+    path(
+        "journeys/<int:pk>/seats/stream/",
+        journey_seats_stream,
+        name="journey-seats-stream",
+    ),
     path("", include(router.urls)),
 ]
 
@@ -1,10 +1,36 @@
+import asyncio
+import datetime
+import json
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.db.models import Exists, F, OuterRef
+from django.core.handlers.asgi import ASGIRequest
+from django.http import Http404, JsonResponse, StreamingHttpResponse
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime, parse_duration
 from drf_spectacular.utils import OpenApiParameter, OpenApiExample, extend_schema
-from rest_framework import viewsets, status
+from rest_framework import mixins, serializers, viewsets, status
 from rest_framework.decorators import action
+from rest_framework.exceptions import AuthenticationFailed, ValidationError
 from rest_framework.permissions import IsAuthenticated, IsAdminUser
 from rest_framework.response import Response
+from rest_framework.settings import api_settings
 
+from station.fast_serializers import (
+    ValuesListMixin,
+    RouteListValuesSerializer,
+    TrainListValuesSerializer,
+    JourneyListValuesSerializer,
+)
+from station.fares import DEFAULT_SEAT_CLASS, fare_engine
+from station.geo import station_grid
+from station.idempotency import IdempotentCreateMixin
+from station.images import schedule_train_image_processing
 from station.models import (
+    ArchivedOrder,
     Station,
     Route,
     TrainType,
@@ -13,6 +39,8 @@ from station.models import (
     Journey,
     Order,
     Ticket,
+    SeatClass,
+    OutboxEvent,
 )
 from station.serializers import (
     StationSerializer,
@@ -20,6 +48,7 @@ from station.serializers import (
     TrainTypeSerializer,
     TrainSerializer,
     CrewSerializer,
+    CrewRosterSerializer,
     JourneySerializer,
     OrderSerializer,
     TicketSerializer,
@@ -33,16 +62,212 @@ from station.serializers import (
     TickerRetrieveSerializer,
     TicketListSerializer,
     TrainImageSerializer,
+    OutboxEventSerializer,
 )
+from station.outbox import record_event
+from station.rostering import CrewScheduleConflict, overlapping, schedule_conflicts
+from station.search import autocomplete_stations
+from station.live import broker, seat_snapshot
+from station.throttling import OrderCreateRateThrottle
+
+
+def params_to_ints(param, param_name):
+    try:
+        return [int(str_id) for str_id in param.split(",")]
+    except ValueError:
+        raise ValidationError({param_name: "Must be a comma separated list of ids."})
+
+
+class BatchRetrieveMixin:
+    """Retrieve up to max_batch_size objects in one request with ?ids=1,2,3"""
+
+    max_batch_size = 100
+
+    @extend_schema(
+        parameters=[
+            OpenApiParameter(
+                "ids",
+                description="Comma separated ids, up to 100 (ex. ?ids=1,2,3)",
+                required=True,
+                type={"type": "array", "items": {"type": "number"}},
+            ),
+        ]
+    )
+    @action(methods=["GET"], detail=False, url_path="batch")
+    def batch(self, request):
+        ids = request.query_params.get("ids")
+        if not ids:
+            raise ValidationError({"ids": "This query parameter is required."})
+        ids = list(dict.fromkeys(params_to_ints(ids, "ids")))
+        if len(ids) > self.max_batch_size:
+            raise ValidationError(
+                {"ids": f"At most {self.max_batch_size} objects can be fetched at once."}
+            )
+
+        objects = {
+            obj.pk: obj
+            for obj in self.filter_queryset(self.get_queryset()).filter(pk__in=ids)
+        }
+        serializer = self.get_serializer(
+            [objects[pk] for pk in ids if pk in objects], many=True
+        )
+        return Response(serializer.data)
+
+
+SPARSE_FIELDSET_PARAMETERS = [
+    OpenApiParameter(
+        "fields",
+        description="Comma separated fields to return (ex. ?fields=id,name)",
+        required=False,
+        type={"type": "array", "items": {"type": "string"}},
+    ),
+    OpenApiParameter(
+        "expand",
+        description="Comma separated relations to nest instead of returning "
+        "their ids, empty for none (ex. ?expand=train,crew)",
+        required=False,
+        type={"type": "array", "items": {"type": "string"}},
+    ),
+]
+
+
+class SparseFieldsetViewMixin:
+    """Apply ?fields= and ?expand= to the serializer and the queryset"""
+
+    sparse_fieldset_actions = ("retrieve", "batch")
+
+    def get_sparse_fieldset(self):
+        serializer_class = self.get_serializer_class()
+        allowed = {
+            "fields": set(serializer_class().fields),
+            "expand": set(serializer_class.expandable_fields),
+        }
+        sparse_fieldset = {}
+        for param_name, allowed_names in allowed.items():
+            value = self.request.query_params.get(param_name)
+            if value is None:
+                continue
+            names = [name.strip() for name in value.split(",") if name.strip()]
+            unknown = [name for name in names if name not in allowed_names]
+            if unknown and not allowed_names:
+                # Only expand can be empty, for serializers without relations.
+                raise ValidationError({param_name: "Expansion is not supported."})
+            if unknown:
+                raise ValidationError(
+                    {
+                        param_name: f"Unknown {', '.join(unknown)}, "
+                        f"choose from {', '.join(sorted(allowed_names))}."
+                    }
+                )
+            sparse_fieldset[param_name] = names
+        return sparse_fieldset
+
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        if self.action in self.sparse_fieldset_actions:
+            queryset = self.get_serializer_class().optimize_queryset(
+                queryset, **self.get_sparse_fieldset()
+            )
+        return queryset
+
+    def get_serializer(self, *args, **kwargs):
+        if self.action in self.sparse_fieldset_actions:
+            kwargs.update(self.get_sparse_fieldset())
+        return super().get_serializer(*args, **kwargs)
 
+    @extend_schema(parameters=SPARSE_FIELDSET_PARAMETERS)
+    def retrieve(self, request, *args, **kwargs):
+        return super().retrieve(request, *args, **kwargs)
 
-class StationViewSet(viewsets.ModelViewSet):
+
+class StationViewSet(
+    SparseFieldsetViewMixin, BatchRetrieveMixin, viewsets.ModelViewSet
+):
     queryset = Station.objects.all()
     serializer_class = StationSerializer
+    sparse_fieldset_actions = ("list", "retrieve", "batch")
+    autocomplete_default_limit = 10
+    autocomplete_max_limit = 50
+
+    @extend_schema(
+        parameters=[
+            OpenApiParameter(
+                "q",
+                description="Station name prefix or misspelled name (ex. ?q=kyi)",
+                required=True,
+                type=str,
+            ),
+            OpenApiParameter(
+                "limit",
+                description="Maximum number of matches, up to 50 (ex. ?limit=5)",
+                required=False,
+                type=int,
+            ),
+        ]
+    )
+    @action(methods=["GET"], detail=False, url_path="autocomplete")
+    def autocomplete(self, request):
+        query = request.query_params.get("q", "").strip()
+        if not query:
+            raise ValidationError({"q": "This query parameter is required."})
+        try:
+            limit = int(
+                request.query_params.get("limit", self.autocomplete_default_limit)
+            )
+        except ValueError:
+            raise ValidationError({"limit": "Must be an integer."})
+        limit = max(1, min(limit, self.autocomplete_max_limit))
+
+        return Response(autocomplete_stations(query, limit))
+
+    @staticmethod
+    def _float_param(request, name, minimum, maximum, default=None):
+        value = request.query_params.get(name, default)
+        if value is None:
+            raise ValidationError({name: "This query parameter is required."})
+        try:
+            value = float(value)
+        except ValueError:
+            raise ValidationError({name: "Must be a number."})
+        if not minimum <= value <= maximum:
+            raise ValidationError({name: f"Must be between {minimum} and {maximum}."})
+        return value
+
+    @extend_schema(
+        parameters=[
+            OpenApiParameter(
+                "lat", description="Latitude (ex. ?lat=50.45)", required=True, type=float
+            ),
+            OpenApiParameter(
+                "lon", description="Longitude (ex. ?lon=30.52)", required=True, type=float
+            ),
+            OpenApiParameter(
+                "radius",
+                description="Search radius in km, up to 500 (ex. ?radius=25)",
+                required=False,
+                type=float,
+            ),
+            OpenApiParameter(
+                "limit",
+                description="Maximum number of stations, up to 50 (ex. ?limit=5)",
+                required=False,
+                type=int,
+            ),
+        ]
+    )
+    @action(methods=["GET"], detail=False, url_path="nearby")
+    def nearby(self, request):
+        latitude = self._float_param(request, "lat", -90, 90)
+        longitude = self._float_param(request, "lon", -180, 180)
+        radius = self._float_param(request, "radius", 0, 500, default=10)
+        limit = int(self._float_param(request, "limit", 1, 50, default=10))
 
+        return Response(station_grid.nearby(latitude, longitude, radius, limit))
 
-class RouteViewSet(viewsets.ModelViewSet):
+
+class RouteViewSet(SparseFieldsetViewMixin, ValuesListMixin, viewsets.ModelViewSet):
     queryset = Route.objects.all()
+    values_serializer_class = RouteListValuesSerializer
 
     def get_serializer_class(self):
         if self.action == "list":
@@ -63,17 +288,16 @@ class TrainTypeViewSet(viewsets.ModelViewSet):
     serializer_class = TrainTypeSerializer
 
 
-class TrainViewSet(viewsets.ModelViewSet):
+class TrainViewSet(
+    SparseFieldsetViewMixin, ValuesListMixin, BatchRetrieveMixin, viewsets.ModelViewSet
+):
     queryset = Train.objects.all()
-
-    @staticmethod
-    def _params_to_ints(param):
-        return [int(str_id) for str_id in param.split(",")]
+    values_serializer_class = TrainListValuesSerializer
 
     def get_serializer_class(self):
         if self.action == "list":
             return TrainListSerializer
-        elif self.action == "retrieve":
+        elif self.action in ("retrieve", "batch"):
             return TrainRetrieveSerializer
         elif self.action == "upload_image":
             return TrainImageSerializer
@@ -81,12 +305,26 @@ class TrainViewSet(viewsets.ModelViewSet):
 
     def get_queryset(self):
         queryset = self.queryset
-        facilities = self.request.query_params.get("facilities")
-        if facilities:
-            facilities = self._params_to_ints(facilities)
-            queryset = queryset.filter(facilities__id__in=facilities)
-        if self.action == ("list", "retrieve"):
-            return queryset.prefetch_related("train_type")
+        name = self.request.query_params.get("name")
+        train_types = self.request.query_params.get("train_types")
+        crews = self.request.query_params.get("crews")
+
+        if name:
+            queryset = queryset.filter(name__istartswith=name)
+        if train_types:
+            train_types = params_to_ints(train_types, "train_types")
+            queryset = queryset.filter(train_type_id__in=train_types)
+        if crews:
+            crews = params_to_ints(crews, "crews")
+            queryset = queryset.filter(
+                Exists(
+                    Journey.crew.through.objects.filter(
+                        journey__train=OuterRef("pk"), crew_id__in=crews
+                    )
+                )
+            )
+        if self.action == "list":
+            return queryset.select_related("train_type")
         return queryset
 
     @action(
@@ -100,14 +338,27 @@ class TrainViewSet(viewsets.ModelViewSet):
         serializer = self.get_serializer(train, data=request.data)
 
         if serializer.is_valid():
-            serializer.save()
+            stale_files = (
+                train.image.name,
+                train.thumbnail.name,
+                train.thumbnail_webp.name,
+            )
+            serializer.save(
+                thumbnail=None,
+                thumbnail_webp=None,
+                thumbnail_width=None,
+                thumbnail_height=None,
+            )
+            schedule_train_image_processing(train.id, stale_files)
             return Response(serializer.data, status=status.HTTP_200_OK)
 
+        return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
     @extend_schema(
         parameters=[
             OpenApiParameter(
                 "name",
-                description="Filtering by name (ex. ?name='train1')",
+                description="Filtering by name prefix (ex. ?name=train)",
                 required=False,
                 type=str,
                 examples=[
@@ -117,7 +368,7 @@ class TrainViewSet(viewsets.ModelViewSet):
             ),
             OpenApiParameter(
                 "train_types",
-                description="Filtering by train_types id (ex. ?train_type=1,2)",
+                description="Filtering by train_types id (ex. ?train_types=1,2)",
                 type={"type": "array", "items": {"type": "number"}},
                 examples=[
                     OpenApiExample(name="Example 1", value="1"),
@@ -126,7 +377,8 @@ class TrainViewSet(viewsets.ModelViewSet):
             ),
             OpenApiParameter(
                 "crews",
-                description="Filtering by crew id (ex. ?crews=1,2)",
+                description="Filtering by trains with journeys served by crew id "
+                "(ex. ?crews=1,2)",
                 type={"type": "array", "items": {"type": "number"}},
                 examples=[
                     OpenApiExample(name="Example 1", value="3"),
@@ -136,46 +388,305 @@ class TrainViewSet(viewsets.ModelViewSet):
         ]
     )
     def list(self, request, *args, **kwargs):
-        """Endpoint for listing movies"""
+        """Endpoint for listing trains"""
         return super().list(request, *args, **kwargs)
 
 
 class CrewViewSet(viewsets.ModelViewSet):
     queryset = Crew.objects.all()
     serializer_class = CrewSerializer
+    default_schedule_days = 7
+    max_schedule_days = 31
+
+    def get_serializer_class(self):
+        if self.action == "assign":
+            return CrewRosterSerializer
+        return CrewSerializer
+
+    @action(methods=["POST"], detail=False, url_path="assign")
+    def assign(self, request):
+        """Assign crews to many journeys at once, rejecting overlapping journeys"""
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        try:
+            serializer.save()
+        except CrewScheduleConflict as conflict:
+            return Response(
+                {"detail": str(conflict), "conflicts": conflict.conflicts},
+                status=status.HTTP_409_CONFLICT,
+            )
+        return Response(serializer.data, status=status.HTTP_201_CREATED)
+
+    @staticmethod
+    def _datetime_param(request, name, default):
+        value = request.query_params.get(name)
+        if value is None:
+            return default
+        try:
+            parsed = parse_datetime(value)
+        except ValueError:
+            parsed = None
+        if parsed is None:
+            raise ValidationError({name: "Use ISO 8601 format."})
+        if timezone.is_naive(parsed):
+            parsed = timezone.make_aware(parsed)
+        return parsed
+
+    @extend_schema(
+        parameters=[
+            OpenApiParameter(
+                "from",
+                description="Start of the period, defaults to now "
+                "(ex. ?from=2026-10-01T00:00:00Z)",
+                required=False,
+                type=str,
+            ),
+            OpenApiParameter(
+                "to",
+                description="End of the period, at most 31 days after from, "
+                "defaults to 7 days (ex. ?to=2026-10-08T00:00:00Z)",
+                required=False,
+                type=str,
+            ),
+        ]
+    )
+    @action(methods=["GET"], detail=True, url_path="schedule")
+    def schedule(self, request, pk=None):
+        """Journeys of the crew member in a period, with overlapping ones flagged"""
+        crew = self.get_object()
+        start = self._datetime_param(request, "from", timezone.now())
+        end = self._datetime_param(
+            request, "to", start + datetime.timedelta(days=self.default_schedule_days)
+        )
+        if not start < end <= start + datetime.timedelta(days=self.max_schedule_days):
+            raise ValidationError(
+                {
+                    "to": f"Must be after from and at most "
+                    f"{self.max_schedule_days} days later."
+                }
+            )
+
+        journeys = list(
+            overlapping(crew.journeys.all(), start, end)
+            .order_by("departure_time", "id")
+            .values(
+                "id",
+                "departure_time",
+                "arrival_time",
+                train_name=F("train__name"),
+                source=F("route__source__name"),
+                destination=F("route__destination__name"),
+            )
+        )
+        conflicts = schedule_conflicts(journeys)
+        datetime_field = serializers.DateTimeField()
+        return Response(
+            {
+                "crew": crew.id,
+                "from": datetime_field.to_representation(start),
+                "to": datetime_field.to_representation(end),
+                "journeys": [
+                    {
+                        **journey,
+                        "departure_time": datetime_field.to_representation(
+                            journey["departure_time"]
+                        ),
+                        "arrival_time": datetime_field.to_representation(
+                            journey["arrival_time"]
+                        ),
+                        "conflicts": conflicts[journey["id"]],
+                    }
+                    for journey in journeys
+                ],
+            }
+        )
 
 
-class JourneyViewSet(viewsets.ModelViewSet):
+class JourneyViewSet(
+    SparseFieldsetViewMixin, ValuesListMixin, BatchRetrieveMixin, viewsets.ModelViewSet
+):
     queryset = Journey.objects.all()
+    values_serializer_class = JourneyListValuesSerializer
+
+    ordering_fields = ("duration", "departure_time", "arrival_time")
+    max_quote_size = 100
 
     def get_queryset(self):
-        queryset = self.queryset
-        if self.action == ("list", "retrieve"):
+        queryset = self.queryset.with_duration()
+
+        max_duration = self.request.query_params.get("max_duration")
+        if max_duration:
+            duration = parse_duration(max_duration)
+            if duration is None:
+                raise ValidationError(
+                    {"max_duration": "Use HH:MM:SS, 'DD HH:MM:SS' or ISO 8601 format."}
+                )
+            queryset = queryset.filter(duration__lte=duration)
+
+        ordering = self.request.query_params.get("ordering")
+        if ordering:
+            if ordering.lstrip("-") not in self.ordering_fields:
+                raise ValidationError(
+                    {"ordering": f"Must be one of {', '.join(self.ordering_fields)}."}
+                )
+            queryset = queryset.order_by(ordering, "id")
+
+        if self.action == "list":
             return queryset.select_related()
         return queryset
 
+    @extend_schema(
+        parameters=[
+            OpenApiParameter(
+                "max_duration",
+                description="Filtering by maximum travel duration "
+                "(ex. ?max_duration=03:30:00)",
+                required=False,
+                type=str,
+            ),
+            OpenApiParameter(
+                "ordering",
+                description="Ordering by duration, departure_time or arrival_time, "
+                "prefix with '-' for descending (ex. ?ordering=duration)",
+                required=False,
+                type=str,
+            ),
+        ]
+    )
+    def list(self, request, *args, **kwargs):
+        return super().list(request, *args, **kwargs)
+
+    @extend_schema(
+        parameters=[
+            OpenApiParameter(
+                "ids",
+                description="Journey ids to price, up to 100 (ex. ?ids=1,2,3)",
+                required=True,
+                type={"type": "array", "items": {"type": "number"}},
+            ),
+            OpenApiParameter(
+                "seat_class",
+                description="Seat class (ex. ?seat_class=first)",
+                required=False,
+                enum=SeatClass.values,
+            ),
+        ]
+    )
+    @action(methods=["GET"], detail=False, url_path="quote")
+    def quote(self, request):
+        ids = request.query_params.get("ids")
+        if not ids:
+            raise ValidationError({"ids": "This query parameter is required."})
+        ids = params_to_ints(ids, "ids")
+        if len(ids) > self.max_quote_size:
+            raise ValidationError(
+                {
+                    "ids": f"At most {self.max_quote_size} journeys can be priced at once."
+                }
+            )
+        seat_class = request.query_params.get("seat_class", DEFAULT_SEAT_CLASS)
+        if seat_class not in SeatClass.values:
+            raise ValidationError(
+                {"seat_class": f"Must be one of {', '.join(SeatClass.values)}."}
+            )
+
+        quotes = fare_engine.quote_journeys(ids, seat_class)
+        return Response(
+            [
+                {
+                    "journey": journey_id,
+                    "seat_class": seat_class,
+                    "fare": (
+                        str(quotes[journey_id])
+                        if quotes[journey_id] is not None
+                        else None
+                    ),
+                }
+                for journey_id in ids
+                if journey_id in quotes
+            ]
+        )
+
+    @action(methods=["GET"], detail=True, url_path="seats")
+    def seats(self, request, pk=None):
+        journey = self.get_object()
+        layout = journey.train.layout
+        taken = {}
+        for cargo, seat in journey.tickets.values_list("cargo", "seat"):
+            taken.setdefault(cargo, []).append(seat)
+
+        cargos = []
+        for cargo, (seats, seat_class) in enumerate(layout, start=1):
+            cargo_taken = sorted(taken.get(cargo, []))
+            cargos.append(
+                {
+                    "cargo": cargo,
+                    "seat_class": seat_class,
+                    "seats": seats,
+                    "taken": cargo_taken,
+                    "available": seats - len(cargo_taken),
+                }
+            )
+        return Response({"journey": journey.id, "cargos": cargos})
+
     def get_serializer_class(self):
         if self.action == "list":
             return JourneyListSerializer
-        elif self.action == "retrieve":
+        elif self.action in ("retrieve", "batch"):
             return JourneyRetrieveSerializer
         return JourneySerializer
 
 
-class OrderViewSet(viewsets.ModelViewSet):
+class OrderViewSet(IdempotentCreateMixin, viewsets.ModelViewSet):
     queryset = Order.objects.all()
     serializer_class = OrderSerializer
     permission_classes = (IsAuthenticated,)
 
     def get_queryset(self):
-        queryset = self.queryset.filter(user=self.request.user)
+        queryset = self.queryset.filter(user_id=self.request.user.id)
 
         if self.action == "list":
             queryset = queryset.prefetch_related("tickets__journey__train")
         return queryset
 
+    def get_throttles(self):
+        throttles = super().get_throttles()
+        if self.action == "create":
+            throttles.append(OrderCreateRateThrottle())
+        return throttles
+
     def perform_create(self, serializer):
-        serializer.save(user=self.request.user)
+        # JWTs are verified without a user lookup, the account may be gone.
+        if not get_user_model().objects.filter(id=self.request.user.id).exists():
+            raise AuthenticationFailed("User not found", code="user_not_found")
+        serializer.save(user_id=self.request.user.id)
+
+    def perform_destroy(self, instance):
+        with transaction.atomic():
+            record_event(OutboxEvent.EventType.ORDER_DELETED, instance)
+            instance.delete()
+
+    def retrieve(self, request, *args, **kwargs):
+        try:
+            return super().retrieve(request, *args, **kwargs)
+        except Http404:
+            if not str(kwargs["pk"]).isdecimal():
+                raise
+            archived_order = ArchivedOrder.objects.filter(
+                order_id=kwargs["pk"], user_id=request.user.id
+            ).first()
+            if archived_order is None:
+                raise
+            return Response(archived_order.data)
+
+    @action(methods=["GET"], detail=False, url_path="archived")
+    def archived(self, request):
+        """Endpoint for listing orders moved to the archive"""
+        queryset = ArchivedOrder.objects.filter(user_id=request.user.id).only("payload")
+        page = self.paginate_queryset(queryset)
+        return self.get_paginated_response(
+            [archived_order.data for archived_order in page]
+        )
 
     def get_serializer_class(self):
         serializer = self.serializer_class
@@ -190,6 +701,21 @@ class TicketViewSet(viewsets.ModelViewSet):
     serializer_class = TicketSerializer
     permission_classes = (IsAuthenticated,)
 
+    def perform_create(self, serializer):
+        with transaction.atomic():
+            ticket = serializer.save()
+            record_event(OutboxEvent.EventType.TICKET_CREATED, ticket)
+
+    def perform_update(self, serializer):
+        # ticket.updated is recorded from post_save, in the same transaction.
+        with transaction.atomic():
+            serializer.save()
+
+    def perform_destroy(self, instance):
+        with transaction.atomic():
+            record_event(OutboxEvent.EventType.TICKET_DELETED, instance)
+            instance.delete()
+
     def get_serializer_class(self):
         serializer = self.serializer_class
         if self.action == "list":
@@ -197,3 +723,123 @@ class TicketViewSet(viewsets.ModelViewSet):
         elif self.action == "retrieve":
             serializer = TickerRetrieveSerializer
         return serializer
+
+
+class OutboxEventViewSet(mixins.ListModelMixin, viewsets.GenericViewSet):
+    """Incremental feed of booking events for downstream consumers"""
+
+    queryset = OutboxEvent.objects.all()
+    serializer_class = OutboxEventSerializer
+    permission_classes = (IsAdminUser,)
+    pagination_class = None
+    default_limit = 100
+    max_limit = 1000
+
+    def get_queryset(self):
+        params = {"since": 0, "limit": self.default_limit}
+        for name in params:
+            value = self.request.query_params.get(name)
+            if value is None:
+                continue
+            try:
+                params[name] = int(value)
+            except ValueError:
+                raise ValidationError({name: "Must be an integer."})
+        since, limit = params["since"], min(params["limit"], self.max_limit)
+        if limit < 1:
+            raise ValidationError({"limit": "Must be a positive integer."})
+
+        # Only dispatched events have a sequence, and sequences are committed
+        # in order, so paging by them never skips a late-committing event.
+        return self.queryset.filter(sequence__gt=since).order_by("sequence")[:limit]
+
+    @extend_schema(
+        parameters=[
+            OpenApiParameter(
+                "since",
+                type=int,
+                description="Return events after this sequence number "
+                "(ex. ?since=120)",
+                required=False,
+            ),
+            OpenApiParameter(
+                "limit",
+                type=int,
+                description="Maximum number of events, at most 1000 (ex. ?limit=500)",
+                required=False,
+            ),
+        ]
+    )
+    def list(self, request, *args, **kwargs):
+        return super().list(request, *args, **kwargs)
+
+
+def sse_message(event, data):
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+def authenticate_stream(request):
+    """Run the API's authentication classes, JWT and token, on a plain request"""
+    for authentication_class in api_settings.DEFAULT_AUTHENTICATION_CLASSES:
+        authenticated = authentication_class().authenticate(request)
+        if authenticated is not None:
+            return authenticated
+    return None
+
+
+async def journey_seats_stream(request, pk):
+    """Server-Sent Events stream of a journey's seat availability.
+
+    Sends a snapshot first, then one "seats" event per booked or released
+    group of seats. Accepts the same JWT and token credentials as the rest of
+    the API, or a session. Needs the ASGI application, a WSGI server would
+    try to buffer the endless response.
+    """
+    if not isinstance(request, ASGIRequest):
+        return JsonResponse(
+            {"detail": "Seat streams are only served by the ASGI application."},
+            status=501,
+        )
+    try:
+        authenticated = await sync_to_async(authenticate_stream)(request)
+    except AuthenticationFailed as error:
+        return JsonResponse({"detail": str(error.detail)}, status=401)
+    if authenticated is None and not (await request.auser()).is_authenticated:
+        return JsonResponse(
+            {"detail": "Authentication credentials were not provided."}, status=401
+        )
+    if not await Journey.objects.filter(id=pk).aexists():
+        return JsonResponse(
+            {"detail": "No Journey matches the given query."}, status=404
+        )
+
+    async def events():
+        # Subscribe before taking the snapshot so no change falls in between.
+        subscription = broker.subscribe(pk)
+        try:
+            yield sse_message("snapshot", await sync_to_async(seat_snapshot)(pk))
+            while True:
+                try:
+                    change = await asyncio.wait_for(
+                        subscription.queue.get(), settings.SEAT_STREAM_HEARTBEAT
+                    )
+                except asyncio.TimeoutError:
+                    yield ": keepalive\n\n"
+                    continue
+                if subscription.overflowed:
+                    subscription.overflowed = False
+                    while not subscription.queue.empty():
+                        subscription.queue.get_nowait()
+                    yield sse_message(
+                        "snapshot", await sync_to_async(seat_snapshot)(pk)
+                    )
+                else:
+                    yield sse_message("seats", change)
+        finally:
+            broker.unsubscribe(pk, subscription)
+
+    response = StreamingHttpResponse(events(), content_type="text/event-stream")
+    response["Cache-Control"] = "no-cache"
+    # Keep nginx from buffering the stream.
+    response["X-Accel-Buffering"] = "no"
+    return response
@@ -0,0 +1,150 @@
+import threading
+import time
+import uuid
+from collections import OrderedDict
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import caches
+from django.db import DEFAULT_DB_ALIAS
+from rest_framework.authentication import TokenAuthentication
+from rest_framework.authtoken.models import Token
+
+AUTH_USER_FIELDS = ("id", "email", "is_active", "is_staff", "is_superuser")
+
+
+class TokenUserCache:
+    """Size-bounded LRU of token key -> cached entry with a per-entry TTL.
+
+    Only used without TOKEN_AUTH_CACHE_ALIAS, i.e. with a single worker.
+    """
+
+    def __init__(self, max_size, ttl):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key, value):
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def delete(self, key):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def delete_user(self, user_id):
+        with self._lock:
+            stale_keys = [
+                key
+                for key, (_, entry) in self._entries.items()
+                if entry["user"][0] == user_id
+            ]
+            for key in stale_keys:
+                del self._entries[key]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+token_user_cache = TokenUserCache(
+    max_size=settings.TOKEN_AUTH_CACHE_SIZE,
+    ttl=settings.TOKEN_AUTH_CACHE_TTL,
+)
+
+
+def _shared_cache():
+    alias = settings.TOKEN_AUTH_CACHE_ALIAS
+    return caches[alias] if alias else None
+
+
+def _shared_cache_key(key):
+    return f"auth-token:{key}"
+
+
+def _user_version_key(user_id):
+    return f"auth-user-version:{user_id}"
+
+
+def _user_fields():
+    # Only what authentication and permission checks read, in model order.
+    return [
+        field.attname
+        for field in get_user_model()._meta.concrete_fields
+        if field.attname in AUTH_USER_FIELDS
+    ]
+
+
+def invalidate_token(key):
+    token_user_cache.delete(key)
+    shared_cache = _shared_cache()
+    if shared_cache is not None:
+        shared_cache.delete(_shared_cache_key(key))
+
+
+def invalidate_user(user_id):
+    """Drop every cached token of the user, in all workers sharing the cache"""
+    token_user_cache.delete_user(user_id)
+    shared_cache = _shared_cache()
+    if shared_cache is not None:
+        shared_cache.set(_user_version_key(user_id), uuid.uuid4().hex, None)
+
+
+class CachedTokenAuthentication(TokenAuthentication):
+    """TokenAuthentication that skips the token/user query for recently seen keys.
+
+    Entries hold the user's authentication fields, never the password hash.
+    With a shared cache they are checked against a per-user version key that
+    any worker bumps when the user changes.
+    """
+
+    def authenticate_credentials(self, key):
+        shared_cache = _shared_cache()
+        if shared_cache is None:
+            entry = token_user_cache.get(key)
+        else:
+            entry = shared_cache.get(_shared_cache_key(key))
+            if entry is not None and entry["version"] != shared_cache.get(
+                _user_version_key(entry["user"][0])
+            ):
+                entry = None
+
+        if entry is None:
+            user, token = super().authenticate_credentials(key)
+            entry = {
+                "user": tuple(getattr(user, name) for name in _user_fields()),
+                "created": token.created,
+                "version": None,
+            }
+            if shared_cache is None:
+                token_user_cache.set(key, entry)
+            else:
+                entry["version"] = shared_cache.get(_user_version_key(user.pk))
+                shared_cache.set(
+                    _shared_cache_key(key), entry, settings.TOKEN_AUTH_CACHE_TTL
+                )
+
+        user = get_user_model().from_db(DEFAULT_DB_ALIAS, _user_fields(), entry["user"])
+        token = Token.from_db(
+            DEFAULT_DB_ALIAS,
+            ["key", "user_id", "created"],
+            [key, user.pk, entry["created"]],
+        )
+        token.user = user
+        return user, token
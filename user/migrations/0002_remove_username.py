@@ -0,0 +1,31 @@
+# Generated by Django 5.0.6 on 2026-10-19 09:35
+
+import user.models
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("user", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AlterModelManagers(
+            name="user",
+            managers=[
+                ("objects", user.models.UserManager()),
+            ],
+        ),
+        migrations.RemoveField(
+            model_name="user",
+            name="username",
+        ),
+        migrations.AlterField(
+            model_name="user",
+            name="email",
+            field=models.EmailField(
+                max_length=254, unique=True, verbose_name="email address"
+            ),
+        ),
+    ]
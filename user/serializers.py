@@ -1,5 +1,11 @@
 from django.contrib.auth import get_user_model, authenticate
 from rest_framework import serializers
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.serializers import (
+    TokenObtainPairSerializer,
+    TokenRefreshSerializer,
+)
+from rest_framework_simplejwt.settings import api_settings as jwt_settings
 from django.utils.translation import gettext as _
 
 
@@ -51,3 +57,49 @@ class AuthTokenSerializer(serializers.Serializer):
 
         attrs["user"] = user
         return attrs
+
+
+def set_user_claims(token, user):
+    """Add the claims needed to authenticate without a database lookup"""
+    token["is_staff"] = user.is_staff
+
+
+class TokenObtainPairWithClaimsSerializer(TokenObtainPairSerializer):
+    @classmethod
+    def get_token(cls, user):
+        token = super().get_token(user)
+        set_user_claims(token, user)
+        return token
+
+
+class TokenRefreshWithClaimsSerializer(TokenRefreshSerializer):
+    """Reload the user on refresh, so deactivation and changed claims apply.
+
+    Access tokens copy the claims of the refresh token, without this a
+    revoked is_staff would last for the whole refresh token lifetime.
+    """
+
+    default_error_messages = {
+        "no_active_account": _("No active account found for the given token")
+    }
+
+    def validate(self, attrs):
+        refresh = self.token_class(attrs["refresh"])
+        user = (
+            get_user_model()
+            .objects.filter(
+                **{
+                    jwt_settings.USER_ID_FIELD: refresh.payload.get(
+                        jwt_settings.USER_ID_CLAIM
+                    )
+                }
+            )
+            .first()
+        )
+        if user is None or not jwt_settings.USER_AUTHENTICATION_RULE(user):
+            raise AuthenticationFailed(
+                self.error_messages["no_active_account"], "no_active_account"
+            )
+
+        set_user_claims(refresh, user)
+        return super().validate({**attrs, "refresh": str(refresh)})
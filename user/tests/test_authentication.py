@@ -0,0 +1,204 @@
+import datetime
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import caches
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+
+from station.models import Journey, Route, Station, Train, TrainType
+from user.authentication import TokenUserCache, token_user_cache
+
+MANAGE_USER_URL = reverse("user:manage")
+
+
+class TokenUserCacheTests(TestCase):
+    def test_evicts_least_recently_used(self):
+        cache = TokenUserCache(max_size=2, ttl=60)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")
+        cache.set("c", 3)
+
+        self.assertEqual(cache.get("a"), 1)
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual(cache.get("c"), 3)
+
+    def test_expired_entries_are_dropped(self):
+        cache = TokenUserCache(max_size=2, ttl=-1)
+        cache.set("a", 1)
+
+        self.assertIsNone(cache.get("a"))
+
+
+class CachedTokenAuthenticationTests(TestCase):
+    def setUp(self):
+        token_user_cache.clear()
+        caches[settings.TOKEN_AUTH_CACHE_ALIAS].clear()
+        self.user = get_user_model().objects.create_user(
+            email="test@test.com", password="password123"
+        )
+        self.token = Token.objects.create(user=self.user)
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION=f"Token {self.token.key}")
+
+    def test_repeated_requests_skip_token_lookup(self):
+        self.client.get(MANAGE_USER_URL)
+
+        with self.assertNumQueries(0):
+            res = self.client.get(MANAGE_USER_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data["email"], self.user.email)
+
+    def test_deleted_token_is_rejected(self):
+        self.client.get(MANAGE_USER_URL)
+        self.token.delete()
+
+        res = self.client.get(MANAGE_USER_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_user_update_invalidates_cache(self):
+        self.client.get(MANAGE_USER_URL)
+        self.user.is_active = False
+        self.user.save()
+
+        res = self.client.get(MANAGE_USER_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+
+
+    def test_cache_holds_no_password_hash(self):
+        self.client.get(MANAGE_USER_URL)
+
+        entry = caches[settings.TOKEN_AUTH_CACHE_ALIAS].get(
+            f"auth-token:{self.token.key}"
+        )
+
+        self.assertNotIn(self.user.password, repr(entry))
+
+    def test_user_save_does_not_query_tokens(self):
+        with self.assertNumQueries(1):
+            self.user.save()
+
+    def test_in_process_cache_without_shared_alias(self):
+        with self.settings(TOKEN_AUTH_CACHE_ALIAS=None):
+            self.client.get(MANAGE_USER_URL)
+            with self.assertNumQueries(0):
+                res = self.client.get(MANAGE_USER_URL)
+            self.assertEqual(res.data["email"], self.user.email)
+
+            self.user.is_active = False
+            self.user.save()
+            res = self.client.get(MANAGE_USER_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+
+
+class StatelessJWTAuthenticationTests(TestCase):
+    def setUp(self):
+        caches[settings.THROTTLE_CACHE_ALIAS].clear()
+        self.client = APIClient()
+
+    def authenticate(self, user):
+        res = self.client.post(
+            reverse("user:token_obtain_pair"),
+            {"email": user.email, "password": "password123"},
+        )
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {res.data['access']}")
+        return res.data["refresh"]
+
+    def test_jwt_authenticates_without_user_lookup(self):
+        user = get_user_model().objects.create_user(
+            email="test@test.com", password="password123"
+        )
+        self.authenticate(user)
+
+        with self.assertNumQueries(1):
+            res = self.client.get(reverse("station:order-list"))
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+
+    def test_staff_claim_grants_admin_access(self):
+        admin = get_user_model().objects.create_superuser(
+            email="admin@test.com", password="password123"
+        )
+        self.authenticate(admin)
+
+        res = self.client.post(reverse("station:traintype-list"), {"name": "Cargo"})
+
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+
+    def test_manage_user_with_jwt(self):
+        user = get_user_model().objects.create_user(
+            email="test@test.com", password="password123"
+        )
+        self.authenticate(user)
+
+        res = self.client.get(MANAGE_USER_URL)
+
+        self.assertEqual(res.data["email"], user.email)
+
+    def test_refresh_reloads_claims(self):
+        admin = get_user_model().objects.create_superuser(
+            email="admin@test.com", password="password123"
+        )
+        refresh = self.authenticate(admin)
+        admin.is_staff = False
+        admin.save()
+
+        res = self.client.post(reverse("user:token_refresh"), {"refresh": refresh})
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {res.data['access']}")
+
+        res = self.client.post(reverse("station:traintype-list"), {"name": "Cargo"})
+        self.assertEqual(res.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_refresh_rejects_inactive_user(self):
+        user = get_user_model().objects.create_user(
+            email="test@test.com", password="password123"
+        )
+        refresh = self.authenticate(user)
+        user.is_active = False
+        user.save()
+
+        res = self.client.post(reverse("user:token_refresh"), {"refresh": refresh})
+
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_deleted_user_with_valid_token(self):
+        user = get_user_model().objects.create_user(
+            email="test@test.com", password="password123"
+        )
+        self.authenticate(user)
+        departure = timezone.now() + datetime.timedelta(days=1)
+        journey = Journey.objects.create(
+            route=Route.objects.create(
+                source=Station.objects.create(name="A", latitude=1, longitude=1),
+                destination=Station.objects.create(name="B", latitude=2, longitude=2),
+                distance=100,
+            ),
+            train=Train.objects.create(
+                name="Train",
+                cargo_num=1,
+                places_in_cargo=10,
+                train_type=TrainType.objects.create(name="Type"),
+            ),
+            departure_time=departure,
+            arrival_time=departure + datetime.timedelta(hours=1),
+        )
+        user.delete()
+
+        self.assertEqual(
+            self.client.get(MANAGE_USER_URL).status_code, status.HTTP_404_NOT_FOUND
+        )
+        res = self.client.post(
+            reverse("station:order-list"),
+            {"tickets": [{"journey": journey.id, "cargo": 1, "seat": 1}]},
+            format="json",
+        )
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
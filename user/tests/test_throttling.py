@@ -0,0 +1,41 @@
+from unittest import mock
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import caches
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from user.throttling import LoginRateThrottle
+
+
+class LoginThrottleTests(TestCase):
+    def setUp(self):
+        caches[settings.THROTTLE_CACHE_ALIAS].clear()
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            email="test@test.com", password="password123"
+        )
+
+    @mock.patch.object(LoginRateThrottle, "THROTTLE_RATES", {"login": "1/minute"})
+    def test_login_is_throttled(self):
+        url = reverse("user:token_obtain_pair")
+        payload = {"email": self.user.email, "password": "password123"}
+
+        self.assertEqual(self.client.post(url, payload).status_code, status.HTTP_200_OK)
+        res = self.client.post(url, payload)
+
+        self.assertEqual(res.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+        self.assertIn("Retry-After", res)
+
+    @mock.patch.object(LoginRateThrottle, "THROTTLE_RATES", {"login": "1/minute"})
+    def test_login_limit_applies_to_authenticated_requests(self):
+        url = reverse("user:token_refresh")
+        self.client.force_authenticate(self.user)
+
+        self.client.post(url, {"refresh": "invalid"})
+        res = self.client.post(url, {"refresh": "invalid"})
+
+        self.assertEqual(res.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
@@ -0,0 +1,15 @@
+from rest_framework import throttling
+
+from app.throttling import FixedWindowThrottleMixin
+
+
+class LoginRateThrottle(FixedWindowThrottleMixin, throttling.SimpleRateThrottle):
+    """Limit token requests per client IP, whether or not they carry credentials"""
+
+    scope = "login"
+
+    def get_cache_key(self, request, view):
+        return self.cache_format % {
+            "scope": self.scope,
+            "ident": self.get_ident(request),
+        }
@@ -5,14 +5,23 @@ from rest_framework_simplejwt.views import (
     TokenVerifyView,
 )
 
+from user.throttling import LoginRateThrottle
 from user.views import CreateUserView, ManageUserView
 
 app_name = "user"
 
 urlpatterns = [
     path("register/", CreateUserView.as_view(), name="create"),
-    path("api/token/", TokenObtainPairView.as_view(), name="token_obtain_pair"),
-    path("api/token/refresh/", TokenRefreshView.as_view(), name="token_refresh"),
+    path(
+        "api/token/",
+        TokenObtainPairView.as_view(throttle_classes=[LoginRateThrottle]),
+        name="token_obtain_pair",
+    ),
+    path(
+        "api/token/refresh/",
+        TokenRefreshView.as_view(throttle_classes=[LoginRateThrottle]),
+        name="token_refresh",
+    ),
     path("token/verify/", TokenVerifyView.as_view(), name="token_verify"),
     path("me/", ManageUserView.as_view(), name="manage"),
 ]